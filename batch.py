@@ -0,0 +1,182 @@
+"""
+Headless batch analysis of a directory of text (.txt) and audio (.wav) files.
+
+Every document is translated to English, then its part-of-speech counts, word counts, sentiment and
+summary are computed on a process pool; one JSON record per document is written to a JSONL file.
+
+Usage:
+    python batch.py INPUT_DIR OUTPUT.jsonl [--workers N] [--recursive] [--no-translate] [--offline]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from features.text_document import TextDocument
+from features.text_analyzer import TextAnalyzer
+from features.sentiment_analysis import SentimentAnalysis
+from features.text_summarizer import TextSummarizer
+from features.translation_cache import CachedTranslator, EchoTranslatorBackend, TranslationCache
+from features.speech_recognition_google import SpeechRecognizer, StubRecognizerBackend
+
+TEXT_SUFFIXES = {".txt"}
+AUDIO_SUFFIXES = {".wav"}
+
+_translator = None
+
+
+def get_translator(offline: bool) -> CachedTranslator:
+    """
+    Create the translator of the current worker process on first use.
+
+    The on-disk cache tier is enabled when the SONIC_CACHE_DIR environment variable is set, and is then
+    shared by every worker. It stays disabled offline, so untranslated stand-in results are never persisted.
+
+    Args:
+        offline (bool): Use the local stand-in backend instead of Google Translate.
+
+    Returns:
+        CachedTranslator: The translator of the current process.
+    """
+    global _translator
+    if _translator is None:
+        cache_dir = None if offline else os.environ.get("SONIC_CACHE_DIR")
+        disk_dir = os.path.join(cache_dir, "translations") if cache_dir else None
+        backend = EchoTranslatorBackend() if offline else None
+        _translator = CachedTranslator(backend=backend, cache=TranslationCache(disk_dir=disk_dir))
+    return _translator
+
+
+def find_documents(input_dir: str, recursive: bool = False) -> list[str]:
+    """
+    List the text and audio files of a directory.
+
+    Args:
+        input_dir (str): The directory to scan.
+        recursive (bool, optional): Also scan subdirectories. Default is False.
+
+    Returns:
+        list[str]: The sorted file paths.
+    """
+    pattern = "**/*" if recursive else "*"
+    suffixes = TEXT_SUFFIXES | AUDIO_SUFFIXES
+    return sorted(str(path) for path in Path(input_dir).glob(pattern)
+                  if path.is_file() and path.suffix.lower() in suffixes)
+
+
+def analyze_document(path: str, translate: bool = True, summary_length: int = 3, offline: bool = False) -> dict:
+    """
+    Run every analysis on one document.
+
+    Errors are recorded in the returned record instead of being raised, so one bad file does not stop the batch.
+
+    Args:
+        path (str): The path of a text or WAV file.
+        translate (bool, optional): Translate the text to English before analysis. Default is True.
+        summary_length (int, optional): The number of sentences in the summary. Default is 3.
+        offline (bool, optional): Use local stand-in backends instead of Google services. Default is False.
+
+    Returns:
+        dict: The JSON-serializable analysis record.
+    """
+    record = {"path": path}
+    start = time.perf_counter()
+    try:
+        if Path(path).suffix.lower() in AUDIO_SUFFIXES:
+            backend = StubRecognizerBackend() if offline else None
+            recognizer = SpeechRecognizer(path, backend=backend)
+            text = recognizer.transcribe()
+            record["audio"] = recognizer.preprocessing_report()
+        else:
+            text = Path(path).read_text(encoding="utf-8", errors="replace")
+        translated = get_translator(offline).translate_chunked(text) if translate and text.strip() else text
+
+        document = TextDocument(translated)
+        sentiment = SentimentAnalysis(document)
+        negatives, neutrals, positives = sentiment.categorize_words()
+        record.update({
+            "text": text,
+            "translation": translated,
+            "pos_counts": TextAnalyzer.count_pos(document),
+            "word_counts": document.word_counts,
+            "sentiment": dict(sentiment.score, negative_words=len(negatives), neutral_words=len(neutrals),
+                              positive_words=len(positives)),
+            "summary": TextSummarizer(document).summarize_text(length=summary_length),
+        })
+    except Exception as error:
+        record["error"] = "{}: {}".format(type(error).__name__, error)
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command line value that must be a whole number of at least 1.
+
+    Args:
+        value (str): The command line value.
+
+    Returns:
+        int: The number.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid int value: {!r}".format(value))
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got {}".format(number))
+    return number
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Default is sys.argv[1:].
+
+    Returns:
+        int: The process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Analyze a directory of text and WAV files into a JSONL file.")
+    parser.add_argument("input_dir", help="directory containing .txt and .wav files")
+    parser.add_argument("output", help="path of the JSONL file to write")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--recursive", action="store_true", help="also scan subdirectories")
+    parser.add_argument("--no-translate", action="store_true", help="analyze the text as is")
+    parser.add_argument("--summary-length", type=int, default=3, help="number of sentences per summary")
+    parser.add_argument("--offline", action="store_true", help="use local stand-in translation and recognition")
+    args = parser.parse_args(argv)
+
+    paths = find_documents(args.input_dir, args.recursive)
+    if not paths:
+        print("No .txt or .wav files found in {}".format(args.input_dir), file=sys.stderr)
+        return 1
+
+    worker = partial(analyze_document, translate=not args.no_translate, summary_length=args.summary_length,
+                     offline=args.offline)
+    chunksize = max(1, len(paths) // (args.workers * 8))
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor, \
+            open(args.output, "w", encoding="utf-8") as output:
+        for done, record in enumerate(executor.map(worker, paths, chunksize=chunksize), 1):
+            failures += "error" in record
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            print("\r{}/{} documents".format(done, len(paths)), end="", file=sys.stderr)
+    print("\nAnalyzed {} documents ({} failed) in {:.1f}s".format(len(paths), failures,
+                                                                  time.perf_counter() - start), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Load test driving concurrent headless sessions of the Streamlit app through streamlit.testing AppTest.
+
+Each simulated session runs the app script in this process, with its own session state, and repeats a
+user journey: typing a text, moving the word count slider, switching the word cloud color, pressing
+Summarize and convert to speech, and uploading a WAV recording. Sessions of one concurrency level run
+on parallel threads and share the process-wide resources (caches, network service, recognition queue,
+result store) exactly like the sessions of one app server. Translation, recognition and synthesis use
+the local stand-in backends (SONIC_OFFLINE_BACKENDS), with a configurable latency.
+
+Every concurrency level types its own texts, so its first journeys find nothing cached by the levels
+before it. The rerun latencies of the first journey of each session (cold) and of the later ones (warm,
+mostly served from the result store and the translation cache) are reported separately, next to the
+percentiles over all reruns, the CPU used by the process and the resident memory added per session.
+The on-disk cache tiers are disabled, so the stand-in results never reach a persistent cache.
+
+AppTest requires streamlit 1.28 or later, newer than the version pinned in requirements.txt for the app.
+Install it from requirements-bench.txt, in a separate environment, after the app requirements:
+
+    pip install -r requirements.txt && pip install -r requirements-bench.txt
+
+Usage:
+    python benchmarks/load_test.py [--sessions 1 2 4 8] [--rounds 3] [--words 300] [--texts 4]
+                                   [--latency 0.05] [--json FILE]
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run_benchmarks import make_corpus, make_wav
+
+# AppTest cannot drive st.file_uploader, so the script returns the upload the harness put in the session state.
+APP_SCRIPT = """
+import streamlit as st
+st.file_uploader = lambda label, *args, **kwargs: st.session_state.get("load_test_upload")
+from app import SpeechToTextApp
+SpeechToTextApp().main()
+"""
+
+
+class Upload(io.BytesIO):
+    """
+    In-memory stand-in for a Streamlit UploadedFile.
+
+    Attributes:
+        name (str): The file name.
+    """
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def resident_bytes() -> int:
+    """
+    Returns:
+        int: The resident memory of the process, or its peak where the current value is not available.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def find(elements, label: str):
+    """
+    Find a widget by its label.
+
+    Args:
+        elements: An AppTest element list, e.g. at.selectbox.
+        label (str): The widget label.
+
+    Returns:
+        The first widget with that label.
+
+    Raises:
+        LookupError: If no widget has that label, e.g. because the section failed to render.
+    """
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError("No widget labelled {!r}".format(label))
+
+
+class Session:
+    """
+    One simulated user of the app.
+
+    Attributes:
+        text (str): The text the user types.
+        audio (bytes): The WAV file the user uploads.
+        latencies (list[tuple[str, float]]): (action, seconds) of every rerun.
+        errors (list[str]): The failed actions and their errors.
+    """
+
+    def __init__(self, text: str, audio: bytes, timeout: float):
+        """
+        Start the session with a first run of the app.
+
+        Args:
+            text (str): The text the user types.
+            audio (bytes): The WAV file the user uploads.
+            timeout (float): Seconds allowed per rerun.
+        """
+        from streamlit.testing.v1 import AppTest
+
+        self.text = text
+        self.audio = audio
+        self.latencies = []
+        self.errors = []
+        self.app = AppTest.from_string(APP_SCRIPT, default_timeout=timeout)
+        self._rerun("open", lambda app: app)
+
+    def _rerun(self, action: str, interact) -> None:
+        start = time.perf_counter()
+        try:
+            interact(self.app).run()
+        except Exception as error:
+            self.errors.append("{}: {}: {}".format(action, type(error).__name__, error))
+            return
+        self.latencies.append((action, time.perf_counter() - start))
+        if self.app.exception:
+            self.errors.append("{}: {}".format(action, self.app.exception[0].message))
+
+    def _section(self, section: str):
+        return lambda app: app.radio(key="section").set_value(section)
+
+    def journey(self) -> None:
+        """
+        Go once through every action of the user journey.
+        """
+        self._rerun("choose_text", lambda app: find(app.selectbox, 'Transfer data method:').set_value('From text'))
+        self._rerun("type", lambda app: app.text_area[0].input(self.text))
+        self._rerun("section", self._section("WordsCount"))
+        self._rerun("word_count_slider", lambda app: find(app.slider, 'Show values above:').set_value(2))
+        self._rerun("section", self._section("Wordcloud"))
+        self._rerun("word_cloud_color",
+                    lambda app: find(app.selectbox, 'Apply the background color: ').set_value('White'))
+        self._rerun("section", self._section("Summary"))
+        self._rerun("summarize", lambda app: find(app.button, "Summarize").click())
+        self._rerun("section", self._section("Text to speech"))
+        self._rerun("speech", lambda app: find(app.button, "Click convert to speech").click())
+
+        def upload(app):
+            app.session_state["load_test_upload"] = Upload(self.audio, "load_test.wav")
+            return find(app.selectbox, 'Transfer data method:').set_value('Upload file')
+
+        self._rerun("upload", upload)
+
+
+def percentiles(latencies: list[float], quantiles: list[float]) -> list[float]:
+    """
+    Args:
+        latencies (list[float]): Rerun latencies in seconds.
+        quantiles (list[float]): The percentiles to compute, from 0 to 100.
+
+    Returns:
+        list[float]: The percentiles, rounded to 0.1 ms, or zeros when there are no latencies.
+    """
+    if not latencies:
+        return [0.0] * len(quantiles)
+    return [round(float(value), 4) for value in np.percentile(latencies, quantiles)]
+
+
+def run_level(sessions: int, rounds: int, texts: list[str], audio: bytes, timeout: float) -> dict:
+    """
+    Run concurrent sessions and measure them.
+
+    Args:
+        sessions (int): The number of concurrent sessions.
+        rounds (int): The number of journeys per session.
+        texts (list[str]): The texts typed, assigned to the sessions in turn.
+        audio (bytes): The WAV file uploaded.
+        timeout (float): Seconds allowed per rerun.
+
+    Returns:
+        dict: Latency percentiles (all, cold and warm reruns), CPU and memory per session of the level.
+    """
+    users = []
+    cold = []
+    warm = []
+    rss_before = resident_bytes()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    def simulate(number: int) -> None:
+        user = Session(texts[number % len(texts)], audio, timeout)
+        users.append(user)
+        first_journey = len(user.latencies)
+        for round_number in range(rounds):
+            user.journey()
+            if not round_number:
+                first_journey = len(user.latencies)
+        cold.extend(seconds for _, seconds in user.latencies[:first_journey])
+        warm.extend(seconds for _, seconds in user.latencies[first_journey:])
+
+    threads = [threading.Thread(target=simulate, args=(number,)) for number in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    rss_after = resident_bytes()
+    latencies = [seconds for user in users for _, seconds in user.latencies]
+    p50, p95, p99 = percentiles(latencies, [50, 95, 99])
+    cold_p50, cold_p95 = percentiles(cold, [50, 95])
+    warm_p50, warm_p95 = percentiles(warm, [50, 95])
+    errors = [error for user in users for error in user.errors]
+    return {"sessions": sessions, "reruns": len(latencies), "p50_s": p50, "p95_s": p95, "p99_s": p99,
+            "cold_p50_s": cold_p50, "cold_p95_s": cold_p95, "warm_p50_s": warm_p50, "warm_p95_s": warm_p95,
+            "wall_s": round(wall, 2),
+            "cpu_s": round(cpu, 2), "cpu_cores": round(cpu / wall, 2) if wall else 0.0,
+            "mib_per_session": round((rss_after - rss_before) / sessions / (1024 * 1024), 2),
+            "errors": len(errors), "first_errors": errors[:3]}
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Default is sys.argv[1:].
+
+    Returns:
+        int: 1 if any rerun failed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Measure the app under concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrency levels")
+    parser.add_argument("--rounds", type=int, default=3, help="user journeys per session")
+    parser.add_argument("--words", type=int, default=300, help="words per typed text")
+    parser.add_argument("--texts", type=int, default=4, help="distinct texts typed across the sessions of a level")
+    parser.add_argument("--audio-words", type=int, default=30, help="length of the uploaded WAV in words")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stand-in network request")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+    args = parser.parse_args(argv)
+
+    from streamlit import config, logger
+
+    # Streamlit logs warnings with stack traces on every rerun of the app, which would bury the report.
+    config.set_option("logger.level", "error")
+    logger.set_log_level("error")
+    os.environ["SONIC_OFFLINE_BACKENDS"] = "1"
+    os.environ["SONIC_OFFLINE_LATENCY"] = str(args.latency)
+    os.environ.pop("SONIC_TRANSLATE_URL", None)
+    # The app already ignores it offline; the echoed translations must never reach a persistent cache.
+    os.environ.pop("SONIC_CACHE_DIR", None)
+    # The app finds its stylesheet relative to the working directory.
+    os.chdir(SRC_DIR)
+
+    audio = make_wav(args.audio_words)
+    # One untimed session loads the feature modules and the shared resources first, on a text of its own.
+    Session(make_corpus(args.words, seed=-1), audio, args.timeout).journey()
+
+    results = []
+    print("{:>8} {:>7} {:>8} {:>8} {:>8} {:>10} {:>10} {:>7} {:>9} {:>11} {:>6}".format(
+        "sessions", "reruns", "p50 s", "p95 s", "p99 s", "cold p95 s", "warm p95 s", "cpu s", "cpu cores",
+        "MiB/session", "errors"))
+    for level, sessions in enumerate(args.sessions):
+        texts = [make_corpus(args.words, seed=level * args.texts + number) for number in range(args.texts)]
+        result = run_level(sessions, args.rounds, texts, audio, args.timeout)
+        results.append(result)
+        print("{sessions:>8} {reruns:>7} {p50_s:>8.3f} {p95_s:>8.3f} {p99_s:>8.3f} {cold_p95_s:>10.3f} "
+              "{warm_p95_s:>10.3f} {cpu_s:>7.1f} {cpu_cores:>9.2f} {mib_per_session:>11.2f} {errors:>6}"
+              .format(**result), flush=True)
+        for error in result["first_errors"]:
+            print("    " + error)
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"results": results}, output, indent=2)
+    return 1 if any(result["errors"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Benchmark suite timing every feature stage on synthetic corpora of increasing size.
+
+Network backends (translation, recognition, synthesis) are replaced with local stand-ins, so the numbers
+measure only this code. Each stage reports its best wall time over the repeats, throughput in words per
+second and peak traced memory. Results can be saved as a baseline and later runs compared against it.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 100 1000 ...] [--stages pos sentiment ...]
+                                        [--save-baseline FILE] [--compare FILE] [--threshold 0.2]
+"""
+import argparse
+import gc
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from features.cache import LRUCache
+from features.text_document import TextDocument
+from features.text_analyzer import TextAnalyzer
+from features.word_processor import WordProcessor
+from features.word_cloud_generator import WordCloudGenerator
+from features.sentiment_analysis import SentimentAnalysis
+from features.text_summarizer import TextSummarizer
+from features.translation_cache import CachedTranslator, EchoTranslatorBackend
+from features.speech_converter import SpeechConverter, StubSpeechBackend
+from features.speech_recognition_google import SpeechRecognizer, StubRecognizerBackend
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+# Longer recordings (over an hour at 0.4 s per word) are not built: the WAV alone would take gigabytes.
+MAX_AUDIO_WORDS = 10_000
+
+_WORDS = (
+    "the a of and to in is that it was for on are with as his they be at one have this from or had by "
+    "word but what some we can out other were all there when up use your how said an each she which do "
+    "their time if will way about many then them write would like so these her long make thing see him "
+    "two has look more day could go come did number sound no most people my over know water than call "
+    "first who may down side been now find good great happy love excellent wonderful bad terrible sad "
+    "awful hate angry poor nice fine best worst problem help thanks sorry customer service call order "
+    "account payment refund delivery support issue question answer manager agent wait minute hour"
+).split()
+
+
+def make_corpus(word_count: int, seed: int = 0) -> str:
+    """
+    Build a deterministic synthetic English-like text.
+
+    Words follow a Zipf-like distribution over a fixed vocabulary, grouped into sentences of 6 to 20 words.
+
+    Args:
+        word_count (int): The number of words in the text.
+        seed (int, optional): The random seed. Default is 0.
+
+    Returns:
+        str: The synthetic text.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(_WORDS))]
+    words = rng.choices(_WORDS, weights=weights, k=word_count)
+    sentences = []
+    position = 0
+    while position < word_count:
+        length = rng.randint(6, 20)
+        sentence = words[position:position + length]
+        position += length
+        sentences.append(" ".join(sentence).capitalize() + rng.choice(".!?"))
+    return " ".join(sentences)
+
+
+def make_wav(word_count: int, seconds_per_word: float = 0.4, sample_rate: int = 16000) -> bytes:
+    """
+    Build a synthetic speech-like WAV recording: tone bursts separated by pauses.
+
+    A 6-second clip is generated once and tiled, so only the WAV bytes themselves grow with the length.
+
+    Args:
+        word_count (int): The number of words the recording stands for.
+        seconds_per_word (float, optional): The speaking rate. Default is 0.4.
+        sample_rate (int, optional): The sample rate in Hz. Default is 16000.
+
+    Returns:
+        bytes: The WAV file contents.
+    """
+    clip_frames = 6 * sample_rate
+    time_axis = np.arange(clip_frames) / sample_rate
+    envelope = (np.sin(2 * np.pi * time_axis / 6) > -0.5).astype(np.float64)
+    clip = (np.sin(2 * np.pi * 220 * time_axis) * envelope * 8000).astype(np.int16).tobytes()
+    frames = int(max(1.0, word_count * seconds_per_word) * sample_rate)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for start in range(0, frames, clip_frames):
+            wav.writeframes(clip[:2 * min(clip_frames, frames - start)])
+    return buffer.getvalue()
+
+
+def bench_translation(text: str) -> None:
+    CachedTranslator(backend=EchoTranslatorBackend()).translate_chunked(text)
+
+
+def bench_document(text: str) -> None:
+    document = TextDocument(text)
+    document.tags
+    document.word_counts
+
+
+def bench_pos(text: str) -> None:
+    TextAnalyzer.count_pos(text)
+
+
+def bench_word_counts(text: str) -> None:
+    WordProcessor(text).process_input_text_blob()
+
+
+def bench_word_cloud(text: str) -> None:
+    WordCloudGenerator(text, "Default").word_cloud_from_input()
+
+
+def bench_sentiment(text: str) -> None:
+    sentiment = SentimentAnalysis(text)
+    sentiment.categorize_words()
+    sentiment.count_tags()
+
+
+def bench_summary(text: str) -> None:
+    TextSummarizer(text).summarize_text(length=3)
+
+
+def bench_speech_recognition(audio: bytes) -> None:
+    SpeechRecognizer(io.BytesIO(audio), backend=StubRecognizerBackend()).transcribe()
+
+
+def bench_speech_synthesis(text: str) -> None:
+    SpeechConverter(text, backend=StubSpeechBackend(), cache=LRUCache()).convert_to_speech()
+
+
+STAGES = {
+    "translation": bench_translation,
+    "document": bench_document,
+    "pos": bench_pos,
+    "word_counts": bench_word_counts,
+    "word_cloud": bench_word_cloud,
+    "sentiment": bench_sentiment,
+    "summary": bench_summary,
+    "speech_recognition": bench_speech_recognition,
+    "speech_synthesis": bench_speech_synthesis,
+}
+
+
+def measure(stage, payload, repeat: int) -> tuple[float, float]:
+    """
+    Time a stage and trace its peak memory.
+
+    Args:
+        stage: The stage function.
+        payload: The stage input.
+        repeat (int): The number of timed runs; the best one is kept.
+
+    Returns:
+        tuple[float, float]: The best wall time in seconds and the peak traced memory in MiB.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        stage(payload)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    stage(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def run(sizes: list[int], stages: list[str], repeat: int) -> list[dict]:
+    """
+    Run the selected stages on every corpus size.
+
+    Args:
+        sizes (list[int]): The corpus sizes in words.
+        stages (list[str]): The names of the stages to run.
+        repeat (int): The number of timed runs per measurement.
+
+    Returns:
+        list[dict]: One result per (stage, size).
+    """
+    results = []
+    for size in sizes:
+        text = make_corpus(size)
+        audio = make_wav(size) if "speech_recognition" in stages and size <= MAX_AUDIO_WORDS else None
+        for name in stages:
+            if name == "speech_recognition" and audio is None:
+                print("{:<20} {:>9} words skipped, longer than {} words of audio".format(
+                    name, size, MAX_AUDIO_WORDS), flush=True)
+                continue
+            payload = audio if name == "speech_recognition" else text
+            seconds, peak_mib = measure(STAGES[name], payload, repeat)
+            result = {"stage": name, "words": size, "seconds": round(seconds, 6),
+                      "words_per_second": round(size / seconds) if seconds else None,
+                      "peak_mib": round(peak_mib, 3)}
+            results.append(result)
+            print("{stage:<20} {words:>9} words {seconds:>10.4f}s {words_per_second:>12} words/s "
+                  "{peak_mib:>9.2f} MiB".format(**result), flush=True)
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """
+    Find the measurements that got slower than the baseline by more than the threshold.
+
+    Args:
+        results (list[dict]): The current results.
+        baseline (list[dict]): The baseline results.
+        threshold (float): The tolerated relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    reference = {(item["stage"], item["words"]): item for item in baseline}
+    regressions = []
+    for result in results:
+        previous = reference.get((result["stage"], result["words"]))
+        if previous is None or not previous["seconds"]:
+            continue
+        change = result["seconds"] / previous["seconds"] - 1
+        if change > threshold:
+            regressions.append("{} @ {} words: {:.4f}s -> {:.4f}s (+{:.0%})".format(
+                result["stage"], result["words"], previous["seconds"], result["seconds"], change))
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Default is sys.argv[1:].
+
+    Returns:
+        int: 1 if a regression was found, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark every feature stage across input sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="corpus sizes in words")
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), default=list(STAGES),
+                        help="stages to run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per measurement")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results with a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown reported as a regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.stages, args.repeat)
+
+    if args.save_baseline:
+        payload = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        Path(args.save_baseline).write_text(json.dumps(payload, indent=2))
+        print("Baseline saved to {}".format(args.save_baseline))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+        print("No regressions beyond {:.0%}".format(args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
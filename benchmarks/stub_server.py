@@ -0,0 +1,173 @@
+"""
+Local stand-in for the Google Translate mobile page, to measure network throughput offline.
+
+The server answers GET /m?q=TEXT with the page structure HttpTranslatorBackend parses, echoing the text
+after a configurable delay, and keeps connections alive. It can run on its own, so the app can be pointed
+at it with SONIC_TRANSLATE_URL, or measure the throughput of fresh connections against the pooled
+NetworkService.
+
+Usage:
+    python benchmarks/stub_server.py serve [--port 8765] [--delay 0.05]
+    python benchmarks/stub_server.py measure [--requests 200] [--concurrency 16] [--delay 0.05]
+"""
+import argparse
+import html
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from features.network_service import NetworkService
+from features.translation_cache import HttpTranslatorBackend
+
+
+class StubTranslateHandler(BaseHTTPRequestHandler):
+    """
+    Answers translate page requests with the query text, counting requests and new connections.
+    """
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.05
+    requests = 0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubTranslateHandler.lock:
+            StubTranslateHandler.connections += 1
+
+    def do_GET(self):
+        with StubTranslateHandler.lock:
+            StubTranslateHandler.requests += 1
+        query = parse_qs(urlparse(self.path).query)
+        text = query.get("q", [""])[0]
+        if self.delay:
+            time.sleep(self.delay)
+        body = '<html><body><div class="result-container">{}</div></body></html>'.format(html.escape(text))
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 0, delay: float = 0.05) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a background thread.
+
+    Args:
+        port (int, optional): The port to listen on; 0 picks a free one. Default is 0.
+        delay (float, optional): Seconds to wait before each answer. Default is 0.05.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its URL is http://127.0.0.1:<server_port>/m.
+    """
+    StubTranslateHandler.delay = delay
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubTranslateHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fresh_connection_translate(url: str, text: str) -> str:
+    """
+    Translate like deep_translator does, with a new connection per request.
+
+    Args:
+        url (str): The translate page URL.
+        text (str): The text to translate.
+
+    Returns:
+        str: The response body.
+    """
+    response = requests.get(url, params={"tl": "en", "sl": "auto", "q": text})
+    response.raise_for_status()
+    return response.text
+
+
+def measure(n_requests: int, concurrency: int, delay: float) -> list[dict]:
+    """
+    Measure the throughput of fresh connections and of the pooled NetworkService against the stub server.
+
+    Args:
+        n_requests (int): The number of distinct requests per run.
+        concurrency (int): The number of requests in flight at once.
+        delay (float): The server delay per request in seconds.
+
+    Returns:
+        list[dict]: Per run: name, seconds, requests per second and connections opened.
+    """
+    server = serve(delay=delay)
+    url = "http://127.0.0.1:{}/m".format(server.server_port)
+    texts = ["sentence number {}".format(i) for i in range(n_requests)]
+    service = NetworkService(limits={"translation": concurrency})
+    backend = HttpTranslatorBackend(base_url=url, pool_size=concurrency)
+    runs = {
+        "sequential, fresh connections": lambda: [fresh_connection_translate(url, text) for text in texts],
+        "threads, fresh connections": lambda: list(ThreadPoolExecutor(concurrency).map(
+            lambda text: fresh_connection_translate(url, text), texts)),
+        "NetworkService, pooled session": lambda: [future.result() for future in [
+            service.submit("translation", text, backend.translate, text, "auto", "en") for text in texts]],
+    }
+
+    results = []
+    for name, run in runs.items():
+        StubTranslateHandler.connections = 0
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        results.append({"run": name, "seconds": seconds, "requests_per_s": n_requests / seconds,
+                        "connections": StubTranslateHandler.connections})
+    service.close()
+    server.shutdown()
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Default is sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Local Google Translate stand-in for offline measurements.")
+    parser.add_argument("command", choices=("serve", "measure"))
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (serve)")
+    parser.add_argument("--delay", type=float, default=0.05, help="server delay per request in seconds")
+    parser.add_argument("--requests", type=int, default=200, help="requests per run (measure)")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight (measure)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = serve(args.port, args.delay)
+        print("Serving on http://127.0.0.1:{}/m".format(server.server_port))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+
+    print("{:<32} {:>9} {:>10} {:>12}".format("run", "seconds", "req/s", "connections"))
+    for result in measure(args.requests, args.concurrency, args.delay):
+        print("{run:<32} {seconds:9.2f} {requests_per_s:10.1f} {connections:12d}".format(**result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
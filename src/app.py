@@ -1,17 +1,240 @@
+import os
 import streamlit as st
-import nltk
 from pathlib import Path
-import matplotlib.pyplot as plt
-from deep_translator import GoogleTranslator
-from features.text_analyzer import TextAnalyzer, ChartDrawer
-from features.sentiment_analysis import SentimentAnalysis
-from features.text_summarizer import TextSummarizer
-from features.word_cloud_generator import WordCloudGenerator
-from features.word_processor import WordProcessor
-from features.speech_converter import SpeechConverter
-from features.speech_recognition_google import SpeechRecognizer
+from typing import Callable, Optional, Union
+from features.cache import content_hash
+from features.translation_cache import (GOOGLE_TRANSLATE_URL, CachedTranslator, EchoTranslatorBackend,
+                                        HttpTranslatorBackend, TranslationCache)
+from features.network_service import NetworkService, ServiceTranslatorBackend
+from features.instrumentation import REGISTRY, start_run, timed
 
+# Feature modules pull in TextBlob, NLTK, VADER, matplotlib, wordcloud, gTTS and speech_recognition,
+# so they are imported inside the section that needs them instead of at startup.
 
+MAX_TEXT_CHARS = 100_000
+
+SECTIONS = ("Translator to en", "POS", "WordsCount", "Wordcloud", "Sentiment analyzer", "Summary", "Text to speech")
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def load_document(text: str) -> "TextDocument":
+    """
+    Build the analyzed document for a text once and share it across reruns.
+
+    Args:
+        text (str): The text to analyze.
+
+    Returns:
+        TextDocument: The analyzed document.
+    """
+    from features.text_document import TextDocument
+    return TextDocument(text)
+
+
+def offline_latency() -> Optional[float]:
+    """
+    Tell whether the network backends are replaced by local stand-ins, e.g. for load tests.
+
+    Stand-ins are used when the SONIC_OFFLINE_BACKENDS environment variable is set; SONIC_OFFLINE_LATENCY
+    then gives the seconds each stand-in request takes (default 0).
+
+    Returns:
+        Optional[float]: The latency of a stand-in request, or None when the real services are used.
+    """
+    if not os.environ.get("SONIC_OFFLINE_BACKENDS"):
+        return None
+    return float(os.environ.get("SONIC_OFFLINE_LATENCY", "0"))
+
+
+def cache_dir() -> Optional[str]:
+    """
+    Get the directory of the on-disk cache tiers, from the SONIC_CACHE_DIR environment variable.
+
+    In offline mode there is none, so the results of the stand-in backends never outlive the process.
+
+    Returns:
+        Optional[str]: The directory, or None when the disk tiers are disabled.
+    """
+    if offline_latency() is not None:
+        return None
+    return os.environ.get("SONIC_CACHE_DIR") or None
+
+
+@st.cache_resource
+def get_network_service() -> NetworkService:
+    """
+    Create the process-wide service making the translation, recognition and synthesis requests.
+
+    Returns:
+        NetworkService: The service shared by every session.
+    """
+    return NetworkService()
+
+
+@st.cache_resource
+def get_recognition_queue() -> "RecognitionQueue":
+    """
+    Create the process-wide queue of speech recognition requests, using the stub backend in offline mode.
+
+    The number of workers and the sustained requests per second are read from the SONIC_RECOGNITION_WORKERS
+    and SONIC_RECOGNITION_RATE environment variables (default 4 and 5).
+
+    Returns:
+        RecognitionQueue: The queue shared by every session.
+    """
+    from features.recognition_queue import RecognitionQueue
+    from features.speech_recognition_google import GoogleRecognizerBackend, StubRecognizerBackend
+
+    latency = offline_latency()
+    backend = GoogleRecognizerBackend() if latency is None else StubRecognizerBackend(delay=latency)
+    return RecognitionQueue(backend, workers=int(os.environ.get("SONIC_RECOGNITION_WORKERS", "4")),
+                            rate=float(os.environ.get("SONIC_RECOGNITION_RATE", "5")))
+
+
+@st.cache_resource
+def get_translator() -> CachedTranslator:
+    """
+    Create the process-wide cached translator.
+
+    Requests go through the network service over a pooled HTTP session, to the URL in the
+    SONIC_TRANSLATE_URL environment variable if set (e.g. the stub server in benchmarks/stub_server.py).
+    Otherwise, in offline mode, texts are echoed back untranslated. The on-disk cache tier is enabled
+    outside offline mode when the SONIC_CACHE_DIR environment variable is set (see cache_dir).
+
+    Returns:
+        CachedTranslator: The translator shared by every session.
+    """
+    directory = cache_dir()
+    disk_dir = os.path.join(directory, "translations") if directory else None
+    latency = offline_latency()
+    if latency is not None and not os.environ.get("SONIC_TRANSLATE_URL"):
+        backend = EchoTranslatorBackend(delay=latency)
+    else:
+        backend = HttpTranslatorBackend(base_url=os.environ.get("SONIC_TRANSLATE_URL", GOOGLE_TRANSLATE_URL))
+    return CachedTranslator(backend=ServiceTranslatorBackend(get_network_service(), backend),
+                            cache=TranslationCache(disk_dir=disk_dir), source='auto', target='en')
+
+
+@st.cache_resource
+def get_result_store() -> "ResultStore":
+    """
+    Create the process-wide store of analysis results shared by every session.
+
+    The SQLite tier is enabled outside offline mode when the SONIC_CACHE_DIR environment variable is set
+    (see cache_dir), so results also survive restarts.
+
+    Returns:
+        ResultStore: The store shared by every session.
+    """
+    from features.result_store import ResultStore
+
+    directory = cache_dir()
+    return ResultStore(db_path=os.path.join(directory, "results.sqlite3") if directory else None)
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up_resources() -> dict:
+    """
+    Preload the NLTK data and the VADER lexicon once per process.
+
+    Returns:
+        dict: Resource name -> seconds taken to load it, plus the 'total'.
+    """
+    from features.resources import warm_up
+    return warm_up()
+
+
+def memoize(source: Union[str, bytes], name: str, compute: Callable, scope: str = "analysis",
+            shared: bool = False):
+    """
+    Compute a result once per input and session.
+
+    Each scope keeps the results of a single input in the session state, and drops them as soon as
+    its input changes. Shared results are also looked up in, and added to, the result store of the
+    process, so a text analyzed by one session (or before a reload) is not analyzed again.
+
+    Args:
+        source (Union[str, bytes]): The input the result belongs to.
+        name (str): The name of the result, including any parameters it depends on.
+        compute (Callable): Function computing the result on a miss.
+        scope (str, optional): The memo holding the result. Default is 'analysis'.
+        shared (bool, optional): Use the result store; the result must be picklable and is never
+            modified. Default is False.
+
+    Returns:
+        The memoized result.
+    """
+    key = content_hash(source)
+    state_key = "memo_" + scope
+    memo = st.session_state.get(state_key)
+    if memo is None or memo["key"] != key:
+        memo = st.session_state[state_key] = {"key": key, "results": {}}
+    if name not in memo["results"]:
+        if shared:
+            memo["results"][name] = get_result_store().get_or_compute(key, name, compute)
+        else:
+            memo["results"][name] = compute()
+    return memo["results"][name]
+
+
+def upload_key(uploaded_file) -> str:
+    """
+    Identify an uploaded file without reading or hashing its content.
+
+    Args:
+        uploaded_file: The uploaded file.
+
+    Returns:
+        str: Its Streamlit file id, which changes whenever a file is uploaded again, or its name and size
+            for file-like objects without one.
+    """
+    file_id = getattr(uploaded_file, "file_id", None) or getattr(uploaded_file, "id", None)
+    if file_id is not None:
+        return "upload:{}".format(file_id)
+    size = getattr(uploaded_file, "size", None)
+    if size is None:
+        size = uploaded_file.getbuffer().nbytes
+    return "upload:{}:{}".format(uploaded_file.name, size)
+
+
+def forget(name: str, scope: str = "analysis") -> None:
+    """
+    Drop a memoized result, e.g. a failed request, so the next rerun computes it again.
+
+    Args:
+        name (str): The name of the result.
+        scope (str, optional): The memo holding the result. Default is 'analysis'.
+    """
+    memo = st.session_state.get("memo_" + scope)
+    if memo is not None:
+        memo["results"].pop(name, None)
+
+
+def document_for(text: str, translated_line_edit: str) -> "TextDocument":
+    """
+    Get the analyzed document of the translated text for the current input.
+
+    Args:
+        text (str): The input text.
+        translated_line_edit (str): The translated text.
+
+    Returns:
+        TextDocument: The analyzed document, unless one was already memoized for the input, e.g. by incremental analysis.
+    """
+    return memoize(text, "document", lambda: load_document(translated_line_edit))
+
+
+def get_incremental_analyzer() -> "IncrementalAnalyzer":
+    """
+    Get the incremental analyzer of the current session, creating it on first use.
+
+    Returns:
+        IncrementalAnalyzer: The analyzer keeping the per-sentence results of the session.
+    """
+    if "incremental_analyzer" not in st.session_state:
+        from features.incremental_analyzer import IncrementalAnalyzer
+        st.session_state["incremental_analyzer"] = IncrementalAnalyzer(get_translator())
+    return st.session_state["incremental_analyzer"]
 
 
 class SpeechToTextApp:
@@ -20,7 +243,6 @@ class SpeechToTextApp:
         Initializes the SpeechToTextApp class and sets up the Streamlit application.
         """
         st.set_page_config(page_title="Speech-to-Text Transcription App", page_icon="⚙️", layout="wide")
-        st.set_option('deprecation.showPyplotGlobalUse', False)
         current_dir = Path(__file__).parent if "__file__" in locals() else Path.cwd()
         css_file = current_dir / "styles" / "main.css"
         with open(css_file) as f:
@@ -28,124 +250,511 @@ class SpeechToTextApp:
             st.markdown("<h1 style='text-align: center;'>Sonic speech2text</h1>", unsafe_allow_html=True)
         self.line_edit: str = None
 
-    def layouts(self, text: str):
+    def layouts(self, text: str, analyzer: Optional["IncrementalAnalyzer"] = None):
         """
-        Creates different layout tabs for the Streamlit application.
+        Creates the analysis sections for the Streamlit application.
+
+        Only the selected section is computed on a rerun, and its results are memoized for the current text.
+        Translation, POS counts, word counts, sentiment, summaries and speech are also kept in the shared
+        result store, so a text already analyzed by any session is served from it; incremental results are
+        only kept in the session, since they differ from those of the whole text. Otherwise the translation
+        is requested through the network service, which makes a single request for sessions translating the
+        same text at the same time. Every section works on the translation, so every section waits for it.
 
         Args:
             text (str): The input text to be processed.
+            analyzer (Optional[IncrementalAnalyzer], optional): Analyzer updating the previous results sentence
+                by sentence instead of analyzing the whole text again. Default is None.
 
         Returns:
             None
         """
         if text:
-            translated_line_edit = GoogleTranslator(source='auto', target='en').translate(text)
-            tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["Translator to en", "POS", "WordsCount", "Wordcloud",
-                                                                "Sentiment analyzer", "Summary", "Text to speech"])
-            with tab1:
-                if translated_line_edit == text:
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.write("")
-                    with col2:
-                        st.header("Text: ")
-                        st.write(translated_line_edit)
-                    with col3:
-                        st.write("")
-                else:
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.header("Before translate")
-                        st.write(text)
-                    with col2:
-                        st.header("After translate")
-                        st.write(translated_line_edit)
-
-            with tab2:
-                keywords, pos_counts = TextAnalyzer.analyze_text_blob(translated_line_edit)
-                ChartDrawer.draw_bar_chart(keywords, pos_counts)
-
-            with tab3:
-                processor = WordProcessor(translated_line_edit)
-                words_count = processor.process_input_text_blob()
-                processor.generate_bar_chart(words_count)
-
-            with tab4:
-                option = st.selectbox('Apply the background color: ',
-                                     ('Default', 'White', 'Black', 'Red', 'Yellow', 'Green', 'Orange', 'Purple', 'Blue', 'Pink'))
-                wc_generator = WordCloudGenerator(translated_line_edit, option)
-                with st.columns(3)[1]:
-                    wordcloud = wc_generator.word_cloud_from_input()
-
-                    fig, ax = plt.subplots(figsize=(6, 6))
-                    plt.axis('off')
-                    plt.tight_layout()
-                    plt.imshow(wordcloud, interpolation='bilinear')
-                    st.pyplot()
-
-            with tab5:
-                sentiment_analysis = SentimentAnalysis(translated_line_edit)
-                negatives, neutrals, positives = sentiment_analysis.categorize_words()
-
-                pos_counts = sentiment_analysis.count_tags()
-
-                co1, co2, co3 = st.columns(3)
-                with co1:
-                    st.metric("Negative", str(round(sentiment_analysis.score['neg'] * 100)) + '%', len(negatives),
-                              delta_color="inverse")
-                with co2:
-                    st.metric("Neutral", str(round(sentiment_analysis.score['neu'] * 100)) + '%', len(neutrals),
-                              delta_color="off")
-                with co3:
-                    st.metric("Positive", str(round(sentiment_analysis.score['pos'] * 100)) + '%', len(positives))
+            # Incremental results are aggregated sentence by sentence, so they are kept out of the shared store.
+            shared = analyzer is None
+            if analyzer is not None:
+                with timed("incremental"):
+                    stats = memoize(text, "incremental", lambda: analyzer.update(text))
+                    translated_line_edit = memoize(text, "translation", lambda: analyzer.translation)
+                    memoize(text, "document", lambda: analyzer.to_document(translated_line_edit))
+                    memoize(text, "sentiment_score", lambda: analyzer.sentiment_score)
+                st.caption("{added} sentences analyzed, {reused} reused, {removed} removed".format(**stats))
+                request = stored = None
+            else:
+                stored = get_result_store().get(content_hash(text), "translation")
+                request = memoize(text, "translation_request", lambda: None if stored is not None else
+                                  get_network_service().submit("translation.document", content_hash(text),
+                                                               get_translator().translate_chunked, text))
+            section = st.radio('', SECTIONS, horizontal=True, key="section")
+            with timed("translation"), st.spinner("Translating..."):
+                try:
+                    translated_line_edit = memoize(text, "translation", lambda: stored if stored is not None else
+                                                   request.result(), shared=shared)
+                except Exception:
+                    forget("translation_request")
+                    raise
+
+            if section == "Translator to en":
+                self.show_translation(text, translated_line_edit)
+            elif section == "POS":
+                self.show_pos(text, translated_line_edit, shared)
+            elif section == "WordsCount":
+                self.show_word_counts(text, translated_line_edit, shared)
+            elif section == "Wordcloud":
+                self.show_word_cloud(text, translated_line_edit)
+            elif section == "Sentiment analyzer":
+                self.show_sentiment(text, translated_line_edit, shared)
+            elif section == "Summary":
+                self.show_summary(text, translated_line_edit, shared)
+            elif section == "Text to speech":
+                self.show_text_to_speech(translated_line_edit)
+
+    @staticmethod
+    def show_translation(text: str, translated_line_edit: str):
+        """
+        Show the input text next to its English translation.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+        """
+        if translated_line_edit == text:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.write("")
+            with col2:
+                st.header("Text: ")
+                st.write(translated_line_edit)
+            with col3:
+                st.write("")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.header("Before translate")
+                st.write(text)
+            with col2:
+                st.header("After translate")
+                st.write(translated_line_edit)
+
+    @staticmethod
+    def show_pos(text: str, translated_line_edit: str, shared: bool = True):
+        """
+        Show the part-of-speech counts.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+            shared (bool, optional): Keep the results in the shared result store. Default is True; False in
+                incremental mode, whose sentence by sentence results differ from those of the whole text.
+        """
+        from features.text_analyzer import TextAnalyzer, ChartDrawer
+
+        with timed("pos"):
+            pos_counts = memoize(text, "pos_counts",
+                                 lambda: TextAnalyzer.count_pos(document_for(text, translated_line_edit)),
+                                 shared=shared)
+            options = list(pos_counts.keys())
+            keywords = st.multiselect("Select keywords", options, default=options)
+            ChartDrawer.draw_bar_chart(keywords, pos_counts)
+
+    @staticmethod
+    def show_word_counts(text: str, translated_line_edit: str, shared: bool = True):
+        """
+        Show the word counts chart.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+            shared (bool, optional): Keep the results in the shared result store. Default is True; False in
+                incremental mode, whose sentence by sentence results differ from those of the whole text.
+        """
+        from features.word_processor import WordProcessor
+
+        with timed("word_counts"):
+            processor = WordProcessor(document_for(text, translated_line_edit))
+            words_count = memoize(text, "vocabulary", processor.vocabulary, shared=shared)
+            processor.generate_bar_chart(words_count)
+
+    @staticmethod
+    def show_word_cloud(text: str, translated_line_edit: str):
+        """
+        Show the word cloud.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+        """
+        from features.word_cloud_generator import WordCloudGenerator
+
+        option = st.selectbox('Apply the background color: ',
+                              ('Default', 'White', 'Black', 'Red', 'Yellow', 'Green', 'Orange', 'Purple', 'Blue', 'Pink'))
+        with timed("word_cloud"):
+            wc_generator = WordCloudGenerator(document_for(text, translated_line_edit), option)
+            with st.columns(3)[1]:
+                try:
+                    st.image(wc_generator.render_png(), use_column_width=True)
+                except ValueError:
+                    st.write("No data available")
+
+    @staticmethod
+    def show_sentiment(text: str, translated_line_edit: str, shared: bool = True):
+        """
+        Show the sentiment metrics and pie chart.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+            shared (bool, optional): Keep the results in the shared result store. Default is True; False in
+                incremental mode, whose sentence by sentence results differ from those of the whole text.
+        """
+        from features.sentiment_analysis import SentimentAnalysis
+
+        with timed("sentiment"):
+            score = memoize(text, "sentiment_score",
+                            lambda: SentimentAnalysis(document_for(text, translated_line_edit)).score, shared=shared)
+            sentiment_analysis = memoize(text, "sentiment",
+                                         lambda: SentimentAnalysis(document_for(text, translated_line_edit), score))
+            negatives, neutrals, positives = memoize(text, "sentiment_words", sentiment_analysis.categorize_words,
+                                                     shared=shared)
+
+            co1, co2, co3 = st.columns(3)
+            with co1:
+                st.metric("Negative", str(round(sentiment_analysis.score['neg'] * 100)) + '%', len(negatives),
+                          delta_color="inverse")
+            with co2:
+                st.metric("Neutral", str(round(sentiment_analysis.score['neu'] * 100)) + '%', len(neutrals),
+                          delta_color="off")
+            with co3:
+                st.metric("Positive", str(round(sentiment_analysis.score['pos'] * 100)) + '%', len(positives))
+
+            labels, sizes = sentiment_analysis.get_sentiment_labels_sizes()
+
+            co1, co2, co3 = st.columns(3)
+            with co1:
+                st.write("")
+            with co2:
+                st.image(sentiment_analysis.plot_pie_chart(labels, sizes), use_column_width=True)
+
+            with co3:
+                st.write("")
+
+        if st.checkbox("Sentence timeline"):
+            SpeechToTextApp.show_sentiment_timeline(text, translated_line_edit)
+
+    @staticmethod
+    def show_sentiment_timeline(text: str, translated_line_edit: str):
+        """
+        Show how the sentiment changes over the text, sentence by sentence.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+        """
+        from features.sentiment_timeline import SentimentTimeline
+
+        with timed("sentiment.timeline"):
+            timeline = memoize(text, "sentiment_timeline",
+                               lambda: SentimentTimeline(document_for(text, translated_line_edit)))
+            if len(timeline) < 2:
+                st.write("No data available")
+                return
+            window = st.slider('Sentences averaged:', 1, min(len(timeline), 200), min(len(timeline), 20))
+            st.line_chart(timeline.rolling(window)[['neg', 'pos', 'compound']])
+
+            most_negative, most_positive = timeline.extremes()
+            co1, co2 = st.columns(2)
+            with co1:
+                st.caption("Most negative sentences")
+                for sentence, compound in most_negative:
+                    st.write("{:+.2f} {}".format(compound, sentence))
+            with co2:
+                st.caption("Most positive sentences")
+                for sentence, compound in most_positive:
+                    st.write("{:+.2f} {}".format(compound, sentence))
+
+    @staticmethod
+    def show_summary(text: str, translated_line_edit: str, shared: bool = True):
+        """
+        Show the summary controls and, on request, the summary.
+
+        Args:
+            text (str): The input text.
+            translated_line_edit (str): The translated text.
+            shared (bool, optional): Keep the results in the shared result store. Default is True; False in
+                incremental mode, whose sentence by sentence results differ from those of the whole text.
+        """
+        from features.text_summarizer import TextSummarizer
+
+        co1, co2 = st.columns(2)
+        with co1:
+            length = st.number_input('Number of sentences:', min_value=1, max_value=50, value=1)
+        with co2:
+            method = st.selectbox('Scoring method:', TextSummarizer.METHODS)
+        if st.button("Summarize"):
+            with timed("summary"):
+                summary = memoize(text, "summary:{}:{}".format(length, method),
+                                  lambda: TextSummarizer(document_for(text, translated_line_edit)).summarize_text(
+                                      length=int(length), method=method), shared=shared)
+            st.write(summary)
+
+    @staticmethod
+    def show_text_to_speech(translated_line_edit: str):
+        """
+        Show the text-to-speech controls and, on request, the audio player.
 
-                labels, sizes = sentiment_analysis.get_sentiment_labels_sizes()
+        Args:
+            translated_line_edit (str): The translated text.
+        """
+        from features.network_service import ServiceSpeechBackend
+        from features.speech_converter import GTTSBackend, SpeechConverter, StubSpeechBackend
+
+        speed = st.radio('', ('slow', 'fast'))
+        if st.button("Click convert to speech"):
+            with st.spinner('Loading...'):
+                latency = offline_latency()
+                backend = ServiceSpeechBackend(get_network_service(),
+                                               GTTSBackend() if latency is None else StubSpeechBackend(latency))
+                speech_converter = SpeechConverter(translated_line_edit, slow=speed == 'slow', lang='en',
+                                                   backend=backend)
+                audio = memoize(translated_line_edit, "speech:{}".format(speed),
+                                lambda: speech_converter.convert_to_speech().getvalue(), scope="speech", shared=True)
+                st.audio(audio, format="audio/mp3")
+
+    @staticmethod
+    def show_text_file_analysis(uploaded_file) -> None:
+        """
+        Analyze an uploaded text file of any size as a stream and show the word, POS and sentiment totals.
+
+        The file is read in chunks and analyzed in batches of sentences, so only running totals are kept.
+
+        Args:
+            uploaded_file (UploadedFile): The uploaded UTF-8 text file.
+        """
+        from features.sentiment_analysis import SentimentAnalysis
+        from features.text_analyzer import ChartDrawer, TextAnalyzer
+        from features.text_document import TextDocument
+        from features.text_stream import StreamingTextAnalyzer
+        from features.word_processor import WordProcessor
+
+        def analyze():
+            uploaded_file.seek(0)
+            bar = st.progress(0.0)
+            size = max(uploaded_file.size, 1)
+            analyzer = StreamingTextAnalyzer().analyze_file(
+                uploaded_file, progress=lambda: bar.progress(min(uploaded_file.tell() / size, 1.0)))
+            bar.empty()
+            return analyzer
+
+        with timed("text_file"):
+            analyzer = memoize(upload_key(uploaded_file), "stream", analyze, scope="text_file")
+
+        co1, co2, co3 = st.columns(3)
+        with co1:
+            st.metric("Sentences", analyzer.sentences)
+        with co2:
+            st.metric("Words", sum(analyzer.word_counts.values()))
+        with co3:
+            st.metric("Characters", analyzer.characters)
+
+        section = st.radio('', ("POS", "WordsCount", "Sentiment analyzer"), horizontal=True, key="file_section")
+        if section == "POS":
+            pos_counts = TextAnalyzer.name_pos_counts(analyzer.pos_count_array)
+            options = list(pos_counts.keys())
+            keywords = st.multiselect("Select keywords", options, default=options)
+            ChartDrawer.draw_bar_chart(keywords, pos_counts)
+        elif section == "WordsCount":
+            processor = WordProcessor(TextDocument.from_precomputed("", word_counts=analyzer.word_counts))
+            vocabulary = memoize(upload_key(uploaded_file), "vocabulary", processor.vocabulary, scope="text_file")
+            processor.generate_bar_chart(vocabulary)
+        elif section == "Sentiment analyzer":
+            score = analyzer.sentiment_score
+            co1, co2, co3 = st.columns(3)
+            with co1:
+                st.metric("Negative", str(round(score['neg'] * 100)) + '%')
+            with co2:
+                st.metric("Neutral", str(round(score['neu'] * 100)) + '%')
+            with co3:
+                st.metric("Positive", str(round(score['pos'] * 100)) + '%')
+            sentiment_analysis = SentimentAnalysis(TextDocument.from_precomputed(""), score)
+            labels, sizes = sentiment_analysis.get_sentiment_labels_sizes()
+            with st.columns(3)[1]:
+                st.image(sentiment_analysis.plot_pie_chart(labels, sizes), use_column_width=True)
+
+    @staticmethod
+    def show_corpus() -> None:
+        """
+        Collect uploaded text and WAV files into a corpus kept for the session, and query it.
+
+        Every document is translated and analyzed once when added; the queries only read the corpus index.
+        """
+        import pandas as pd
+        from features.corpus import Corpus
+        from features.sentiment_analysis import SENTIMENT_KEYS
+        from features.text_analyzer import ChartDrawer
+        from features.text_summarizer import TextSummarizer
+
+        corpus = st.session_state.setdefault("corpus", Corpus())
+        uploaded_files = st.file_uploader("Select text or WAV files", type=["txt", "wav"], accept_multiple_files=True)
+        new_files = [uploaded_file for uploaded_file in uploaded_files or [] if uploaded_file.name not in corpus]
+        if new_files and st.button("Add {} files to the corpus".format(len(new_files))):
+            from features.recognition_queue import QueuedRecognizerBackend
+            from features.speech_recognition_google import SpeechRecognizer
 
-                co1, co2, co3 = st.columns(3)
+            bar = st.progress(0.0)
+            failed = []
+            try:
+                with timed("corpus.ingest"):
+                    for number, uploaded_file in enumerate(new_files, 1):
+                        # One unreadable file or failed request must not lose the files added before it.
+                        try:
+                            if uploaded_file.name.lower().endswith(".wav"):
+                                backend = QueuedRecognizerBackend(get_recognition_queue())
+                                text = SpeechRecognizer(uploaded_file, backend=backend).transcribe()
+                            else:
+                                text = uploaded_file.getvalue().decode("utf-8", errors="replace")
+                            corpus.add_document(uploaded_file.name, get_translator().translate_chunked(text))
+                        except Exception as error:
+                            failed.append("{} ({})".format(uploaded_file.name, str(error) or type(error).__name__))
+                        bar.progress(number / len(new_files))
+            finally:
+                bar.empty()
+            if failed:
+                st.warning("Could not add {} of {} files: {}".format(len(failed), len(new_files), ", ".join(failed)))
+
+        if not len(corpus):
+            st.write("No documents in the corpus")
+            return
+
+        co1, co2 = st.columns(2)
+        with co1:
+            st.metric("Documents", len(corpus))
+        with co2:
+            st.metric("Terms", len(corpus.terms))
+
+        section = st.radio('', ("Top terms", "Find word", "Documents", "Summary"), horizontal=True,
+                           key="corpus_section")
+        with timed("corpus.query"):
+            if section == "Top terms":
+                co1, co2 = st.columns(2)
                 with co1:
-                    st.write("")
+                    n = st.number_input('Number of terms:', min_value=1, max_value=200, value=20)
                 with co2:
-                    fig = sentiment_analysis.plot_pie_chart(labels, sizes)
-                    st.pyplot(fig)
+                    by_documents = st.checkbox("Rank by number of documents")
+                data = pd.DataFrame(corpus.top_terms(int(n), by_documents),
+                                    columns=['Term', 'Number of Appearances', 'Documents'])
+                st.bar_chart(data.set_index('Term')['Documents' if by_documents else 'Number of Appearances'])
+            elif section == "Find word":
+                word = st.text_input("Word:")
+                if word:
+                    data = pd.DataFrame(corpus.documents_containing(word.strip()),
+                                        columns=['Document', 'Number of Appearances'])
+                    st.dataframe(data, use_container_width=True)
+            elif section == "Documents":
+                scores = pd.DataFrame(corpus.sentiment_scores(), columns=SENTIMENT_KEYS, index=corpus.names)
+                st.dataframe(scores, use_container_width=True)
+                name = st.selectbox("Part-of-speech counts of:", ["Whole corpus"] + corpus.names)
+                pos_counts = corpus.pos_counts(None if name == "Whole corpus" else name)
+                ChartDrawer.draw_bar_chart(list(pos_counts.keys()), pos_counts)
+            elif section == "Summary":
+                name = st.selectbox("Document:", corpus.names)
+                length = st.number_input('Number of sentences:', min_value=1, max_value=50, value=1)
+                method = st.selectbox('Scoring method:', ('tfidf', 'textrank'))
+                if st.button("Summarize"):
+                    summarizer = TextSummarizer(corpus.texts[corpus.document_id(name)], idf=corpus.idf())
+                    st.write(summarizer.summarize_text(length=int(length), method=method))
 
-                with co3:
-                    st.write("")
+    @staticmethod
+    def show_debug_panel(timings: list, warm_up_report: Optional[dict] = None) -> None:
+        """
+        Show the stage timings of the current rerun and the aggregated histograms in the sidebar.
 
-            with tab6:
-                if st.button("Summarize"):
-                    summarizer = TextSummarizer(translated_line_edit)
-                    summary = summarizer.summarize_text()
-                    st.write(summary)
-
-            with tab7:
-                speed = st.radio('', ('slow', 'fast'))
-                if st.button("Click convert to speech"):
-                    with st.spinner('Loading...'):
-                        if speed == 'slow':
-                            speech_converter = SpeechConverter(translated_line_edit, slow=True, lang='en')
-                            sound_file = speech_converter.convert_to_speech()
-                        elif speed == 'fast':
-                            speech_converter = SpeechConverter(translated_line_edit, slow=False, lang='en')
-                            sound_file = speech_converter.convert_to_speech()
-
-                        st.audio(sound_file)
+        Args:
+            timings (list): The (stage, seconds) pairs recorded during the current rerun.
+            warm_up_report (Optional[dict], optional): The load time of each preloaded resource, if any.
+        """
+        import pandas as pd
+
+        with st.sidebar.expander("Stage timings", expanded=True):
+            if warm_up_report:
+                st.caption("Cold start")
+                st.dataframe(pd.DataFrame(warm_up_report.items(), columns=['Resource', 'Seconds']),
+                             use_container_width=True)
+            st.caption("This rerun")
+            st.dataframe(pd.DataFrame(timings, columns=['Stage', 'Seconds']), use_container_width=True)
+            st.caption("Since start (p50/p95 are histogram bucket bounds)")
+            st.dataframe(pd.DataFrame(REGISTRY.summary()), use_container_width=True)
+            st.caption("Network requests")
+            st.dataframe(pd.DataFrame.from_dict(get_network_service().stats(), orient="index"),
+                         use_container_width=True)
+            st.caption("Shared results")
+            st.dataframe(pd.DataFrame.from_dict(get_result_store().stats(), orient="index"), use_container_width=True)
+            st.caption("Recognition queue")
+            st.dataframe(pd.DataFrame([get_recognition_queue().stats()]), use_container_width=True)
+            st.download_button("Download Prometheus metrics", REGISTRY.to_prometheus(),
+                               file_name="sonic_metrics.prom", mime="text/plain")
 
     def main(self):
         """
         Main function to run the Streamlit application.
+
+        Stage timings are collected for every rerun. They are shown in the sidebar when "Show stage timings"
+        is ticked, and written in the Prometheus text format to the file named by the SONIC_METRICS_FILE
+        environment variable, if set.
+
+        When the SONIC_WARMUP environment variable is set, the NLTK data and the VADER lexicon are preloaded
+        on the first run of the process instead of by the first section that needs them.
+        """
+        warm_up_report = warm_up_resources() if os.environ.get("SONIC_WARMUP") else None
+        timings = start_run()
+        try:
+            self.run_page()
+        finally:
+            metrics_file = os.environ.get("SONIC_METRICS_FILE")
+            if metrics_file:
+                REGISTRY.write_prometheus(metrics_file)
+        if st.sidebar.checkbox("Show stage timings"):
+            self.show_debug_panel(timings, warm_up_report)
+
+    def run_page(self):
         """
-        option = st.selectbox('Transfer data method:', ('Choose', 'From text', 'Upload file'))
+        Render the input selection and the analysis of the chosen input.
+        """
+        option = st.selectbox('Transfer data method:', ('Choose', 'From text', 'Upload file', 'Upload text file',
+                                                         'Corpus'))
         self.line_edit = None
 
         if option == 'From text':
-            self.line_edit = st.text_area('', placeholder="Write a text message", max_chars=5000)
-            self.layouts(self.line_edit)
+            self.line_edit = st.text_area('', placeholder="Write a text message", max_chars=MAX_TEXT_CHARS)
+            incremental = st.checkbox("Incremental analysis",
+                                      help="Re-analyze only the sentences changed since the last edit")
+            if st.session_state.get("incremental_mode", incremental) != incremental:
+                st.session_state.pop("memo_analysis", None)
+            st.session_state["incremental_mode"] = incremental
+            self.layouts(self.line_edit, get_incremental_analyzer() if incremental else None)
 
         if option == 'Upload file':
             uploaded_file = st.file_uploader("Select WAV file", type="wav")
             if uploaded_file is not None:
+                from features.recognition_queue import QueuedRecognizerBackend
+                from features.speech_recognition_google import SpeechRecognizer
+
                 with st.spinner("Loading..."):
-                    recognizer = SpeechRecognizer(uploaded_file)
-                    self.line_edit = recognizer.recognize_speech_google()
-                    self.layouts(self.line_edit)
+                    backend = QueuedRecognizerBackend(get_recognition_queue())
+                    recognizer = SpeechRecognizer(uploaded_file, backend=backend)
+                    self.line_edit = memoize(upload_key(uploaded_file), "transcript",
+                                             lambda: recognizer.recognize_speech_streaming(st.empty()),
+                                             scope="upload")
+                    report = memoize(upload_key(uploaded_file), "preprocessing",
+                                     recognizer.preprocessing_report, scope="upload")
+                st.caption("Sent {:.1f} MB of audio instead of {:.1f} MB ({:.1f}x smaller, {:.1f} s of silence trimmed)"
+                           .format(report["bytes"] / 1e6, report["original_bytes"] / 1e6, report["ratio"],
+                                   report["trimmed_seconds"]))
+                self.layouts(self.line_edit)
+
+        if option == 'Upload text file':
+            uploaded_file = st.file_uploader("Select text file", type="txt")
+            if uploaded_file is not None:
+                self.show_text_file_analysis(uploaded_file)
 
+        if option == 'Corpus':
+            self.show_corpus()
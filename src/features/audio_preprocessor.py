@@ -0,0 +1,344 @@
+import struct
+import wave
+from typing import BinaryIO, Iterator, Union
+import numpy as np
+import speech_recognition as sr
+from features.audio_segmenter import AudioSegment, pcm_to_mono_int16, segment_samples
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavLayout:
+    """
+    Where the samples of a PCM WAV file are and how they are encoded.
+
+    Attributes:
+        channels (int): The number of interleaved channels.
+        sample_rate (int): The sample rate in Hz.
+        sample_width (int): The bytes per sample.
+        data_offset (int): The byte offset of the first frame.
+        data_size (int): The number of bytes of whole frames.
+    """
+
+    def __init__(self, channels: int, sample_rate: int, sample_width: int, data_offset: int, data_size: int):
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.data_offset = data_offset
+        self.data_size = data_size
+
+    @property
+    def frame_width(self) -> int:
+        """
+        int: The bytes per frame (one sample of every channel).
+        """
+        return self.channels * self.sample_width
+
+    @property
+    def frames(self) -> int:
+        """
+        int: The number of frames.
+        """
+        return self.data_size // self.frame_width
+
+
+def parse_wav_header(buffer: Union[bytes, memoryview, np.ndarray]) -> WavLayout:
+    """
+    Find the format and the data chunk of a RIFF/WAVE file without reading the samples.
+
+    Args:
+        buffer (Union[bytes, memoryview, np.ndarray]): The file contents, or a byte view of them.
+
+    Returns:
+        WavLayout: The layout of the samples.
+
+    Raises:
+        wave.Error: If the buffer is not an uncompressed PCM WAV file, or its header is truncated.
+    """
+    try:
+        return _parse_wav_header(buffer)
+    except struct.error as error:
+        raise wave.Error("truncated WAV header") from error
+
+
+def _parse_wav_header(buffer: Union[bytes, memoryview, np.ndarray]) -> WavLayout:
+    header = bytes(buffer[:12])
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise wave.Error("file does not start with RIFF id")
+    position = 12
+    fmt = None
+    while position + 8 <= len(buffer):
+        chunk_id = bytes(buffer[position:position + 4])
+        chunk_size = struct.unpack("<I", bytes(buffer[position + 4:position + 8]))[0]
+        body = position + 8
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", bytes(buffer[body:body + 16]))
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                format_tag = struct.unpack("<H", bytes(buffer[body + 24:body + 26]))[0]
+            if format_tag != WAVE_FORMAT_PCM:
+                raise wave.Error("unknown format: {}".format(format_tag))
+            if not channels:
+                raise wave.Error("bad # of channels")
+            if not bits:
+                raise wave.Error("bad sample width")
+            if not sample_rate:
+                raise wave.Error("bad frame rate")
+            fmt = (channels, sample_rate, (bits + 7) // 8)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise wave.Error("data chunk before fmt chunk")
+            channels, sample_rate, sample_width = fmt
+            size = min(chunk_size, len(buffer) - body)
+            return WavLayout(channels, sample_rate, sample_width, body, size - size % (channels * sample_width))
+        position = body + chunk_size + chunk_size % 2
+    raise wave.Error("fmt chunk and/or data chunk missing")
+
+
+def open_wav_buffer(source: Union[str, BinaryIO]) -> np.ndarray:
+    """
+    Get the bytes of a WAV file as a NumPy view, without copying them when possible.
+
+    Paths are memory-mapped; in-memory files (BytesIO, Streamlit uploads) are viewed through their buffer.
+
+    Args:
+        source (Union[str, BinaryIO]): Path or file object of the WAV file.
+
+    Returns:
+        np.ndarray: The file contents as a uint8 array.
+    """
+    if isinstance(source, str):
+        return np.memmap(source, dtype=np.uint8, mode="r")
+    if hasattr(source, "getbuffer"):
+        return np.frombuffer(source.getbuffer(), dtype=np.uint8)
+    source.seek(0)
+    return np.frombuffer(source.read(), dtype=np.uint8)
+
+
+def _low_pass(samples: np.ndarray, width: int) -> np.ndarray:
+    # Moving average over `width` samples, a cheap anti-aliasing filter before decimation.
+    if width <= 1 or len(samples) < width:
+        return samples
+    cumulative = np.cumsum(np.concatenate(([0.0], samples)))
+    smoothed = (cumulative[width:] - cumulative[:-width]) / width
+    pad = width - 1
+    return np.concatenate((samples[:pad // 2], smoothed, samples[len(samples) - (pad - pad // 2):]))
+
+
+def iter_resampled_blocks(buffer: np.ndarray, layout: WavLayout, rate: int,
+                          block_s: float = 10.0) -> Iterator[np.ndarray]:
+    """
+    Downmix the samples of a WAV file to mono and resample them, one block at a time.
+
+    Downsampling is a moving-average low-pass followed by linear interpolation. Only one block of the
+    original audio is decoded at a time.
+
+    Args:
+        buffer (np.ndarray): The file contents, e.g. from open_wav_buffer.
+        layout (WavLayout): The layout of the samples, from parse_wav_header.
+        rate (int): The output sample rate in Hz, at most layout.sample_rate.
+        block_s (float, optional): Seconds of output converted at a time. Default is 10.0.
+
+    Yields:
+        np.ndarray: The int16 mono samples at rate, in order.
+    """
+    data = buffer[layout.data_offset:layout.data_offset + layout.data_size]
+    source_rate = layout.sample_rate
+    step = source_rate / rate
+    n_in = layout.frames
+    n_out = int(n_in / step)
+    filter_width = int(round(step))
+
+    block_out = max(1, int(block_s * rate))
+    for out_start in range(0, n_out, block_out):
+        out_end = min(out_start + block_out, n_out)
+        positions = np.arange(out_start, out_end) * step
+        in_start = max(0, int(positions[0]) - filter_width)
+        in_end = min(n_in, int(np.ceil(positions[-1])) + filter_width + 1)
+        raw = data[in_start * layout.frame_width:in_end * layout.frame_width]
+        mono = pcm_to_mono_int16(raw.tobytes(), layout.sample_width, layout.channels).astype(np.float64)
+        if rate != source_rate:
+            mono = np.interp(positions - in_start, np.arange(len(mono)), _low_pass(mono, filter_width))
+        else:
+            mono = mono[out_start - in_start:out_end - in_start]
+        yield np.clip(np.rint(mono), -32768, 32767).astype(np.int16)
+
+
+def size_report(original_bytes: int, sent_bytes: int, original_sample_rate: int, original_channels: int,
+                sample_rate: int, trimmed_seconds: float) -> dict:
+    """
+    Describe how much smaller preprocessing made a recording.
+
+    Args:
+        original_bytes (int): The size of the PCM data before preprocessing.
+        sent_bytes (int): The size of the audio sent for recognition.
+        original_sample_rate (int): The sample rate before preprocessing.
+        original_channels (int): The number of channels before preprocessing.
+        sample_rate (int): The sample rate after preprocessing.
+        trimmed_seconds (float): The silence removed.
+
+    Returns:
+        dict: The sizes before and after, the bytes saved and the silence trimmed.
+    """
+    return {"original_bytes": original_bytes, "bytes": sent_bytes, "bytes_saved": original_bytes - sent_bytes,
+            "ratio": original_bytes / sent_bytes if sent_bytes else float("inf"),
+            "original_sample_rate": original_sample_rate, "original_channels": original_channels,
+            "sample_rate": sample_rate, "trimmed_seconds": trimmed_seconds}
+
+
+class PreprocessedAudio:
+    """
+    A recording reduced to 16-bit mono at the recognition sample rate.
+
+    Attributes:
+        frame_data (bytes): The 16-bit mono PCM samples.
+        sample_rate (int): The sample rate in Hz.
+        original_bytes (int): The size of the PCM data before preprocessing.
+        original_sample_rate (int): The sample rate before preprocessing.
+        original_channels (int): The number of channels before preprocessing.
+        trimmed_seconds (float): The leading and trailing silence removed.
+    """
+
+    def __init__(self, frame_data: bytes, sample_rate: int, original_bytes: int, original_sample_rate: int,
+                 original_channels: int, trimmed_seconds: float):
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.original_bytes = original_bytes
+        self.original_sample_rate = original_sample_rate
+        self.original_channels = original_channels
+        self.trimmed_seconds = trimmed_seconds
+
+    @property
+    def bytes_saved(self) -> int:
+        """
+        int: How many fewer bytes of audio are sent for recognition.
+        """
+        return self.original_bytes - len(self.frame_data)
+
+    def to_audio_data(self) -> sr.AudioData:
+        """
+        Returns:
+            sr.AudioData: The audio in the form expected by speech_recognition.
+        """
+        return sr.AudioData(self.frame_data, self.sample_rate, 2)
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: The sizes before and after, the bytes saved and the silence trimmed.
+        """
+        return size_report(self.original_bytes, len(self.frame_data), self.original_sample_rate,
+                           self.original_channels, self.sample_rate, self.trimmed_seconds)
+
+
+def preprocess_wav(source: Union[str, BinaryIO], target_rate: int = 16000, trim_silence: bool = True,
+                   silence_dbfs: float = -40.0, frame_ms: int = 30, block_s: float = 10.0) -> PreprocessedAudio:
+    """
+    Downmix a WAV file to mono, resample it to target_rate and optionally trim leading and trailing silence.
+
+    The file is read through a memory-mapped (or buffer) view and converted block by block, so only one
+    block of the original audio is decoded at a time. Downsampling is a moving-average low-pass followed by
+    linear interpolation; files already at or below target_rate keep their rate. The reduced audio is
+    returned as a whole; PreprocessedStream reduces it segment by segment instead.
+
+    Args:
+        source (Union[str, BinaryIO]): Path or file object of a PCM WAV file.
+        target_rate (int, optional): The output sample rate in Hz. Default is 16000, enough for speech.
+        trim_silence (bool, optional): Whether to drop leading and trailing silence. Default is True.
+        silence_dbfs (float, optional): Frames quieter than this RMS level count as silence. Default is -40.0.
+        frame_ms (int, optional): The silence detection frame length in milliseconds. Default is 30.
+        block_s (float, optional): Seconds of original audio converted at a time. Default is 10.0.
+
+    Returns:
+        PreprocessedAudio: The reduced audio and its size report.
+
+    Raises:
+        wave.Error: If the file is not a PCM WAV file.
+    """
+    buffer = open_wav_buffer(source)
+    layout = parse_wav_header(buffer)
+    source_rate = layout.sample_rate
+    rate = min(target_rate, source_rate)
+    n_out = int(layout.frames / (source_rate / rate))
+
+    output = np.empty(n_out, dtype=np.int16)
+    position = 0
+    for block in iter_resampled_blocks(buffer, layout, rate, block_s):
+        output[position:position + len(block)] = block
+        position += len(block)
+
+    trimmed = 0
+    if trim_silence and n_out:
+        frame = max(1, rate * frame_ms // 1000)
+        usable = len(output) - len(output) % frame
+        rms = np.sqrt(np.mean(output[:usable].reshape(-1, frame).astype(np.float64) ** 2, axis=1))
+        voiced = np.flatnonzero(rms >= 32768.0 * 10 ** (silence_dbfs / 20))
+        start, end = (voiced[0] * frame, min(len(output), (voiced[-1] + 1) * frame)) if len(voiced) else (0, 0)
+        trimmed = len(output) - (end - start)
+        output = output[start:end]
+
+    return PreprocessedAudio(output.tobytes(), rate, layout.data_size, source_rate, layout.channels,
+                             float(trimmed / rate))
+
+
+class PreprocessedStream:
+    """
+    A recording reduced to 16-bit mono at the recognition sample rate while it is split into segments.
+
+    Unlike preprocess_wav, the reduced audio is never held as a whole: each block is resampled as the
+    segmenter reaches it. With trim_silence, segments without speech are dropped, which also trims the
+    leading and trailing silence; without it, every segment is kept. Once the segments have been consumed,
+    report() gives the same size report as PreprocessedAudio.
+
+    Attributes:
+        layout (WavLayout): The layout of the original samples.
+        sample_rate (int): The sample rate of the segments in Hz.
+        trim_silence (bool): Whether segments without speech are dropped.
+        sent_bytes (int): The size of the segments yielded so far.
+    """
+
+    def __init__(self, source: Union[str, BinaryIO], target_rate: int = 16000, trim_silence: bool = True,
+                 block_s: float = 10.0):
+        """
+        Open the WAV file.
+
+        Args:
+            source (Union[str, BinaryIO]): Path or file object of a PCM WAV file.
+            target_rate (int, optional): The output sample rate in Hz. Default is 16000, enough for speech.
+            trim_silence (bool, optional): Whether to drop the segments without speech. Default is True.
+            block_s (float, optional): Seconds of audio resampled at a time. Default is 10.0.
+
+        Raises:
+            wave.Error: If the file is not a PCM WAV file.
+        """
+        self._buffer = open_wav_buffer(source)
+        self.layout = parse_wav_header(self._buffer)
+        self.sample_rate = min(target_rate, self.layout.sample_rate)
+        self.trim_silence = trim_silence
+        self.block_s = block_s
+        self.sent_bytes = 0
+
+    def segments(self, **segment_options) -> Iterator[AudioSegment]:
+        """
+        Resample the recording block by block and split it at pauses.
+
+        Args:
+            **segment_options: Keyword arguments passed to segment_samples.
+
+        Yields:
+            AudioSegment: The segments, in recording order; only those with speech when trimming silence.
+        """
+        blocks = iter_resampled_blocks(self._buffer, self.layout, self.sample_rate, self.block_s)
+        for segment in segment_samples(blocks, self.sample_rate, keep_silent=not self.trim_silence,
+                                       **segment_options):
+            self.sent_bytes += len(segment.frame_data)
+            yield segment
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: The sizes before and after, the bytes saved and the silence dropped between the segments.
+        """
+        duration = int(self.layout.frames / (self.layout.sample_rate / self.sample_rate)) / self.sample_rate
+        return size_report(self.layout.data_size, self.sent_bytes, self.layout.sample_rate, self.layout.channels,
+                           self.sample_rate, max(0.0, duration - self.sent_bytes / 2 / self.sample_rate))
@@ -0,0 +1,170 @@
+import wave
+from typing import BinaryIO, Iterable, Iterator, Union
+import numpy as np
+import speech_recognition as sr
+
+
+class AudioSegment:
+    """
+    A contiguous piece of a recording, as 16-bit mono PCM.
+
+    Attributes:
+        index (int): The position of the segment in the recording.
+        start (float): The start time of the segment in seconds.
+        end (float): The end time of the segment in seconds.
+        frame_data (bytes): The 16-bit mono PCM samples.
+        sample_rate (int): The sample rate in Hz.
+    """
+
+    def __init__(self, index: int, start: float, end: float, frame_data: bytes, sample_rate: int):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+
+    def to_audio_data(self) -> sr.AudioData:
+        """
+        Returns:
+            sr.AudioData: The segment in the form expected by speech_recognition.
+        """
+        return sr.AudioData(self.frame_data, self.sample_rate, 2)
+
+
+def pcm_to_mono_int16(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """
+    Convert interleaved PCM bytes of any common sample width to 16-bit mono samples.
+
+    Args:
+        data (bytes): The interleaved PCM frames.
+        sample_width (int): The bytes per sample (1, 2, 3 or 4).
+        channels (int): The number of interleaved channels.
+
+    Returns:
+        np.ndarray: The int16 mono samples.
+    """
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.int32) - 128) << 8
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype='<i2').astype(np.int32)
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = (raw[:, 0] << 8 | raw[:, 1] << 16 | raw[:, 2] << 24) >> 16
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype='<i4') >> 16
+    else:
+        raise ValueError("Unsupported sample width: {}".format(sample_width))
+
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.int16)
+
+
+def segment_samples(chunks: Iterable[np.ndarray], sample_rate: int, frame_ms: int = 30, silence_dbfs: float = -40.0,
+                    min_silence_ms: int = 400, max_segment_s: float = 30.0,
+                    keep_silent: bool = False) -> Iterator[AudioSegment]:
+    """
+    Split a stream of 16-bit mono samples into segments at pauses or at a maximum length.
+
+    The chunks may have any length; they are cut into frames of frame_ms for silence detection, and only
+    one segment is held in memory at a time. A segment is closed once min_silence_ms of audio below
+    silence_dbfs follows speech, or when it reaches max_segment_s. Segments without any speech are dropped,
+    unless keep_silent is set, in which case the segments cover the whole recording.
+
+    Args:
+        chunks (Iterable[np.ndarray]): The int16 mono samples, in order.
+        sample_rate (int): The sample rate in Hz.
+        frame_ms (int, optional): The analysis frame length in milliseconds. Default is 30.
+        silence_dbfs (float, optional): Frames quieter than this RMS level count as silence. Default is -40.0.
+        min_silence_ms (int, optional): The pause length that closes a segment. Default is 400.
+        max_segment_s (float, optional): The maximum segment length in seconds. Default is 30.0.
+        keep_silent (bool, optional): Also yield the segments without speech. Default is False.
+
+    Yields:
+        AudioSegment: The segments, in recording order.
+    """
+    frames_per_chunk = max(1, sample_rate * frame_ms // 1000)
+    silence_rms = 32768.0 * 10 ** (silence_dbfs / 20)
+    max_silent_chunks = max(1, min_silence_ms // frame_ms)
+    max_segment_samples = int(max_segment_s * sample_rate)
+
+    def frames() -> Iterator[np.ndarray]:
+        carry = np.empty(0, dtype=np.int16)
+        for chunk in chunks:
+            if len(carry):
+                chunk = np.concatenate((carry, chunk))
+            usable = len(chunk) - len(chunk) % frames_per_chunk
+            for start in range(0, usable, frames_per_chunk):
+                yield chunk[start:start + frames_per_chunk]
+            carry = chunk[usable:]
+        if len(carry):
+            yield carry
+
+    index = 0
+    position = 0
+    segment_start = 0
+    buffer = []
+    buffered = 0
+    voiced = False
+    silent_run = 0
+
+    stream = frames()
+    while True:
+        samples = next(stream, None)
+        if samples is not None:
+            rms = np.sqrt(np.mean(samples.astype(np.float64) ** 2))
+            if rms >= silence_rms:
+                voiced = True
+                silent_run = 0
+            else:
+                silent_run += 1
+            buffer.append(samples)
+            buffered += len(samples)
+            position += len(samples)
+
+        finished = samples is None
+        if finished or (voiced and silent_run >= max_silent_chunks) or buffered >= max_segment_samples:
+            if voiced or (keep_silent and buffer):
+                yield AudioSegment(index, segment_start / sample_rate, position / sample_rate,
+                                   np.concatenate(buffer).tobytes(), sample_rate)
+                index += 1
+            segment_start = position
+            buffer = []
+            buffered = 0
+            voiced = False
+            silent_run = 0
+        if finished:
+            break
+
+
+def iter_wav_segments(source: Union[str, BinaryIO], frame_ms: int = 30, silence_dbfs: float = -40.0,
+                      min_silence_ms: int = 400, max_segment_s: float = 30.0) -> Iterator[AudioSegment]:
+    """
+    Read a WAV file frame by frame and yield segments split at pauses or at a maximum length.
+
+    Only one segment is held in memory at a time (see segment_samples).
+
+    Args:
+        source (Union[str, BinaryIO]): Path or file object of a PCM WAV file.
+        frame_ms (int, optional): The analysis frame length in milliseconds. Default is 30.
+        silence_dbfs (float, optional): Frames quieter than this RMS level count as silence. Default is -40.0.
+        min_silence_ms (int, optional): The pause length that closes a segment. Default is 400.
+        max_segment_s (float, optional): The maximum segment length in seconds. Default is 30.0.
+
+    Yields:
+        AudioSegment: The segments, in recording order.
+    """
+    with wave.open(source, 'rb') as wav:
+        sample_rate = wav.getframerate()
+        sample_width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        frames_per_chunk = max(1, sample_rate * frame_ms // 1000)
+
+        def chunks() -> Iterator[np.ndarray]:
+            while True:
+                data = wav.readframes(frames_per_chunk)
+                if not data:
+                    return
+                yield pcm_to_mono_int16(data, sample_width, channels)
+
+        yield from segment_samples(chunks(), sample_rate, frame_ms, silence_dbfs, min_silence_ms, max_segment_s)
@@ -0,0 +1,264 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+def content_hash(*parts) -> str:
+    """
+    Build a stable content-addressed key from the given parts.
+
+    Each part is length-prefixed before hashing, so ("ab", "c") and ("a", "bc") give different keys.
+
+    Args:
+        *parts: Strings, bytes or any values with a stable str() representation.
+
+    Returns:
+        str: The hex SHA-256 digest of the parts.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def default_sizeof(value: Any) -> int:
+    """
+    Estimate the size of a cached value in bytes.
+
+    Args:
+        value (Any): The cached value.
+
+    Returns:
+        int: The length of str/bytes values, sys.getsizeof otherwise.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return sys.getsizeof(value)
+
+
+class CacheStats:
+    """
+    Hit, miss and eviction counters of a cache tier.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            dict: The counters as a plain dictionary.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache bounded by entry count and, optionally, total size in bytes.
+
+    Attributes:
+        max_entries (int): The maximum number of entries kept.
+        max_bytes (Optional[int]): The maximum total size of the entries, or None for no size budget.
+        stats (CacheStats): Hit, miss and eviction counters.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = default_sizeof):
+        """
+        Initialize the LRUCache instance.
+
+        Args:
+            max_entries (int, optional): The maximum number of entries kept. Default is 256.
+            max_bytes (Optional[int], optional): The maximum total size of the entries. Default is None.
+            sizeof (Callable[[Any], int], optional): Function returning the size of a value in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        int: The total size of the cached values.
+        """
+        return self._total_bytes
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for a key and mark it as recently used.
+
+        Args:
+            key: The cache key.
+            default: The value returned on a miss. Default is None.
+
+        Returns:
+            The cached value, or default if the key is not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value) -> None:
+        """
+        Store a value, evicting the least recently used entries when a budget is exceeded.
+
+        Values larger than the whole byte budget are not cached.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._total_bytes > self.max_bytes):
+                old_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+
+class DiskCache:
+    """
+    Thread-safe on-disk cache of byte values bounded by total size, evicting least recently used files.
+
+    Each entry is stored in its own file named after the key, so the key must be filesystem safe
+    (for example the output of content_hash).
+
+    Attributes:
+        directory (Path): The directory holding the cache files.
+        max_bytes (int): The maximum total size of the cache files.
+        stats (CacheStats): Hit, miss and eviction counters.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the DiskCache instance.
+
+        Args:
+            directory (str): The directory holding the cache files. Created if missing.
+            max_bytes (int, optional): The maximum total size of the cache files. Default is 256 MiB.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._total_bytes = sum(path.stat().st_size for path in self._files())
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        int: The total size of the cache files.
+        """
+        return self._total_bytes
+
+    def _files(self) -> list[Path]:
+        return [path for path in self.directory.glob("*/*") if path.is_file()]
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached bytes for a key and mark the entry as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[bytes]: The cached bytes, or None if the key is not cached.
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store bytes for a key, evicting the least recently used files when the size budget is exceeded.
+
+        Args:
+            key (str): The cache key.
+            data (bytes): The bytes to store.
+        """
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, path)
+            self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.stats.evictions += 1
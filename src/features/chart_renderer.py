@@ -0,0 +1,76 @@
+import threading
+from io import BytesIO
+from typing import Callable
+from matplotlib import style
+from matplotlib.figure import Figure
+from features.cache import LRUCache, content_hash
+
+# Rendered PNG images keyed by (chart kind, data, theme, size).
+_PNG_CACHE = LRUCache(max_entries=128, max_bytes=16 * 1024 * 1024)
+
+# Style contexts temporarily change matplotlib's process-wide rcParams, so renders are serialized.
+_RENDER_LOCK = threading.Lock()
+
+BACKGROUND_COLOR = '#0E1117'
+
+
+def available_themes() -> list[str]:
+    """
+    Returns:
+        list[str]: The names of the matplotlib styles a chart can be rendered with.
+    """
+    return style.available
+
+
+def render_png(key: str, theme: str, draw: Callable[[Figure], None], figsize: tuple = (6, 6), dpi: int = 100) -> bytes:
+    """
+    Render a chart to PNG bytes, or return the cached image of an identical chart.
+
+    The chart is drawn on a standalone Figure, not a pyplot figure, so nothing is registered globally and
+    the figure is freed as soon as the image is saved. The theme is applied with a style context that is
+    undone when the render ends, under a lock shared by every render.
+
+    Args:
+        key (str): Identifies the data of the chart; equal keys must draw equal charts.
+        theme (str): The matplotlib style, one of available_themes().
+        draw (Callable[[Figure], None]): Draws the chart on the given figure.
+        figsize (tuple, optional): The figure size in inches. Default is (6, 6).
+        dpi (int, optional): The resolution in dots per inch. Default is 100.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    cache_key = content_hash(key, theme, figsize, dpi)
+    png = _PNG_CACHE.get(cache_key)
+    if png is None:
+        with _RENDER_LOCK, style.context(theme):
+            fig = Figure(figsize=figsize, dpi=dpi)
+            draw(fig)
+            buffer = BytesIO()
+            fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+        png = buffer.getvalue()
+        _PNG_CACHE.put(cache_key, png)
+    return png
+
+
+def render_pie_chart(labels: list[str], sizes: list[int], theme: str = "default") -> bytes:
+    """
+    Render a pie chart on the app background color.
+
+    Args:
+        labels (list[str]): The labels of the slices.
+        sizes (list[int]): The size of each slice.
+        theme (str, optional): The matplotlib style. Default is 'default'.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    def draw(fig: Figure) -> None:
+        fig.set_facecolor(BACKGROUND_COLOR)
+        ax = fig.add_subplot()
+        ax.pie(sizes, labels=labels, wedgeprops={'linewidth': 1.0, 'edgecolor': 'white'}, startangle=90,
+               textprops={'color': BACKGROUND_COLOR})
+        ax.legend(fontsize="12", loc="upper right")
+        fig.tight_layout()
+
+    return render_png(content_hash("pie", labels, sizes), theme, draw)
@@ -0,0 +1,232 @@
+import threading
+from array import array
+from typing import Optional, Union
+import numpy as np
+from scipy import sparse
+from features.pos_tagger import UNKNOWN_INDEX
+from features.sentiment_analysis import SENTIMENT_KEYS, SentimentAnalysis
+from features.text_analyzer import TextAnalyzer
+from features.text_document import TextDocument
+from features.word_processor import WordProcessor
+
+
+class Corpus:
+    """
+    A collection of analyzed documents with an inverted index for corpus-wide queries.
+
+    Every added document goes through the feature classes once (WordProcessor word counts, POS count array,
+    SentimentAnalysis scores); only the results are kept. Word counts form a sparse document-by-term
+    matrix, whose compressed-column form is the inverted index: the column of a term lists the documents
+    containing it with their counts. Sentiment scores and POS counts are stored as dense per-document rows.
+
+    Both matrix forms are built on first query after a change and reused until the next document is added,
+    so queries cost O(postings) or one vectorized pass over the terms, which stays interactive at tens of
+    thousands of documents.
+
+    Attributes:
+        names (list[str]): The document names, in insertion order.
+        texts (list[str]): The analyzed text of each document.
+        vocabulary (dict): Term -> column index.
+        terms (list[str]): Column index -> term.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty Corpus.
+        """
+        self.names = []
+        self.texts = []
+        self.vocabulary = {}
+        self.terms = []
+        self._index = {}
+        # The (document, term, count) triples of the matrix, in compact typed arrays.
+        self._rows = array('q')
+        self._cols = array('q')
+        self._counts = array('q')
+        self._sentiments = []
+        self._pos_counts = []
+        self._csr = None
+        self._csc = None
+        self._idf = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def add_document(self, name: str, text: Union[str, TextDocument]) -> int:
+        """
+        Analyze a document and add it to the corpus.
+
+        Args:
+            name (str): The unique name of the document, e.g. its file name.
+            text (Union[str, TextDocument]): The text of the document or its analyzed document.
+
+        Returns:
+            int: The index of the document.
+
+        Raises:
+            ValueError: If a document with the same name was already added.
+        """
+        document = TextDocument.from_input(text)
+        word_counts = WordProcessor(document).process_input_text_blob()
+        pos_counts = document.pos_count_array
+        score = SentimentAnalysis(document).score
+
+        with self._lock:
+            if name in self._index:
+                raise ValueError("Document already in the corpus: {}".format(name))
+            doc_id = len(self.names)
+            for term, count in word_counts.items():
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    term_id = self.vocabulary[term] = len(self.terms)
+                    self.terms.append(term)
+                self._rows.append(doc_id)
+                self._cols.append(term_id)
+                self._counts.append(count)
+            self._index[name] = doc_id
+            self.names.append(name)
+            self.texts.append(document.text)
+            self._sentiments.append([score[key] for key in SENTIMENT_KEYS])
+            self._pos_counts.append(pos_counts)
+            self._csr = self._csc = self._idf = None
+        return doc_id
+
+    def document_id(self, name: str) -> int:
+        """
+        Get the index of a document.
+
+        Args:
+            name (str): The document name.
+
+        Returns:
+            int: The index of the document.
+
+        Raises:
+            KeyError: If there is no document with that name.
+        """
+        return self._index[name]
+
+    @property
+    def matrix(self) -> sparse.csr_matrix:
+        """
+        sparse.csr_matrix: Document-by-term counts, one row per document.
+        """
+        with self._lock:
+            if self._csr is None:
+                triples = (np.frombuffer(self._counts, dtype=np.int64),
+                           (np.frombuffer(self._rows, dtype=np.int64), np.frombuffer(self._cols, dtype=np.int64)))
+                self._csr = sparse.csr_matrix(triples, shape=(len(self.names), len(self.terms)))
+            return self._csr
+
+    @property
+    def inverted_index(self) -> sparse.csc_matrix:
+        """
+        sparse.csc_matrix: The same counts by term column, i.e. the postings of every term.
+        """
+        matrix = self.matrix
+        with self._lock:
+            if self._csc is None:
+                self._csc = matrix.tocsc()
+            return self._csc
+
+    def document_frequency(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: The number of documents containing each term.
+        """
+        return np.diff(self.inverted_index.indptr)
+
+    def top_terms(self, n: int = 20, by_documents: bool = False) -> list[tuple[str, int, int]]:
+        """
+        Get the most frequent terms of the corpus.
+
+        Args:
+            n (int, optional): The number of terms. Default is 20.
+            by_documents (bool, optional): Rank by the number of documents containing the term instead of
+                the total number of occurrences. Default is False.
+
+        Returns:
+            list[tuple[str, int, int]]: (term, occurrences, documents) triples, most frequent first.
+        """
+        if not self.terms:
+            return []
+        totals = np.asarray(self.inverted_index.sum(axis=0)).ravel()
+        frequencies = self.document_frequency()
+        keys = frequencies if by_documents else totals
+        n = min(n, len(keys))
+        top = np.argpartition(-keys, n - 1)[:n]
+        top = top[np.argsort(-keys[top], kind="stable")]
+        return [(self.terms[i], int(totals[i]), int(frequencies[i])) for i in top]
+
+    def documents_containing(self, term: str) -> list[tuple[str, int]]:
+        """
+        Find the documents containing a term.
+
+        Args:
+            term (str): The term, matched case-insensitively.
+
+        Returns:
+            list[tuple[str, int]]: (document name, occurrences) pairs, most occurrences first.
+        """
+        term_id = self.vocabulary.get(term.lower())
+        if term_id is None:
+            return []
+        index = self.inverted_index
+        start, end = index.indptr[term_id], index.indptr[term_id + 1]
+        doc_ids, counts = index.indices[start:end], index.data[start:end]
+        order = np.argsort(-counts, kind="stable")
+        return [(self.names[doc_ids[i]], int(counts[i])) for i in order]
+
+    def sentiment_scores(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: The VADER scores of every document, one row per document and columns in SENTIMENT_KEYS order.
+        """
+        return np.array(self._sentiments, dtype=np.float64).reshape(len(self.names), len(SENTIMENT_KEYS))
+
+    def sentiment(self, name: str) -> dict:
+        """
+        Get the sentiment scores of a document.
+
+        Args:
+            name (str): The document name.
+
+        Returns:
+            dict: The VADER scores ('neg', 'neu', 'pos', 'compound').
+        """
+        return dict(zip(SENTIMENT_KEYS, self._sentiments[self.document_id(name)]))
+
+    def pos_counts(self, name: Optional[str] = None) -> dict:
+        """
+        Get the part-of-speech counts of a document or of the whole corpus.
+
+        Args:
+            name (Optional[str], optional): The document name. Default is the whole corpus.
+
+        Returns:
+            dict: Full part-of-speech name -> number of occurrences.
+        """
+        if name is None:
+            counts = np.sum(self._pos_counts, axis=0) if self._pos_counts else np.zeros(UNKNOWN_INDEX + 1)
+        else:
+            counts = self._pos_counts[self.document_id(name)]
+        return TextAnalyzer.name_pos_counts(counts)
+
+    def idf(self) -> dict:
+        """
+        Compute the smoothed inverse document frequency of every term, documents being the corpus documents.
+
+        The result can be passed to TextSummarizer(idf=...) to weigh the words of one document by how
+        specific they are to it within the corpus.
+
+        Returns:
+            dict: Term -> IDF weight.
+        """
+        if self._idf is None:
+            weights = np.log((1 + len(self.names)) / (1 + self.document_frequency())) + 1
+            self._idf = dict(zip(self.terms, weights.tolist()))
+        return self._idf
@@ -0,0 +1,177 @@
+from collections import Counter
+from typing import Optional
+from features.cache import LRUCache, content_hash
+from features.sentiment_analysis import SENTIMENT_KEYS, get_sentiment_analyzer
+from features.text_chunker import split_sentences
+from features.text_document import TextDocument
+from features.translation_cache import CachedTranslator
+
+
+class SentenceAnalysis:
+    """
+    Analysis results of a single source sentence.
+
+    Attributes:
+        translation (str): The translated sentence.
+        tags (list[tuple[str, str]]): (word, POS tag) pairs of the translated sentence.
+        word_counts (Counter): Lowercased word -> occurrences in the translated sentence.
+        pos_counts (Counter): POS tag -> occurrences in the translated sentence.
+        scores (dict): VADER polarity scores of the translated sentence.
+    """
+
+    def __init__(self, translation: str, tags: list, word_counts: Counter, scores: dict):
+        self.translation = translation
+        self.tags = tags
+        self.word_counts = word_counts
+        self.pos_counts = Counter(tag for _, tag in tags)
+        self.scores = scores
+
+
+class IncrementalAnalyzer:
+    """
+    Keeps per-sentence analyses of an edited text and recomputes only new or changed sentences.
+
+    On every update the text is split into sentences, each identified by a hash of its content. Sentences
+    seen before (anywhere in the text, or earlier in the session) reuse their translation, POS tags, word
+    counts and VADER scores, and the document-level aggregates are updated by adding the sentences that
+    appeared and subtracting the ones that disappeared, so an edit costs time proportional to its size.
+
+    Sentences are translated independently of each other, and the document sentiment is the mean of the
+    sentence scores rather than VADER run on the whole text.
+
+    Attributes:
+        translator (CachedTranslator): The translator used for new sentences.
+        max_workers (int): The maximum number of concurrent translation requests.
+        sentences (list[str]): The source sentences of the current text, with their trailing whitespace.
+        word_counts (Counter): Lowercased word -> occurrences in the current translated text.
+        pos_counts (Counter): POS tag -> occurrences in the current translated text.
+    """
+
+    def __init__(self, translator: CachedTranslator, max_sentences: int = 4096, max_workers: int = 4):
+        """
+        Initialize the IncrementalAnalyzer instance.
+
+        Args:
+            translator (CachedTranslator): The translator used for new sentences.
+            max_sentences (int, optional): The number of sentence analyses kept for reuse. Default is 4096.
+            max_workers (int, optional): The maximum number of concurrent translation requests. Default is 4.
+        """
+        self.translator = translator
+        self.max_workers = max_workers
+        self.sentences = []
+        self.word_counts = Counter()
+        self.pos_counts = Counter()
+        self._analyses = LRUCache(max_entries=max_sentences)
+        self._current = {}
+        self._keys = []
+        self._score_sums = dict.fromkeys(SENTIMENT_KEYS, 0.0)
+
+    @staticmethod
+    def _key(sentence: str) -> str:
+        return content_hash("sentence", sentence.strip())
+
+    @staticmethod
+    def _analyze(translation: str) -> SentenceAnalysis:
+        document = TextDocument(translation)
+        return SentenceAnalysis(translation, document.tags, Counter(document.word_counts),
+                                get_sentiment_analyzer().polarity_scores(translation))
+
+    def _apply(self, analysis: SentenceAnalysis, sign: int) -> None:
+        for word, count in analysis.word_counts.items():
+            self.word_counts[word] += sign * count
+        for tag, count in analysis.pos_counts.items():
+            self.pos_counts[tag] += sign * count
+        for name in SENTIMENT_KEYS:
+            self._score_sums[name] += sign * analysis.scores[name]
+
+    def update(self, text: str) -> dict:
+        """
+        Bring the analysis up to date with an edited text.
+
+        Args:
+            text (str): The full current text.
+
+        Returns:
+            dict: The number of sentences 'added', 'removed' and 'reused' by this update.
+        """
+        sentences = [sentence for sentence in split_sentences(text) if sentence.strip()]
+        keys = [self._key(sentence) for sentence in sentences]
+        old_counts = Counter(self._keys)
+        new_counts = Counter(keys)
+        added = new_counts - old_counts
+        removed = old_counts - new_counts
+
+        found = {}
+        missing = {}
+        for sentence, key in zip(sentences, keys):
+            if key not in added or key in found or key in missing:
+                continue
+            analysis = self._current.get(key) or self._analyses.get(key)
+            if analysis is None:
+                missing[key] = sentence.strip()
+            else:
+                found[key] = analysis
+        # The new sentences are translated as one batch, concurrently, instead of one request after another.
+        translations = self.translator.translate_many(list(missing.values()), self.max_workers)
+        for key, translation in zip(missing, translations):
+            found[key] = self._analyze(translation)
+            self._analyses.put(key, found[key])
+
+        # Nothing is changed before the translation succeeds, so a failed update leaves the previous state intact.
+        for key, count in removed.items():
+            analysis = self._current[key]
+            for _ in range(count):
+                self._apply(analysis, -1)
+            if key not in new_counts:
+                del self._current[key]
+
+        for key, analysis in found.items():
+            self._current[key] = analysis
+            for _ in range(added[key]):
+                self._apply(analysis, +1)
+
+        self.word_counts = +self.word_counts
+        self.pos_counts = +self.pos_counts
+        self.sentences = sentences
+        self._keys = keys
+        return {"added": len(missing), "removed": sum(removed.values()), "reused": len(keys) - len(missing)}
+
+    @property
+    def translation(self) -> str:
+        """
+        str: The translated text, with the original whitespace between sentences.
+        """
+        parts = []
+        for sentence, key in zip(self.sentences, self._keys):
+            trailing = sentence[len(sentence.rstrip()):]
+            parts.append(self._current[key].translation + trailing)
+        return "".join(parts).strip()
+
+    @property
+    def sentiment_score(self) -> dict:
+        """
+        dict: The mean VADER scores ('neg', 'neu', 'pos', 'compound') of the sentences.
+        """
+        count = len(self._keys)
+        if not count:
+            return dict.fromkeys(SENTIMENT_KEYS, 0.0)
+        return {name: round(total / count, 3) for name, total in self._score_sums.items()}
+
+    def to_document(self, text: Optional[str] = None) -> TextDocument:
+        """
+        Build a TextDocument of the translated text from the per-sentence analyses, without re-tagging it.
+
+        Args:
+            text (Optional[str], optional): The translated text, if already built. Default is self.translation.
+
+        Returns:
+            TextDocument: The analyzed document.
+        """
+        tags = [pair for key in self._keys for pair in self._current[key].tags]
+        return TextDocument.from_precomputed(
+            text if text is not None else self.translation,
+            sentences=[self._current[key].translation for key in self._keys],
+            tags=tags,
+            word_counts=dict(self.word_counts),
+            pos_counts=Counter(self.pos_counts),
+        )
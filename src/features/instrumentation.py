@@ -0,0 +1,208 @@
+import bisect
+import contextvars
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Timings of the current Streamlit rerun (or any other unit of work started with start_run).
+_current_run = contextvars.ContextVar("sonic_stage_timings", default=None)
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with fixed bucket upper bounds, in the Prometheus style.
+
+    Attributes:
+        buckets (tuple[float, ...]): The bucket upper bounds in seconds.
+        counts (list[int]): The number of observations per bucket (not cumulative); the last one is +Inf.
+        total (float): The sum of all observations.
+        count (int): The number of observations.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            seconds (float): The observed duration.
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile in seconds (inf if it falls in the last bucket, 0 if empty).
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of per-stage latency histograms and of named gauges (e.g. queue depths).
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Initialize the MetricsRegistry instance.
+
+        Args:
+            buckets (tuple, optional): The histogram bucket upper bounds in seconds.
+        """
+        self.buckets = buckets
+        self._histograms = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """
+        Record the duration of a stage.
+
+        Args:
+            stage (str): The stage name.
+            seconds (float): The duration in seconds.
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Set the current value of a gauge.
+
+        Args:
+            name (str): The gauge name, e.g. 'recognition_queue_depth'.
+            value (float): The current value.
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def gauges(self) -> dict:
+        """
+        Returns:
+            dict: Gauge name -> current value.
+        """
+        with self._lock:
+            return dict(self._gauges)
+
+    def summary(self) -> list[dict]:
+        """
+        Summarize every stage.
+
+        Returns:
+            list[dict]: Per-stage count, mean, estimated p50/p95 and total seconds, sorted by stage.
+        """
+        with self._lock:
+            return [{"stage": stage, "count": histogram.count,
+                     "mean_s": histogram.total / histogram.count if histogram.count else 0.0,
+                     "p50_s": histogram.quantile(0.5), "p95_s": histogram.quantile(0.95),
+                     "total_s": histogram.total}
+                    for stage, histogram in sorted(self._histograms.items())]
+
+    def to_prometheus(self, name: str = "sonic_stage_duration_seconds") -> str:
+        """
+        Render the histograms in the Prometheus text exposition format.
+
+        Gauges are rendered as their own metrics, named 'sonic_' followed by the gauge name.
+
+        Args:
+            name (str, optional): The metric name of the histograms. Default is 'sonic_stage_duration_seconds'.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = ["# HELP {} Duration of each processing stage.".format(name), "# TYPE {} histogram".format(name)]
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                label = re.sub(r'(["\\])', r'\\\1', stage)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    bound_text = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append('{}_bucket{{stage="{}",le="{}"}} {}'.format(name, label, bound_text, cumulative))
+                lines.append('{}_sum{{stage="{}"}} {}'.format(name, label, repr(histogram.total)))
+                lines.append('{}_count{{stage="{}"}} {}'.format(name, label, histogram.count))
+            for gauge, value in sorted(self._gauges.items()):
+                gauge_name = "sonic_" + re.sub(r"[^a-zA-Z0-9_]", "_", gauge)
+                lines.append("# TYPE {} gauge".format(gauge_name))
+                lines.append("{} {}".format(gauge_name, repr(value)))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Atomically write the Prometheus exposition text to a file, e.g. for a node exporter textfile collector.
+
+        Args:
+            path (str): The file to write.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp:
+            tmp.write(self.to_prometheus())
+        os.replace(tmp_name, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def start_run() -> list:
+    """
+    Start collecting the stage timings of a new unit of work (e.g. a Streamlit rerun) in the current context.
+
+    Returns:
+        list: The list that receives (stage, seconds) pairs for this run.
+    """
+    timings = []
+    _current_run.set(timings)
+    return timings
+
+
+@contextmanager
+def timed(stage: str, registry: Optional[MetricsRegistry] = None) -> Iterator[None]:
+    """
+    Time a block of code as a stage.
+
+    The duration is added to the registry histogram and, if a run was started in the current context,
+    appended to that run's timings.
+
+    Args:
+        stage (str): The stage name.
+        registry (Optional[MetricsRegistry], optional): The registry to record into. Default is REGISTRY.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        (registry or REGISTRY).observe(stage, elapsed)
+        timings = _current_run.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
@@ -0,0 +1,280 @@
+import asyncio
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+from features.cache import content_hash
+
+# Concurrent calls allowed per stage; stages not listed get DEFAULT_LIMIT.
+DEFAULT_LIMITS = {"translation": 8, "translation.document": 4, "synthesis": 4}
+DEFAULT_LIMIT = 4
+
+# Stages whose calls are made of calls to other stages (a chunked document of 'translation' requests). Each
+# inner request has its own timeout and retries, so the outer call gets neither: a slow long document is not
+# cut off after one attempt's time, and a failed chunk is retried alone instead of re-sending the document.
+COMPOSITE_STAGES = frozenset({"translation.document"})
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Tell whether a failed request is worth retrying.
+
+    Errors carrying an HTTP response (requests.HTTPError, gTTSError) are transient only for 5xx statuses;
+    4xx statuses, including 429, fail at once. Invalid requests (errors that are also ValueErrors, e.g.
+    requests.InvalidURL) never are. Other errors, e.g. connection errors and timeouts, are.
+
+    Args:
+        error (BaseException): The exception raised by the request.
+
+    Returns:
+        bool: True if the request may succeed when sent again.
+    """
+    if isinstance(error, ValueError):
+        return False
+    response = getattr(error, "response", None)
+    if response is None:
+        response = getattr(error, "rsp", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500
+    return True
+
+
+class NetworkService:
+    """
+    Runs the network-bound calls of every session from one asyncio event loop on a background thread.
+
+    Callers submit a blocking call (a translation or synthesis request) and get a
+    concurrent.futures.Future back immediately. The loop then applies, per stage:
+
+    - a concurrency limit, with a dedicated thread pool of the same size, so one stage cannot starve
+      another and a stage waiting on a different one cannot deadlock;
+    - a timeout per attempt;
+    - retries with exponential backoff and jitter on transient errors (see is_transient);
+    - coalescing: while a call with the same stage and key is in flight, identical calls wait for its
+      result instead of being sent again.
+
+    Stages in COMPOSITE_STAGES get no timeout and no retries of their own. The HTTP clients used underneath
+    are blocking, so each call still occupies a worker thread; a call
+    that times out is abandoned but its thread finishes the request in the background.
+
+    Attributes:
+        limits (dict): Stage -> number of concurrent calls.
+        timeout (float): Seconds allowed per attempt.
+        retries (int): The number of retries after a failed attempt.
+        backoff (float): The delay before the first retry in seconds; doubled on every retry.
+        composite (frozenset): The stages without a timeout and retries of their own.
+    """
+
+    def __init__(self, limits: Optional[dict] = None, timeout: float = 30.0, retries: int = 2,
+                 backoff: float = 0.5, composite: frozenset = COMPOSITE_STAGES):
+        """
+        Initialize the NetworkService instance and start its event loop.
+
+        Args:
+            limits (Optional[dict], optional): Stage -> number of concurrent calls. Default is DEFAULT_LIMITS.
+            timeout (float, optional): Seconds allowed per attempt. Default is 30.0.
+            retries (int, optional): The number of retries after a failed attempt. Default is 2.
+            backoff (float, optional): The delay before the first retry in seconds. Default is 0.5.
+            composite (frozenset, optional): The stages without a timeout and retries of their own.
+                Default is COMPOSITE_STAGES.
+        """
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.composite = frozenset(composite)
+        self._stats = {}
+        self._semaphores = {}
+        self._executors = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="sonic-network", daemon=True)
+        self._thread.start()
+
+    def _executor(self, stage: str) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(stage)
+            if executor is None:
+                executor = self._executors[stage] = ThreadPoolExecutor(
+                    max_workers=self.limits.get(stage, DEFAULT_LIMIT), thread_name_prefix="sonic-" + stage)
+            return executor
+
+    def _count(self, stage: str, name: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(stage, dict.fromkeys(
+                ("calls", "coalesced", "retries", "timeouts", "failures"), 0))
+            stats[name] += 1
+
+    def submit(self, stage: str, key: Optional[Hashable], fn: Callable, *args,
+               retry_on: tuple = (OSError,)) -> Future:
+        """
+        Schedule a blocking call without waiting for it.
+
+        Args:
+            stage (str): The stage the call belongs to, e.g. 'translation'.
+            key (Optional[Hashable]): Identifies the request for coalescing; None never coalesces.
+            fn (Callable): The blocking function to call.
+            *args: The arguments of the call.
+            retry_on (tuple, optional): The exception types worth retrying, when is_transient agrees;
+                timeouts always are. Default is (OSError,), which includes connection errors and requests' errors.
+
+        Returns:
+            Future: The future receiving the result or the final exception.
+        """
+        return asyncio.run_coroutine_threadsafe(self._run(stage, key, fn, args, retry_on), self._loop)
+
+    def call(self, stage: str, key: Optional[Hashable], fn: Callable, *args, retry_on: tuple = (OSError,)):
+        """
+        Make a blocking call through the service and wait for its result.
+
+        Args:
+            stage (str): The stage the call belongs to.
+            key (Optional[Hashable]): Identifies the request for coalescing; None never coalesces.
+            fn (Callable): The blocking function to call.
+            *args: The arguments of the call.
+            retry_on (tuple, optional): The exception types worth retrying. Default is (OSError,).
+
+        Returns:
+            The result of the call.
+        """
+        return self.submit(stage, key, fn, *args, retry_on=retry_on).result()
+
+    async def _run(self, stage: str, key: Optional[Hashable], fn: Callable, args: tuple, retry_on: tuple):
+        self._count(stage, "calls")
+        if key is None:
+            return await self._attempt(stage, fn, args, retry_on)
+        inflight_key = (stage, key)
+        task = self._inflight.get(inflight_key)
+        if task is not None:
+            self._count(stage, "coalesced")
+        else:
+            task = self._inflight[inflight_key] = self._loop.create_task(self._attempt(stage, fn, args, retry_on))
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        # Shielded, so a caller giving up does not cancel the call other callers are waiting for.
+        return await asyncio.shield(task)
+
+    async def _attempt(self, stage: str, fn: Callable, args: tuple, retry_on: tuple):
+        semaphore = self._semaphores.get(stage)
+        if semaphore is None:
+            semaphore = self._semaphores[stage] = asyncio.Semaphore(self.limits.get(stage, DEFAULT_LIMIT))
+        executor = self._executor(stage)
+        composite = stage in self.composite
+        timeout = None if composite else self.timeout
+        retries = 0 if composite else self.retries
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    return await asyncio.wait_for(self._loop.run_in_executor(executor, fn, *args), timeout)
+            except asyncio.TimeoutError:
+                self._count(stage, "timeouts")
+                if attempt == retries:
+                    self._count(stage, "failures")
+                    raise
+            except Exception as error:
+                if attempt == retries or not isinstance(error, retry_on) or not is_transient(error):
+                    self._count(stage, "failures")
+                    raise
+            self._count(stage, "retries")
+            await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def stats(self) -> dict:
+        """
+        Get the call counters of every stage.
+
+        Returns:
+            dict: Stage -> counts of calls, coalesced calls, retries, timeouts and failures.
+        """
+        with self._lock:
+            return {stage: dict(stats) for stage, stats in self._stats.items()}
+
+    def close(self) -> None:
+        """
+        Stop the event loop and the worker threads.
+        """
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        with self._lock:
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
+            self._executors.clear()
+
+
+class ServiceTranslatorBackend:
+    """
+    Translation backend sending the requests of another backend through a NetworkService.
+
+    Attributes:
+        service (NetworkService): The service making the calls.
+        backend: The translation backend doing the actual requests.
+        max_chars (int): The longest text accepted in a single request, as for the wrapped backend.
+    """
+
+    def __init__(self, service: NetworkService, backend):
+        """
+        Initialize the backend.
+
+        Args:
+            service (NetworkService): The service making the calls.
+            backend: The translation backend doing the actual requests.
+        """
+        self.service = service
+        self.backend = backend
+        self.max_chars = backend.max_chars
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        """
+        Translate text through the service.
+
+        Args:
+            text (str): The text to translate.
+            source (str): The source language code, or 'auto'.
+            target (str): The target language code.
+
+        Returns:
+            str: The translated text.
+        """
+        key = content_hash(source, target, text)
+        return self.service.call("translation", key, self.backend.translate, text, source, target)
+
+
+class ServiceSpeechBackend:
+    """
+    Synthesis backend sending the requests of another backend through a NetworkService.
+
+    Attributes:
+        service (NetworkService): The service making the calls.
+        backend: The synthesis backend doing the actual requests.
+        max_chars (int): The longest text sent in a single request, as for the wrapped backend.
+    """
+
+    def __init__(self, service: NetworkService, backend):
+        """
+        Initialize the backend.
+
+        Args:
+            service (NetworkService): The service making the calls.
+            backend: The synthesis backend doing the actual requests.
+        """
+        self.service = service
+        self.backend = backend
+        self.max_chars = backend.max_chars
+
+    def synthesize(self, text: str, lang: str, slow: bool) -> bytes:
+        """
+        Synthesize speech for a piece of text through the service.
+
+        Args:
+            text (str): The text to synthesize.
+            lang (str): Language of the speech.
+            slow (bool): Flag to control the speed of speech.
+
+        Returns:
+            bytes: The audio.
+        """
+        from gtts.tts import gTTSError
+
+        key = content_hash(lang, slow, text)
+        return self.service.call("synthesis", key, self.backend.synthesize, text, lang, slow,
+                                 retry_on=(OSError, gTTSError))
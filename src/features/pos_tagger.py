@@ -0,0 +1,152 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Optional
+import numpy as np
+from textblob.utils import PUNCTUATION_REGEX
+from features.text_analyzer import PartOfSpeechConverter
+
+# Index of each tag in the count arrays; tags outside POS_MAPPING are counted in the last slot.
+POS_TAGS = tuple(PartOfSpeechConverter.POS_MAPPING)
+_TAG_INDEX = {tag: index for index, tag in enumerate(POS_TAGS)}
+UNKNOWN_INDEX = len(POS_TAGS)
+
+
+@lru_cache(maxsize=None)
+def get_tagger():
+    """
+    Load the NLTK averaged perceptron tagger once per process.
+
+    nltk.pos_tag, which TextBlob calls for every sentence, unpickles the model again on each call.
+
+    Returns:
+        PerceptronTagger: The shared tagger.
+    """
+    from nltk.tag.perceptron import PerceptronTagger
+    return PerceptronTagger()
+
+
+def _tag_batch(token_lists: list[list[str]]) -> list[list[tuple[str, str]]]:
+    """
+    Tag a batch of tokenized sentences with the tagger of the current process.
+
+    Args:
+        token_lists (list[list[str]]): The tokens of each sentence.
+
+    Returns:
+        list[list[tuple[str, str]]]: The (token, tag) pairs of each sentence.
+    """
+    tagger = get_tagger()
+    return [tagger.tag(tokens) if tokens else [] for tokens in token_lists]
+
+
+def count_tags(tags: Iterable[str]) -> np.ndarray:
+    """
+    Count POS tags into an array indexed like POS_TAGS.
+
+    Args:
+        tags (Iterable[str]): The tags to count.
+
+    Returns:
+        np.ndarray: Counts of length len(POS_TAGS) + 1, the last entry counting tags not in POS_MAPPING.
+    """
+    indices = np.fromiter((_TAG_INDEX.get(tag, UNKNOWN_INDEX) for tag in tags), dtype=np.intp)
+    return np.bincount(indices, minlength=UNKNOWN_INDEX + 1)
+
+
+class PosTagger:
+    """
+    Batched part-of-speech tagging with an optional process pool for large documents.
+
+    Sentences are tagged in batches with a tagger loaded once per process. Documents with at least
+    min_parallel_sentences sentences are split into batches tagged in parallel by max_workers processes;
+    smaller ones are tagged in the calling process, where a pool would cost more than it saves.
+
+    Attributes:
+        max_workers (int): The number of worker processes; 0 or 1 tags everything in-process.
+        min_parallel_sentences (int): The smallest number of sentences sent to the process pool.
+    """
+
+    def __init__(self, max_workers: int = 0, min_parallel_sentences: int = 2000):
+        """
+        Initialize the PosTagger instance.
+
+        Args:
+            max_workers (int, optional): The number of worker processes. Default is 0 (no pool).
+            min_parallel_sentences (int, optional): The smallest number of sentences tagged in parallel.
+                Default is 2000.
+        """
+        self.max_workers = max_workers
+        self.min_parallel_sentences = min_parallel_sentences
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def tag_sents(self, token_lists: list[list[str]]) -> list[list[tuple[str, str]]]:
+        """
+        Tag tokenized sentences.
+
+        Args:
+            token_lists (list[list[str]]): The tokens of each sentence.
+
+        Returns:
+            list[list[tuple[str, str]]]: The (token, tag) pairs of each sentence, in order.
+        """
+        token_lists = [list(tokens) for tokens in token_lists]
+        if self.max_workers <= 1 or len(token_lists) < self.min_parallel_sentences:
+            return _tag_batch(token_lists)
+
+        # A few batches per worker evens out uneven sentence lengths.
+        batch_size = -(-len(token_lists) // (self.max_workers * 4))
+        batches = [token_lists[i:i + batch_size] for i in range(0, len(token_lists), batch_size)]
+        tagged = []
+        for batch in self._get_executor().map(_tag_batch, batches):
+            tagged.extend(batch)
+        return tagged
+
+    def tag_words(self, token_lists: list[list[str]]) -> list[tuple[str, str]]:
+        """
+        Tag tokenized sentences and drop punctuation, like TextBlob.tags.
+
+        Args:
+            token_lists (list[list[str]]): The tokens of each sentence, punctuation included.
+
+        Returns:
+            list[tuple[str, str]]: The (word, tag) pairs of the whole text.
+        """
+        return [(str(word), tag)
+                for sentence in self.tag_sents(token_lists)
+                for word, tag in sentence
+                if not PUNCTUATION_REGEX.match(tag)]
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, if any were started.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+@lru_cache(maxsize=None)
+def get_pos_tagger(max_workers: Optional[int] = None) -> PosTagger:
+    """
+    Get the process-wide POS tagger.
+
+    Args:
+        max_workers (Optional[int], optional): The number of worker processes. Default is the
+            SONIC_POS_WORKERS environment variable, or 0 (tag in-process) if unset.
+
+    Returns:
+        PosTagger: The shared tagger.
+    """
+    if max_workers is None:
+        max_workers = int(os.environ.get("SONIC_POS_WORKERS", "0"))
+    return PosTagger(max_workers=max_workers)
@@ -0,0 +1,324 @@
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional
+import speech_recognition as sr
+from features.instrumentation import REGISTRY, MetricsRegistry, timed
+
+
+class QueueFull(Exception):
+    """
+    Raised when a recognition job is submitted to a queue that is already holding max_pending jobs.
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` calls per second on average and bursts of up to `capacity` calls.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens held.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full TokenBucket.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (float): The maximum number of tokens held.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until the next token is available.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """
+        Take a token, waiting for one if the bucket is empty.
+        """
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return
+            time.sleep(delay)
+
+
+class RecognitionJob:
+    """
+    A recognition request waiting in or served by a RecognitionQueue.
+
+    Attributes:
+        job_id (int): The number of the job, in submission order.
+        audio (sr.AudioData): The audio to recognize.
+        future (Future): Receives the recognized text or the final exception.
+        submitted (float): The time.monotonic() of the submission.
+    """
+
+    def __init__(self, job_id: int, audio: sr.AudioData):
+        self.job_id = job_id
+        self.audio = audio
+        self.future = Future()
+        self.submitted = time.monotonic()
+
+
+class RecognitionQueue:
+    """
+    Process-wide FIFO queue of speech recognition requests, shared by every session.
+
+    A fixed number of worker threads serve the jobs in submission order. Before each request to the
+    backend, a worker takes a token from a token bucket, so bursts of uploads are smoothed to the rate
+    the upstream API accepts instead of tripping its limits. Requests failing with sr.RequestError are
+    retried with exponential backoff and jitter; each retry takes a new token.
+
+    When max_pending jobs are already waiting, submit raises QueueFull, so callers can ask the user to
+    come back later instead of piling up more work.
+
+    The queue depth is published as the 'recognition_queue_depth' gauge, and the time jobs spend waiting
+    and being recognized as the 'recognition.queue_wait' and 'recognition.request' stages of the registry.
+
+    Attributes:
+        backend: The recognition backend doing the actual requests.
+        workers (int): The number of worker threads, i.e. of concurrent requests.
+        bucket (TokenBucket): The rate limit of the requests.
+        retries (int): The number of retries after a RequestError.
+        backoff (float): The delay before the first retry in seconds; doubled on every retry.
+        max_pending (int): The maximum number of waiting jobs.
+    """
+
+    def __init__(self, backend, workers: int = 4, rate: float = 5.0, burst: int = 10, retries: int = 3,
+                 backoff: float = 0.5, max_pending: int = 1000, registry: Optional[MetricsRegistry] = None):
+        """
+        Initialize the RecognitionQueue instance and start its workers.
+
+        Args:
+            backend: The recognition backend, e.g. GoogleRecognizerBackend or StubRecognizerBackend.
+            workers (int, optional): The number of worker threads. Default is 4.
+            rate (float, optional): The sustained number of requests per second. Default is 5.0.
+            burst (int, optional): The number of requests allowed at once after an idle period. Default is 10.
+            retries (int, optional): The number of retries after a RequestError. Default is 3.
+            backoff (float, optional): The delay before the first retry in seconds. Default is 0.5.
+            max_pending (int, optional): The maximum number of waiting jobs. Default is 1000.
+            registry (Optional[MetricsRegistry], optional): Where metrics are recorded. Default is REGISTRY.
+        """
+        self.backend = backend
+        self.workers = workers
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_pending = max_pending
+        self.registry = registry or REGISTRY
+        self._ids = itertools.count()
+        self._waiting = deque()
+        self._served = 0
+        self._retried = 0
+        self._failed = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name="sonic-recognition-{}".format(number), daemon=True)
+                         for number in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        """
+        int: The number of jobs waiting for a worker.
+        """
+        with self._condition:
+            return len(self._waiting)
+
+    def _publish_depth(self) -> None:
+        # Called with the condition held.
+        self.registry.set_gauge("recognition_queue_depth", len(self._waiting))
+
+    def submit(self, audio: sr.AudioData) -> RecognitionJob:
+        """
+        Add a recognition request to the end of the queue.
+
+        Args:
+            audio (sr.AudioData): The audio to recognize.
+
+        Returns:
+            RecognitionJob: The job; its future receives the recognized text.
+
+        Raises:
+            QueueFull: If max_pending jobs are already waiting.
+            RuntimeError: If the queue was closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The recognition queue is closed")
+            if len(self._waiting) >= self.max_pending:
+                raise QueueFull("{} recognition requests are already waiting".format(len(self._waiting)))
+            job = RecognitionJob(next(self._ids), audio)
+            self._waiting.append(job)
+            self._publish_depth()
+            self._condition.notify()
+        return job
+
+    def position(self, job: RecognitionJob) -> int:
+        """
+        Get the place of a job in the queue.
+
+        Args:
+            job (RecognitionJob): A submitted job.
+
+        Returns:
+            int: 1 for the next job to be served, 0 once a worker has taken the job.
+        """
+        with self._condition:
+            for index, waiting in enumerate(self._waiting):
+                if waiting is job:
+                    return index + 1
+            return 0
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._waiting and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                job = self._waiting.popleft()
+                self._publish_depth()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            self.registry.observe("recognition.queue_wait", time.monotonic() - job.submitted)
+            try:
+                job.future.set_result(self._recognize(job.audio))
+            except Exception as error:
+                job.future.set_exception(error)
+
+    def _recognize(self, audio: sr.AudioData) -> str:
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                with timed("recognition.request", self.registry):
+                    text = self.backend.recognize(audio)
+            except sr.RequestError:
+                if attempt == self.retries:
+                    with self._condition:
+                        self._failed += 1
+                    raise
+            else:
+                with self._condition:
+                    self._served += 1
+                return text
+            with self._condition:
+                self._retried += 1
+            time.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def recognize(self, audio: sr.AudioData, timeout: Optional[float] = None) -> str:
+        """
+        Recognize speech in a piece of audio through the queue and wait for the result.
+
+        Args:
+            audio (sr.AudioData): The audio to recognize.
+            timeout (Optional[float], optional): Seconds to wait for the result. Default is no limit.
+
+        Returns:
+            str: The recognized text.
+        """
+        return self.submit(audio).future.result(timeout)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The number of waiting jobs and of requests served, retried and failed so far.
+        """
+        with self._condition:
+            return {"waiting": len(self._waiting), "served": self._served, "retried": self._retried,
+                    "failed": self._failed}
+
+    def close(self) -> None:
+        """
+        Stop the workers once their current request is done; waiting jobs are cancelled.
+        """
+        with self._condition:
+            self._closed = True
+            while self._waiting:
+                self._waiting.popleft().future.cancel()
+            self._publish_depth()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+
+class QueuedRecognizerBackend:
+    """
+    Recognition backend sending the requests of one recognizer through a shared RecognitionQueue.
+
+    It remembers the jobs it has in the queue, so the caller can report the queue position of its
+    earliest waiting request to the user.
+
+    Attributes:
+        queue (RecognitionQueue): The shared queue.
+    """
+
+    def __init__(self, recognition_queue: RecognitionQueue):
+        """
+        Initialize the backend.
+
+        Args:
+            recognition_queue (RecognitionQueue): The shared queue.
+        """
+        self.queue = recognition_queue
+        self._jobs = set()
+        self._lock = threading.Lock()
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """
+        Recognize speech in a piece of audio through the queue.
+
+        Args:
+            audio (sr.AudioData): The audio to recognize.
+
+        Returns:
+            str: The recognized text.
+
+        Raises:
+            QueueFull: If the queue is full.
+        """
+        job = self.queue.submit(audio)
+        with self._lock:
+            self._jobs.add(job)
+        try:
+            return job.future.result()
+        finally:
+            with self._lock:
+                self._jobs.discard(job)
+
+    def queue_position(self) -> int:
+        """
+        Returns:
+            int: The queue position of the earliest request of this backend still waiting, 0 if none is.
+        """
+        with self._lock:
+            jobs = list(self._jobs)
+        positions = [position for position in map(self.queue.position, jobs) if position]
+        return min(positions, default=0)
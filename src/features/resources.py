@@ -0,0 +1,121 @@
+"""
+The NLTK data used by the features, and helpers to download it at build time and preload it at start.
+
+Usage:
+    python src/features/resources.py [--download-dir DIR]
+    cd src && python -m features.resources --warm-up
+
+Downloading only needs NLTK, so the container build can run this file on its own before the application
+code is copied in. The warm-up imports the features and must be run as a module from src.
+"""
+import argparse
+import sys
+import time
+from typing import Optional
+import nltk
+
+# NLTK package -> resource path looked up at runtime, and who needs it.
+NLTK_RESOURCES = {
+    # TextBlob sentence splitting (TextDocument.sentences and every feature built on it).
+    "punkt": "tokenizers/punkt/english.pickle",
+    # Stopwords of the summarizer (summarization_engine.get_stopwords).
+    "stopwords": "corpora/stopwords",
+    # Part-of-speech tagging (pos_tagger.get_tagger).
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger/averaged_perceptron_tagger.pickle",
+}
+
+
+def missing_resources() -> list[str]:
+    """
+    List the NLTK packages that are not installed.
+
+    Returns:
+        list[str]: The names of the missing packages.
+    """
+    missing = []
+    for package, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+    return missing
+
+
+def download_resources(download_dir: Optional[str] = None, quiet: bool = True) -> list[str]:
+    """
+    Download the NLTK packages that are not installed yet.
+
+    Args:
+        download_dir (Optional[str], optional): The NLTK data directory to install into. Default is NLTK's choice.
+        quiet (bool, optional): Whether to hide the download progress. Default is True.
+
+    Returns:
+        list[str]: The names of the downloaded packages.
+
+    Raises:
+        RuntimeError: If a package could not be downloaded.
+    """
+    if download_dir and download_dir not in nltk.data.path:
+        nltk.data.path.insert(0, download_dir)
+    missing = missing_resources()
+    for package in missing:
+        if not nltk.download(package, download_dir=download_dir, quiet=quiet):
+            raise RuntimeError("Could not download NLTK package: {}".format(package))
+    return missing
+
+
+def warm_up() -> dict:
+    """
+    Load the tokenizer, tagger, stopwords and VADER lexicon now instead of on first use.
+
+    Each load is also recorded as a 'warmup.<name>' stage in the metrics registry.
+
+    Returns:
+        dict: Resource name -> seconds taken to load it, plus the 'total'.
+    """
+    from features.instrumentation import timed
+    from features.pos_tagger import get_tagger
+    from features.sentiment_analysis import get_sentiment_analyzer
+    from features.summarization_engine import get_stopwords
+
+    loaders = {
+        "tokenizer": lambda: nltk.sent_tokenize("Warm up. The tokenizer."),
+        "tagger": get_tagger,
+        "stopwords": get_stopwords,
+        "vader": get_sentiment_analyzer,
+    }
+    report = {}
+    for name, load in loaders.items():
+        start = time.perf_counter()
+        with timed("warmup." + name):
+            load()
+        report[name] = time.perf_counter() - start
+    report["total"] = sum(report.values())
+    return report
+
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Download the missing NLTK packages and, optionally, time a warm-up.
+
+    Args:
+        argv (Optional[list], optional): The command line arguments. Default is sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Install the NLTK data used by Sonic-APP.")
+    parser.add_argument("--download-dir", help="NLTK data directory to install into")
+    parser.add_argument("--warm-up", action="store_true", help="preload every resource and report the load times")
+    args = parser.parse_args(argv)
+
+    downloaded = download_resources(args.download_dir)
+    print("Downloaded: {}".format(", ".join(downloaded) or "nothing, all resources present"))
+    if args.warm_up:
+        for name, seconds in warm_up().items():
+            print("{:<10} {:8.3f} s".format(name, seconds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+from features.cache import CacheStats, LRUCache, content_hash
+
+
+def pickled_size(value: Any) -> int:
+    """
+    Estimate the size of a stored result in bytes.
+
+    Args:
+        value (Any): The result.
+
+    Returns:
+        int: The length of bytes and str values, the length of the pickled value otherwise.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+class SqliteCache:
+    """
+    Thread-safe persistent cache of byte values in a SQLite database, bounded by total size.
+
+    The database runs in WAL mode, so readers in other processes are not blocked by a write. Every hit
+    updates the access time of the entry, and when a write takes the total size over max_bytes, the
+    least recently used entries are deleted.
+
+    Attributes:
+        path (Path): The database file.
+        max_bytes (int): The maximum total size of the stored values.
+        stats (CacheStats): Hit, miss and eviction counters.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Open or create the database.
+
+        Args:
+            path (str): The database file. Its directory is created if missing.
+            max_bytes (int, optional): The maximum total size of the stored values. Default is 512 MiB.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False,
+                                           isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                                     "size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        int: The total size of the stored values.
+        """
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the stored bytes for a key and mark the entry as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[bytes]: The stored bytes, or None if the key is not stored.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+            self.stats.hits += 1
+            return row[0]
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store bytes for a key, evicting the least recently used entries when the size budget is exceeded.
+
+        Args:
+            key (str): The cache key.
+            data (bytes): The bytes to store.
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+                connection.execute("INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                                   (key, sqlite3.Binary(data), len(data), time.time()))
+                self._total_bytes += len(data) - (row[0] if row else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        # Called inside the write transaction. Other processes may have written too, so recount first.
+        self._total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        excess = self._total_bytes - self.max_bytes
+        doomed = []
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+            self._total_bytes -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", doomed)
+        self.stats.evictions += len(doomed)
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class ResultStore:
+    """
+    Two-tier store of analysis results shared by every session, keyed by a hash of the input and the result name.
+
+    Lookups go through a memory LRU tier first and then an optional SQLite tier; disk hits are promoted to
+    memory. Results are stored in the disk tier pickled, so they must be picklable; the memory tier keeps
+    the objects themselves, which callers must treat as read-only since every session gets the same object.
+
+    Attributes:
+        memory (LRUCache): The in-memory tier.
+        disk (Optional[SqliteCache]): The on-disk tier, or None when disabled.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 128 * 1024 * 1024, db_path: Optional[str] = None,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the ResultStore instance.
+
+        Args:
+            max_entries (int, optional): The maximum number of results kept in memory. Default is 1024.
+            max_bytes (int, optional): The memory tier size budget. Default is 128 MiB.
+            db_path (Optional[str], optional): The SQLite database of the on-disk tier, or None to disable it.
+            disk_max_bytes (int, optional): The on-disk tier size budget. Default is 512 MiB.
+        """
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=pickled_size)
+        self.disk = SqliteCache(db_path, disk_max_bytes) if db_path else None
+
+    @staticmethod
+    def make_key(source_key: str, name: str) -> str:
+        """
+        Build the store key of a result.
+
+        Args:
+            source_key (str): The content hash of the input.
+            name (str): The name of the result, including any parameters it depends on.
+
+        Returns:
+            str: The content-addressed key.
+        """
+        return content_hash("result", source_key, name)
+
+    def get(self, source_key: str, name: str, default=None):
+        """
+        Look up a result in the memory tier, then the disk tier.
+
+        Args:
+            source_key (str): The content hash of the input.
+            name (str): The name of the result.
+            default: The value returned on a miss. Default is None.
+
+        Returns:
+            The stored result, or default on a miss.
+        """
+        key = self.make_key(source_key, name)
+        missing = object()
+        value = self.memory.get(key, missing)
+        if value is not missing:
+            return value
+        if self.disk is None:
+            return default
+        data = self.disk.get(key)
+        if data is None:
+            return default
+        value = pickle.loads(data)
+        self.memory.put(key, value)
+        return value
+
+    def put(self, source_key: str, name: str, value) -> None:
+        """
+        Store a result in every tier.
+
+        Args:
+            source_key (str): The content hash of the input.
+            name (str): The name of the result.
+            value: The result.
+        """
+        key = self.make_key(source_key, name)
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+    def get_or_compute(self, source_key: str, name: str, compute: Callable):
+        """
+        Return a stored result, computing and storing it on a miss.
+
+        Args:
+            source_key (str): The content hash of the input.
+            name (str): The name of the result.
+            compute (Callable): Function computing the result on a miss.
+
+        Returns:
+            The result.
+        """
+        missing = object()
+        value = self.get(source_key, name, missing)
+        if value is missing:
+            value = compute()
+            self.put(source_key, name, value)
+        return value
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Hit, miss and eviction counters per tier.
+        """
+        stats = {"memory": self.memory.stats.as_dict()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats.as_dict()
+        return stats
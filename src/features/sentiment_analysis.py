@@ -1,21 +1,47 @@
+import re
+import string
 import pandas as pd
 import streamlit as st
 from collections import Counter
-from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import matplotlib.pyplot as plt
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, SentimentIntensityAnalyzer
+from features.chart_renderer import available_themes, render_pie_chart
+from features.text_document import TextDocument
+
+# The VADER scores, in the column order used wherever they are stored as arrays.
+SENTIMENT_KEYS = ('neg', 'neu', 'pos', 'compound')
+
+# Words matching this pattern are scored by VADER from their lexicon valence alone: no punctuation
+# to strip, no emphasis marks, and long enough that SentiText keeps them untouched.
+_PLAIN_WORD = re.compile(r"[^\s{}]{{3,}}".format(re.escape(string.punctuation)))
+
+
+@lru_cache(maxsize=None)
+def get_sentiment_analyzer() -> SentimentIntensityAnalyzer:
+    """
+    Return the process-wide VADER analyzer, loading its lexicon and emoji files on first use.
+
+    Returns:
+        SentimentIntensityAnalyzer: The shared analyzer.
+    """
+    return SentimentIntensityAnalyzer()
+
 
 class SentimentAnalysis:
-    def __init__(self, input_text: str):
+    def __init__(self, input_text: Union[str, TextDocument], score: Optional[dict] = None):
         """
         Initialize SentimentAnalysis object with input_text.
 
         Parameters:
-            input_text (str): The text to be analyzed for sentiment.
+            input_text (Union[str, TextDocument]): The text to be analyzed for sentiment or its analyzed document.
+            score (Optional[dict]): Precomputed VADER scores of the text, e.g. aggregated sentence by sentence.
+                Computed from the text if not given.
         """
-        self.input_text = input_text
-        self.blob = TextBlob(self.input_text)
-        self.score = SentimentIntensityAnalyzer().polarity_scores(self.input_text)
+        self.document = TextDocument.from_input(input_text)
+        self.input_text = self.document.text
+        self.blob = self.document.blob
+        self.score = score if score is not None else get_sentiment_analyzer().polarity_scores(self.input_text)
 
     def count_tags(self) -> Counter:
         """
@@ -24,8 +50,7 @@ class SentimentAnalysis:
         Returns:
             Counter: A Counter object with POS tag counts.
         """
-        pos_counts = Counter(tag[1] for tag in self.blob.tags)
-        return pos_counts
+        return Counter(self.document.pos_counts)
 
     def count_words(self) -> tuple[list[str], list[int]]:
         """
@@ -34,7 +59,7 @@ class SentimentAnalysis:
         Returns:
             tuple[list[str], list[int]]: A tuple containing two lists - words and their corresponding counts.
         """
-        words_count = self.blob.word_counts
+        words_count = self.document.word_counts
         return list(words_count.keys()), list(words_count.values())
 
     def categorize_words(self) -> tuple[list[str], list[str], list[str]]:
@@ -45,11 +70,42 @@ class SentimentAnalysis:
             tuple[list[str], list[str], list[str]]: A tuple containing three lists - negatives, neutrals, and positives.
         """
         words, _ = self.count_words()  # Use count_words() to obtain the words
+        return self.categorize_vocabulary(words)
+
+    @staticmethod
+    def categorize_vocabulary(words: Iterable[str]) -> tuple[list[str], list[str], list[str]]:
+        """
+        Categorize single words as negatives, neutrals, or positives in one batch.
+
+        Plain words are classified by a direct lookup in the VADER lexicon, which yields the same bucket
+        as polarity_scores on the lone word; anything else (punctuation, emojis, very short tokens)
+        falls back to polarity_scores on the shared analyzer.
+
+        Parameters:
+            words (Iterable[str]): The words to categorize.
+
+        Returns:
+            tuple[list[str], list[str], list[str]]: A tuple containing three lists - negatives, neutrals, and positives.
+        """
+        analyzer = get_sentiment_analyzer()
+        lexicon = analyzer.lexicon
+        emojis = analyzer.emojis
         negatives = []
         neutrals = []
         positives = []
         for word in words:
-            analysis_vader_var = SentimentIntensityAnalyzer().polarity_scores(word)
+            if _PLAIN_WORD.fullmatch(word) and not any(char in emojis for char in word):
+                lowered = word.lower()
+                valence = 0.0 if lowered in BOOSTER_DICT else lexicon.get(lowered, 0.0)
+                if valence < 0:
+                    negatives.append(word)
+                elif valence > 0:
+                    positives.append(word)
+                else:
+                    neutrals.append(word)
+                continue
+
+            analysis_vader_var = analyzer.polarity_scores(word)
             if analysis_vader_var['neg'] == 1.0:
                 negatives.append(word)
             elif analysis_vader_var['neu'] == 1.0:
@@ -88,23 +144,16 @@ class SentimentAnalysis:
             sizes = [round(self.score['neg'] * 100), round(self.score['neu'] * 100), round(self.score['pos'] * 100)]
         return labels, sizes
 
-    def plot_pie_chart(self, labels: list[str], sizes: list[int]) -> plt.figure:
+    def plot_pie_chart(self, labels: list[str], sizes: list[int]) -> bytes:
         """
-        Plot a pie chart based on the provided labels and sizes.
+        Plot a pie chart based on the provided labels and sizes, in the theme chosen by the user.
 
         Parameters:
             labels (list[str]): A list of labels for the pie chart.
             sizes (list[int]): A list of sizes corresponding to each label.
 
         Returns:
-            plt.figure: The matplotlib figure containing the pie chart.
+            bytes: The PNG image of the pie chart.
         """
-        option = st.selectbox('Apply the theme: ', plt.style.available)
-        plt.style.use(option)
-        fig, ax = plt.subplots(figsize=(6, 6))
-        fig.set_facecolor('#0E1117')
-        plt.tight_layout()
-        ax.pie(sizes, labels=labels, wedgeprops={'linewidth': 1.0, 'edgecolor': 'white'}, startangle=90,
-               textprops={'color': '#0E1117'})
-        ax.legend(fontsize="12", loc="upper right")
-        return fig
+        option = st.selectbox('Apply the theme: ', available_themes())
+        return render_pie_chart(labels, sizes, option)
@@ -0,0 +1,126 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union
+import numpy as np
+import pandas as pd
+from features.sentiment_analysis import SENTIMENT_KEYS, get_sentiment_analyzer
+from features.text_document import TextDocument
+
+
+def _score_batch(sentences: list[str]) -> np.ndarray:
+    """
+    Score a batch of sentences with the VADER analyzer of the current process.
+
+    Args:
+        sentences (list[str]): The sentences.
+
+    Returns:
+        np.ndarray: One row of SENTIMENT_KEYS scores per sentence.
+    """
+    analyzer = get_sentiment_analyzer()
+    scores = np.empty((len(sentences), len(SENTIMENT_KEYS)), dtype=np.float64)
+    for row, sentence in enumerate(sentences):
+        result = analyzer.polarity_scores(sentence)
+        scores[row] = [result[key] for key in SENTIMENT_KEYS]
+    return scores
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute the trailing rolling mean of a series in one pass.
+
+    The first window - 1 values are averaged over the values available so far.
+
+    Args:
+        values (np.ndarray): The series.
+        window (int): The window length.
+
+    Returns:
+        np.ndarray: The rolling mean, the same length as values.
+    """
+    window = max(1, int(window))
+    cumulative = np.cumsum(np.concatenate(([0.0], values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+class SentimentTimeline:
+    """
+    Sentence-level VADER sentiment of a text, kept in NumPy arrays.
+
+    Every sentence is scored once with the shared analyzer, in batches that can be spread over a process
+    pool for long transcripts; rolling aggregates and rankings are then vectorized operations on the
+    score arrays.
+
+    Attributes:
+        sentences (list[str]): The sentences of the text.
+        scores (np.ndarray): One row of ('neg', 'neu', 'pos', 'compound') scores per sentence.
+    """
+
+    def __init__(self, input_text: Union[str, TextDocument], batch_size: int = 1000, max_workers: int = 0):
+        """
+        Score every sentence of the text.
+
+        Args:
+            input_text (Union[str, TextDocument]): The text or its analyzed document.
+            batch_size (int, optional): The number of sentences scored per batch. Default is 1000.
+            max_workers (int, optional): Worker processes used when there are several batches; 0 or 1
+                scores everything in-process. Default is 0.
+        """
+        self.sentences = TextDocument.from_input(input_text).sentences
+        batches = [self.sentences[i:i + batch_size] for i in range(0, len(self.sentences), batch_size)]
+        if max_workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_score_batch, batches))
+        else:
+            results = [_score_batch(batch) for batch in batches]
+        self.scores = np.concatenate(results) if results else np.empty((0, len(SENTIMENT_KEYS)))
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def column(self, key: str) -> np.ndarray:
+        """
+        Args:
+            key (str): One of 'neg', 'neu', 'pos' and 'compound'.
+
+        Returns:
+            np.ndarray: The score of every sentence.
+        """
+        return self.scores[:, SENTIMENT_KEYS.index(key)]
+
+    def rolling(self, window: int = 20) -> pd.DataFrame:
+        """
+        Get the rolling mean of every score, e.g. for a timeline chart.
+
+        Args:
+            window (int, optional): The number of sentences averaged. Default is 20.
+
+        Returns:
+            pd.DataFrame: One row per sentence and one column per score.
+        """
+        return pd.DataFrame({key: rolling_mean(self.column(key), window) for key in SENTIMENT_KEYS},
+                            index=pd.RangeIndex(1, len(self.sentences) + 1, name='Sentence'))
+
+    def extremes(self, n: int = 3) -> tuple[list[tuple[str, float]], list[tuple[str, float]]]:
+        """
+        Find the most negative and most positive sentences by compound score.
+
+        A sentence is never in both lists, so short texts get fewer than n sentences of each kind.
+
+        Args:
+            n (int, optional): The number of sentences of each kind. Default is 3.
+
+        Returns:
+            tuple: (sentence, compound) pairs of the most negative and of the most positive sentences.
+        """
+        compound = self.column('compound')
+        n = min(n, len(compound) // 2)
+        if not n:
+            return [], []
+        # Both ends of one ordering, so tied scores cannot put the same sentence in both lists.
+        order = np.argsort(compound, kind='stable')
+        lowest = order[:n]
+        highest = order[::-1][:n]
+        return ([(self.sentences[i], float(compound[i])) for i in lowest],
+                [(self.sentences[i], float(compound[i])) for i in highest])
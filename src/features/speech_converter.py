@@ -1,10 +1,91 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import Optional
 from gtts import gTTS
+from features.cache import LRUCache, content_hash
+from features.instrumentation import timed
+from features.text_chunker import chunk_text
+
+
+class GTTSBackend:
+    """
+    Synthesis backend calling Google Text-to-Speech through gTTS.
+
+    Attributes:
+        max_chars (int): The longest text gTTS sends in a single request.
+    """
+
+    max_chars = 100
+
+    def synthesize(self, text: str, lang: str, slow: bool) -> bytes:
+        """
+        Synthesize speech for a piece of text.
+
+        Args:
+            text (str): The text to synthesize.
+            lang (str): Language of the speech.
+            slow (bool): Flag to control the speed of speech.
+
+        Returns:
+            bytes: The MP3 audio.
+        """
+        fp = BytesIO()
+        gTTS(text, slow=slow, lang=lang).write_to_fp(fp)
+        return fp.getvalue()
+
+
+class StubSpeechBackend:
+    """
+    Local stand-in synthesis backend for tests and offline runs.
+
+    Attributes:
+        max_chars (int): The longest text sent in a single request.
+        delay (float): Seconds to sleep per call, to simulate network latency.
+        calls (int): The number of synthesize calls made.
+    """
+
+    max_chars = 100
+
+    def __init__(self, delay: float = 0.0):
+        """
+        Initialize the StubSpeechBackend instance.
+
+        Args:
+            delay (float, optional): Seconds to sleep per call. Default is 0.0.
+        """
+        self.delay = delay
+        self.calls = 0
+
+    def synthesize(self, text: str, lang: str, slow: bool) -> bytes:
+        """
+        Return placeholder audio bytes for a piece of text.
+
+        Args:
+            text (str): The text to synthesize.
+            lang (str): Language of the speech.
+            slow (bool): Flag to control the speed of speech.
+
+        Returns:
+            bytes: Placeholder bytes derived from the text.
+        """
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return text.encode("utf-8")
+
+
+# Synthesized audio shared by every SpeechConverter, keyed by (text hash, lang, slow).
+_AUDIO_CACHE = LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+
 
 class SpeechConverter:
     """
     SpeechConverter class that converts text to speech using the gTTS library.
 
+    Long texts are split by sentence into chunks that are synthesized concurrently and concatenated,
+    and the resulting audio is cached so repeated requests for the same text and speed cost nothing.
+
     Attributes:
         slow (bool): Flag to control the speed of speech.
         lang (str): Language of the speech.
@@ -14,7 +95,8 @@ class SpeechConverter:
             Converts the given text to speech and returns the sound file as a BytesIO object.
     """
 
-    def __init__(self, line_edit: str, slow: bool = False, lang: str = 'en'):
+    def __init__(self, line_edit: str, slow: bool = False, lang: str = 'en', backend=None,
+                 cache: Optional[LRUCache] = None, max_workers: int = 4):
         """
         Initialize the SpeechConverter object.
 
@@ -22,19 +104,44 @@ class SpeechConverter:
             line_edit (str): The text to be converted to speech.
             slow (bool, optional): Flag to control the speed of speech. Default is False.
             lang (str, optional): Language of the speech. Default is 'en'.
+            backend (optional): The synthesis backend. Default is GTTSBackend.
+            cache (Optional[LRUCache], optional): The audio cache. Default is the process-wide cache.
+            max_workers (int, optional): The maximum number of concurrent synthesis requests. Default is 4.
         """
         self.line_edit = line_edit
         self.slow = slow
         self.lang = lang
+        self.backend = backend if backend is not None else GTTSBackend()
+        self.cache = cache if cache is not None else _AUDIO_CACHE
+        self.max_workers = max_workers
         self.sound_file = BytesIO()
 
+    def _synthesize_chunk(self, chunk: str) -> bytes:
+        with timed("synthesis.chunk"):
+            return self.backend.synthesize(chunk, self.lang, self.slow)
+
     def convert_to_speech(self) -> BytesIO:
         """
         Convert the given text to speech using the gTTS library.
 
+        Empty or whitespace-only text gives an empty sound file, without any request or cache entry.
+
         Returns:
             BytesIO: The sound file as a BytesIO object.
         """
-        tts = gTTS(self.line_edit, slow=self.slow, lang=self.lang)
-        tts.write_to_fp(self.sound_file)
+        if not self.line_edit or not self.line_edit.strip():
+            self.sound_file.seek(0)
+            return self.sound_file
+        with timed("synthesis"):
+            key = content_hash("speech", self.lang, self.slow, self.line_edit)
+            audio = self.cache.get(key)
+            if audio is None:
+                max_chars = getattr(self.backend, "max_chars", 100)
+                chunks = [chunk.strip() for chunk in chunk_text(self.line_edit, max_chars) if chunk.strip()]
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    audio = b"".join(executor.map(self._synthesize_chunk, chunks))
+                self.cache.put(key, audio)
+
+        self.sound_file.write(audio)
+        self.sound_file.seek(0)
         return self.sound_file
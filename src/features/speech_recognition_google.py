@@ -1,15 +1,126 @@
+import random
+import struct
+import threading
+import time
+import wave
 import speech_recognition as sr
 import streamlit as st
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+from features.audio_preprocessor import PreprocessedAudio, PreprocessedStream, preprocess_wav
+from features.audio_segmenter import AudioSegment, iter_wav_segments
+from features.instrumentation import timed
+from features.recognition_queue import QueueFull
+
+
+class GoogleRecognizerBackend:
+    """
+    Recognition backend calling the Google Speech Recognition API.
+    """
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """
+        Recognize speech in a piece of audio.
+
+        Args:
+            audio (sr.AudioData): The audio to recognize.
+
+        Returns:
+            str: The recognized text.
+        """
+        return sr.Recognizer().recognize_google(audio)
+
+
+class StubRecognizerBackend:
+    """
+    Local stand-in recognition backend for tests, load tests and offline runs.
+
+    Attributes:
+        delay (float): Seconds to sleep per call, to simulate network latency.
+        failure_rate (float): The fraction of calls failing with sr.RequestError, to simulate rate limiting.
+        calls (int): The number of recognize calls made.
+    """
+
+    def __init__(self, delay: float = 0.0, failure_rate: float = 0.0):
+        """
+        Initialize the StubRecognizerBackend instance.
+
+        Args:
+            delay (float, optional): Seconds to sleep per call. Default is 0.0.
+            failure_rate (float, optional): The fraction of calls failing with sr.RequestError. Default is 0.0.
+        """
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """
+        Return a placeholder transcript describing the audio length.
+
+        Args:
+            audio (sr.AudioData): The audio to recognize.
+
+        Returns:
+            str: A placeholder transcript.
+
+        Raises:
+            sr.RequestError: For the simulated failures.
+        """
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise sr.RequestError("recognition request failed; stub failure")
+        seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        return "speech of {:.1f} seconds".format(seconds)
+
+
 class SpeechRecognizer:
-    def __init__(self, uploaded_file: str):
+    def __init__(self, uploaded_file: str, backend=None, preprocessing: bool = True, trim_silence: bool = True):
         """
         A class for speech recognition using the Google Speech Recognition API.
 
         Args:
             uploaded_file (str): Path to the audio file to be recognized.
+            backend (optional): The recognition backend, e.g. a QueuedRecognizerBackend. Default is GoogleRecognizerBackend.
+            preprocessing (bool, optional): Downmix to mono and resample to 16 kHz before recognition. Default is True.
+            trim_silence (bool, optional): Also drop leading and trailing silence when preprocessing. Default is True.
         """
         self.uploaded_file = uploaded_file
         self.recognizer = sr.Recognizer()
+        self.backend = backend if backend is not None else GoogleRecognizerBackend()
+        self.preprocessing = preprocessing
+        self.trim_silence = trim_silence
+        self.preprocessed: Optional[PreprocessedAudio] = None
+        self.stream: Optional[PreprocessedStream] = None
+
+    def preprocess(self) -> PreprocessedAudio:
+        """
+        Reduce the file to 16 kHz mono once; the result and its size report are kept in self.preprocessed.
+
+        Returns:
+            PreprocessedAudio: The audio sent for recognition.
+        """
+        if self.preprocessed is None:
+            with timed("preprocessing"):
+                self.preprocessed = preprocess_wav(self.uploaded_file, trim_silence=self.trim_silence)
+        return self.preprocessed
+
+    def preprocessing_report(self) -> dict:
+        """
+        Get the size report of the audio sent for recognition.
+
+        After stream_transcript, this is the report of the segments it sent, so the file is not reduced
+        a second time; otherwise the file is preprocessed as a whole.
+
+        Returns:
+            dict: The size report (see PreprocessedAudio.report).
+        """
+        if self.stream is not None:
+            return self.stream.report()
+        return self.preprocess().report()
 
     def recognize_speech_google(self) -> str:
         """
@@ -23,10 +134,14 @@ class SpeechRecognizer:
                 Possible reasons: unknown value, request error, or other unexpected errors.
         """
         try:
-            with sr.AudioFile(self.uploaded_file) as source:
-                audio = self.recognizer.record(source)
+            with timed("recognition"):
+                if self.preprocessing:
+                    audio = self.preprocess().to_audio_data()
+                else:
+                    with sr.AudioFile(self.uploaded_file) as source:
+                        audio = self.recognizer.record(source)
 
-            text = self.recognizer.recognize_google(audio)
+                text = self.backend.recognize(audio)
             return text
         except sr.UnknownValueError:
             '''
@@ -43,6 +158,132 @@ class SpeechRecognizer:
 
             st.error("An error occurred during speech recognition")
             st.stop()
-        except:
+        except QueueFull:
+            st.error("Too many recordings are being recognized right now, please try again in a moment.")
+            st.stop()
+        except (ValueError, EOFError, struct.error, wave.Error):
             st.error("Try importing another file.")
-            st.stop()
\ No newline at end of file
+            st.stop()
+
+    def _recognize_segment(self, segment: AudioSegment) -> str:
+        try:
+            with timed("recognition.segment"):
+                return self.backend.recognize(segment.to_audio_data())
+        except sr.UnknownValueError:
+            return ""
+
+    def stream_transcript(self, max_workers: int = 4, poll_interval: Optional[float] = None,
+                          **segment_options) -> Iterator[str]:
+        """
+        Recognize a WAV file segment by segment, yielding the growing transcript as segments finish.
+
+        The file is read in frames and split at pauses or at a maximum segment length (see segment_samples).
+        When preprocessing, each block is downmixed and resampled as it is reached (see PreprocessedStream),
+        so neither the original nor the reduced audio is held as a whole. Segments are recognized concurrently
+        on a bounded worker pool; at most 2 * max_workers segments are held in memory. Segments without
+        recognizable speech contribute nothing to the transcript.
+
+        Args:
+            max_workers (int, optional): The maximum number of concurrent recognition requests. Default is 4.
+            poll_interval (Optional[float], optional): If set, the transcript is also yielded, possibly
+                unchanged, whenever no segment finished for this many seconds, so the caller can show
+                progress. Default is None.
+            **segment_options: Keyword arguments passed to segment_samples.
+
+        Yields:
+            str: The transcript of every segment recognized so far, in recording order.
+
+        Raises:
+            sr.RequestError: If the recognition backend cannot be reached.
+            wave.Error: If the file is not a PCM WAV file.
+        """
+        pending = {}
+        results = {}
+        texts = []
+
+        def collect(done) -> bool:
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            grew = False
+            while len(texts) in results:
+                text = results.pop(len(texts))
+                texts.append(text)
+                grew = grew or bool(text)
+            return grew
+
+        if self.preprocessing:
+            self.stream = PreprocessedStream(self.uploaded_file, trim_silence=self.trim_silence)
+            segments = self.stream.segments(**segment_options)
+        else:
+            segments = iter_wav_segments(self.uploaded_file, **segment_options)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for segment in segments:
+                pending[executor.submit(self._recognize_segment, segment)] = segment.index
+                while len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    if collect(done) or not done:
+                        yield " ".join(text for text in texts if text)
+            while pending:
+                done, _ = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                if collect(done) or not done:
+                    yield " ".join(text for text in texts if text)
+
+    def transcribe(self, **stream_options) -> str:
+        """
+        Recognize the whole file without any Streamlit interaction, e.g. in a batch job.
+
+        Args:
+            **stream_options: Keyword arguments passed to stream_transcript.
+
+        Returns:
+            str: The recognized text, empty if no speech was recognized.
+
+        Raises:
+            sr.RequestError: If the recognition backend cannot be reached.
+            wave.Error: If the file is not a PCM WAV file.
+        """
+        text = ""
+        with timed("recognition"):
+            for text in self.stream_transcript(**stream_options):
+                pass
+        return text
+
+    def recognize_speech_streaming(self, placeholder) -> str:
+        """
+        Recognize speech segment by segment, writing the partial transcript to a Streamlit placeholder.
+
+        While the requests wait in a shared recognition queue (see QueuedRecognizerBackend), the placeholder
+        also shows the queue position of the earliest one.
+
+        Args:
+            placeholder: The Streamlit element (e.g. st.empty()) that shows the partial transcript.
+
+        Returns:
+            str: The recognized text from the audio file.
+        """
+        text = ""
+        queue_position = getattr(self.backend, "queue_position", None)
+        try:
+            with timed("recognition"):
+                for text in self.stream_transcript(poll_interval=0.5):
+                    position = queue_position() if queue_position is not None else 0
+                    if position:
+                        placeholder.write("{}\n\n*Waiting for recognition: position {} in the queue*"
+                                          .format(text, position))
+                    else:
+                        placeholder.write(text)
+        except sr.RequestError:
+            st.error("An error occurred during speech recognition")
+            st.stop()
+        except QueueFull:
+            st.error("Too many recordings are being recognized right now, please try again in a moment.")
+            st.stop()
+        except (ValueError, EOFError, struct.error, wave.Error):
+            st.error("Try importing another file.")
+            st.stop()
+
+        if not text:
+            st.error("Unable to recognize speech. Make sure your data doesn't include background music.")
+            st.stop()
+        placeholder.empty()
+        return text
@@ -0,0 +1,171 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+import nltk
+import numpy as np
+from scipy import sparse
+
+_TOKEN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into the lowercased words the engine counts, apostrophes kept inside words.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        list[str]: The words, stopwords included.
+    """
+    return _TOKEN.findall(text.lower())
+
+
+@lru_cache(maxsize=None)
+def get_stopwords() -> frozenset:
+    """
+    Load the English stopword list once per process.
+
+    Returns:
+        frozenset: The lowercased English stopwords.
+    """
+    return frozenset(nltk.corpus.stopwords.words('english'))
+
+
+class SummarizationEngine:
+    """
+    Extractive summarizer scoring sentences with sparse matrix operations.
+
+    The sentences are tokenized once into a sparse term-by-sentence count matrix (stopwords removed),
+    and every scoring method is a handful of vectorized operations over that matrix, so the cost is
+    linear in the number of tokens.
+
+    Scoring methods:
+        'frequency': the sum, over the words of a sentence, of their frequency in the whole text.
+        'tfidf': the sum of the TF-IDF weights of the words of a sentence, sentences being the documents.
+        'textrank': PageRank over the cosine similarity graph of the TF-IDF sentence vectors.
+
+    Attributes:
+        sentences (list[str]): The sentences of the text.
+        vocabulary (dict): Term -> row index in the matrix.
+        matrix (sparse.csr_matrix): Term-by-sentence counts.
+    """
+
+    METHODS = ('frequency', 'tfidf', 'textrank')
+
+    def __init__(self, sentences: list[str], stopwords: Optional[Iterable[str]] = None,
+                 idf: Optional[dict] = None):
+        """
+        Initialize the SummarizationEngine instance.
+
+        Args:
+            sentences (list[str]): The sentences of the text.
+            stopwords (Optional[Iterable[str]], optional): Words to ignore. Default is the NLTK English list.
+            idf (Optional[dict], optional): Term -> IDF weights to use instead of the per-sentence IDF,
+                e.g. corpus-level weights. Terms missing from it get the largest weight present.
+        """
+        self.sentences = sentences
+        self.stopwords = get_stopwords() if stopwords is None else frozenset(stopwords)
+        self.external_idf = idf
+        self.vocabulary = {}
+
+        rows = []
+        cols = []
+        for index, sentence in enumerate(sentences):
+            term_ids = [self.vocabulary.setdefault(token, len(self.vocabulary))
+                        for token in tokenize(sentence) if token not in self.stopwords]
+            rows.extend(term_ids)
+            cols.extend([index] * len(term_ids))
+
+        data = np.ones(len(rows), dtype=np.float64)
+        self.matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(self.vocabulary), len(sentences)))
+        self.matrix.sum_duplicates()
+
+    def idf(self) -> np.ndarray:
+        """
+        Compute the smoothed inverse document frequency of every term.
+
+        Returns:
+            np.ndarray: The IDF weight of each term, indexed like the matrix rows.
+        """
+        if self.external_idf is not None:
+            default = max(self.external_idf.values(), default=1.0)
+            weights = np.full(len(self.vocabulary), default)
+            for term, index in self.vocabulary.items():
+                weights[index] = self.external_idf.get(term, default)
+            return weights
+        document_frequency = self.matrix.getnnz(axis=1)
+        return np.log((1 + len(self.sentences)) / (1 + document_frequency)) + 1
+
+    def tfidf(self) -> sparse.csr_matrix:
+        """
+        Returns:
+            sparse.csr_matrix: Term-by-sentence TF-IDF weights.
+        """
+        return sparse.diags(self.idf()) @ self.matrix
+
+    def score(self, method: str = 'frequency') -> np.ndarray:
+        """
+        Score every sentence.
+
+        Args:
+            method (str, optional): One of METHODS. Default is 'frequency'.
+
+        Returns:
+            np.ndarray: The score of each sentence.
+
+        Raises:
+            ValueError: If the method is unknown.
+        """
+        if method == 'frequency':
+            term_frequency = np.asarray(self.matrix.sum(axis=1)).ravel()
+            return self.matrix.T @ term_frequency
+        if method == 'tfidf':
+            return np.asarray(self.tfidf().sum(axis=0)).ravel()
+        if method == 'textrank':
+            return self._textrank()
+        raise ValueError("Unknown scoring method: {}".format(method))
+
+    def _textrank(self, damping: float = 0.85, tolerance: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+        weights = self.tfidf().tocsc()
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=0)).ravel())
+        nonempty = norms > 0
+        normalized = weights @ sparse.diags(np.where(nonempty, 1 / np.where(nonempty, norms, 1), 0))
+        transposed = normalized.T.tocsr()
+        self_similarity = nonempty.astype(np.float64)
+
+        def similarity_dot(vector: np.ndarray) -> np.ndarray:
+            # (X^T X - I) v without materializing the sentence-by-sentence matrix.
+            return transposed @ (normalized @ vector) - self_similarity * vector
+
+        count = len(self.sentences)
+        degree = similarity_dot(np.ones(count))
+        dangling = degree <= 1e-12
+        rank = np.full(count, 1.0 / count)
+        for _ in range(max_iter):
+            spread = np.where(dangling, 0.0, rank / np.where(dangling, 1.0, degree))
+            updated = (1 - damping) / count + damping * (similarity_dot(spread) + rank[dangling].sum() / count)
+            if np.abs(updated - rank).sum() < tolerance:
+                rank = updated
+                break
+            rank = updated
+        return np.where(nonempty, rank, 0.0)
+
+    def rank(self, length: int = 1, method: str = 'frequency') -> list[int]:
+        """
+        Pick the highest scoring sentences.
+
+        Sentences scoring zero (no content words) are never picked, and ties keep text order.
+
+        Args:
+            length (int, optional): The maximum number of sentences to pick. Default is 1.
+            method (str, optional): One of METHODS. Default is 'frequency'.
+
+        Returns:
+            list[int]: The indices of the picked sentences, best first.
+        """
+        if not self.sentences or length < 1:
+            return []
+        scores = self.score(method)
+        order = np.argsort(-scores, kind='stable')[:length]
+        return [int(index) for index in order if scores[index] > 0]
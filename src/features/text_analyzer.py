@@ -1,7 +1,7 @@
 import pandas as pd
 import streamlit as st
-from collections import Counter
-from textblob import TextBlob
+from typing import Union
+from features.text_document import TextDocument
 
 class PartOfSpeechConverter:
     """
@@ -64,20 +64,50 @@ class TextAnalyzer:
     Class to analyze text using TextBlob.
     """
     @staticmethod
-    def analyze_text_blob(input_text: str) -> tuple:
+    def count_pos(input_text: Union[str, TextDocument]) -> dict:
+        """
+        Count the parts of speech in the input text, without any Streamlit interaction.
+
+        Args:
+            input_text (Union[str, TextDocument]): The input text or its analyzed document.
+
+        Returns:
+            dict: Full part-of-speech name -> number of occurrences.
+        """
+        document = TextDocument.from_input(input_text)
+        return TextAnalyzer.name_pos_counts(document.pos_count_array)
+
+    @staticmethod
+    def name_pos_counts(counts: "np.ndarray") -> dict:
+        """
+        Convert a POS count array to counts by full part-of-speech name.
+
+        Args:
+            counts (np.ndarray): Counts indexed like pos_tagger.POS_TAGS, with unknown tags counted last.
+
+        Returns:
+            dict: Full part-of-speech name -> number of occurrences, for the parts of speech that occur.
+        """
+        from features.pos_tagger import POS_TAGS
+
+        pos_counts = {PartOfSpeechConverter.convert_pos_to_full_name(tag): int(counts[index])
+                      for index, tag in enumerate(POS_TAGS) if counts[index]}
+        if counts[-1]:
+            pos_counts[PartOfSpeechConverter.convert_pos_to_full_name(None)] = int(counts[-1])
+        return pos_counts
+
+    @staticmethod
+    def analyze_text_blob(input_text: Union[str, TextDocument]) -> tuple:
         """
         Analyze the input text using TextBlob and get part-of-speech counts.
 
         Args:
-            input_text (str): The input text to be analyzed.
+            input_text (Union[str, TextDocument]): The input text or its analyzed document.
 
         Returns:
             tuple: A tuple containing keywords (list) and part-of-speech counts (dict).
         """
-        blob = TextBlob(input_text)
-        pos_full_names = [(word, PartOfSpeechConverter.convert_pos_to_full_name(tag)) for word, tag in blob.tags]
-        pos_counts = Counter(tag[1] for tag in pos_full_names)
-        pos_counts = dict(pos_counts)
+        pos_counts = TextAnalyzer.count_pos(input_text)
 
         options = list(pos_counts.keys())
         keywords = st.multiselect("Select keywords", options, default=options)
@@ -0,0 +1,96 @@
+import re
+from typing import Iterable, Iterator
+
+# A sentence ends with terminal punctuation (optionally followed by closing quotes or brackets) and
+# whitespace, or with a line break. The whitespace stays attached to the preceding sentence.
+_SENTENCE_BOUNDARY = re.compile(r"[.!?…。！？]+['\")\]”’]*\s+|\n\s*")
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split text into sentences without losing any characters.
+
+    Each sentence keeps its trailing whitespace, so ''.join(split_sentences(text)) == text.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list[str]: The sentences of the text.
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        sentences.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        sentences.append(text[start:])
+    return sentences
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> list[str]:
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars)
+        cut = cut + 1 if cut > 0 else max_chars
+        pieces.append(sentence[:cut])
+        sentence = sentence[cut:]
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def chunk_text(text: str, max_chars: int) -> list[str]:
+    """
+    Group consecutive sentences into chunks of at most max_chars characters.
+
+    Sentences longer than max_chars are split at the last space before the limit, or hard-split when
+    there is none. No characters are lost, so ''.join(chunk_text(text, n)) == text.
+
+    Args:
+        text (str): The text to split.
+        max_chars (int): The maximum length of a chunk.
+
+    Returns:
+        list[str]: The chunks, in text order.
+    """
+    chunks = []
+    current = ""
+    for sentence in split_sentences(text):
+        for piece in _split_long_sentence(sentence, max_chars):
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def iter_sentences(chunks: Iterable[str], max_sentence_chars: int = 10_000) -> Iterator[str]:
+    """
+    Split a stream of text chunks into sentences, joining sentences cut by a chunk boundary.
+
+    The last sentence of each chunk is held back until the next chunk shows where it ends, so the output
+    is the same as split_sentences on the whole text. A run of text without any boundary is released once
+    it exceeds max_sentence_chars, which keeps the memory used independent of the input size.
+
+    Args:
+        chunks (Iterable[str]): Consecutive pieces of the text.
+        max_sentence_chars (int, optional): The longest sentence held back. Default is 10,000.
+
+    Yields:
+        str: The sentences of the text, with their trailing whitespace.
+    """
+    carry = ""
+    for chunk in chunks:
+        sentences = split_sentences(carry + chunk)
+        if not sentences:
+            continue
+        carry = sentences.pop()
+        yield from sentences
+        if len(carry) > max_sentence_chars:
+            yield carry
+            carry = ""
+    if carry:
+        yield carry
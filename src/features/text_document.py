@@ -0,0 +1,119 @@
+from collections import Counter
+from functools import cached_property
+from typing import Union
+from textblob import TextBlob
+
+
+class TextDocument:
+    """
+    Analyzed view of a single input text, shared by every feature class.
+
+    The text is wrapped in one TextBlob and each analysis (sentences, tokens, POS tags, word counts)
+    is computed on first access and reused afterwards, so a document is tokenized and tagged once
+    no matter how many features read from it.
+
+    Attributes:
+        text (str): The raw input text.
+        blob (TextBlob): The TextBlob built from the input text.
+    """
+
+    def __init__(self, text: str):
+        """
+        Initialize the TextDocument instance.
+
+        Args:
+            text (str): The input text to analyze.
+        """
+        self.text = text or ""
+        self.blob = TextBlob(self.text)
+
+    @staticmethod
+    def from_input(source: Union[str, "TextDocument"]) -> "TextDocument":
+        """
+        Return the given document unchanged, or build a new one from raw text.
+
+        Args:
+            source (Union[str, TextDocument]): Raw text or an already analyzed document.
+
+        Returns:
+            TextDocument: The analyzed document.
+        """
+        if isinstance(source, TextDocument):
+            return source
+        return TextDocument(source)
+
+    @staticmethod
+    def from_precomputed(text: str, **analyses) -> "TextDocument":
+        """
+        Build a document whose analyses were already computed elsewhere, e.g. sentence by sentence.
+
+        Args:
+            text (str): The text of the document.
+            **analyses: Values for any of sentences, sentence_words, tokens, tags, word_counts and pos_counts.
+                The others are computed from the text on first access as usual.
+
+        Returns:
+            TextDocument: The document.
+
+        Raises:
+            ValueError: If an unknown analysis is given.
+        """
+        document = TextDocument(text)
+        for name, value in analyses.items():
+            if not isinstance(getattr(TextDocument, name, None), cached_property):
+                raise ValueError("Unknown document analysis: {}".format(name))
+            document.__dict__[name] = value
+        return document
+
+    @cached_property
+    def sentences(self) -> list[str]:
+        """
+        list[str]: The sentences of the text.
+        """
+        return [str(sentence) for sentence in self.blob.sentences]
+
+    @cached_property
+    def sentence_words(self) -> list[list[str]]:
+        """
+        list[list[str]]: The words of each sentence, without punctuation.
+        """
+        return [list(sentence.words) for sentence in self.blob.sentences]
+
+    @cached_property
+    def tokens(self) -> list[str]:
+        """
+        list[str]: The words of the text, without punctuation.
+        """
+        return list(self.blob.words)
+
+    @cached_property
+    def tags(self) -> list[tuple[str, str]]:
+        """
+        list[tuple[str, str]]: (word, POS tag) pairs for the text, tagged in one batch by the shared POS tagger.
+        """
+        from features.pos_tagger import get_pos_tagger
+        return get_pos_tagger().tag_words(sentence.tokens for sentence in self.blob.sentences)
+
+    @cached_property
+    def word_counts(self) -> dict:
+        """
+        dict: Lowercased word -> number of occurrences.
+        """
+        if not self.text.strip():
+            return {}
+        return dict(self.blob.word_counts)
+
+    @cached_property
+    def pos_counts(self) -> Counter:
+        """
+        Counter: POS tag -> number of occurrences.
+        """
+        return Counter(tag for _, tag in self.tags)
+
+    @cached_property
+    def pos_count_array(self) -> "np.ndarray":
+        """
+        np.ndarray: POS tag counts indexed like pos_tagger.POS_TAGS, with tags not in the mapping counted last.
+        """
+        from features.pos_tagger import count_tags
+        return count_tags(tag for _, tag in self.tags)
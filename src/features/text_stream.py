@@ -0,0 +1,134 @@
+import codecs
+from collections import Counter
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+import numpy as np
+from features.pos_tagger import UNKNOWN_INDEX
+from features.sentiment_analysis import SENTIMENT_KEYS, get_sentiment_analyzer
+from features.text_chunker import iter_sentences
+from features.text_document import TextDocument
+
+
+def iter_text_chunks(fileobj: BinaryIO, chunk_size: int = 1 << 20, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Read a binary file as text, one chunk at a time.
+
+    Characters split across chunks by a multi-byte encoding are decoded correctly; undecodable bytes
+    are replaced.
+
+    Args:
+        fileobj (BinaryIO): The file to read.
+        chunk_size (int, optional): The number of bytes read at a time. Default is 1 MiB.
+        encoding (str, optional): The text encoding. Default is 'utf-8'.
+
+    Yields:
+        str: The decoded chunks.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while True:
+        data = fileobj.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class StreamingTextAnalyzer:
+    """
+    Analyzes a text of any size from a stream of sentences, keeping only running totals.
+
+    Sentences are analyzed in batches: each batch is tagged and counted as one TextDocument, and each
+    sentence is scored by VADER. Word counts, POS counts and sentiment sums are then added to the totals
+    and the batch is dropped, so memory grows with the vocabulary, not with the length of the text.
+
+    The sentiment score is the mean of the sentence scores.
+
+    Attributes:
+        batch_sentences (int): The number of sentences analyzed together.
+        word_counts (Counter): Lowercased word -> occurrences so far.
+        pos_count_array (np.ndarray): POS counts so far, indexed like pos_tagger.POS_TAGS.
+        sentences (int): The number of sentences analyzed.
+        characters (int): The number of characters analyzed.
+    """
+
+    def __init__(self, batch_sentences: int = 256):
+        """
+        Initialize the StreamingTextAnalyzer instance.
+
+        Args:
+            batch_sentences (int, optional): The number of sentences analyzed together. Default is 256.
+        """
+        self.batch_sentences = batch_sentences
+        self.word_counts = Counter()
+        self.pos_count_array = np.zeros(UNKNOWN_INDEX + 1, dtype=np.int64)
+        self.sentences = 0
+        self.characters = 0
+        self._score_sums = dict.fromkeys(SENTIMENT_KEYS, 0.0)
+
+    def _analyze_batch(self, batch: list[str]) -> None:
+        document = TextDocument(" ".join(batch))
+        self.word_counts.update(document.word_counts)
+        self.pos_count_array += document.pos_count_array
+        analyzer = get_sentiment_analyzer()
+        for sentence in batch:
+            scores = analyzer.polarity_scores(sentence)
+            for name in SENTIMENT_KEYS:
+                self._score_sums[name] += scores[name]
+        self.sentences += len(batch)
+
+    def feed(self, sentences: Iterable[str], progress: Optional[Callable[[], None]] = None) -> "StreamingTextAnalyzer":
+        """
+        Add sentences to the analysis.
+
+        Args:
+            sentences (Iterable[str]): The sentences, e.g. from text_chunker.iter_sentences.
+            progress (Optional[Callable[[], None]], optional): Called after every batch. Default is None.
+
+        Returns:
+            StreamingTextAnalyzer: The analyzer itself.
+        """
+        batch = []
+        for sentence in sentences:
+            self.characters += len(sentence)
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            batch.append(sentence)
+            if len(batch) >= self.batch_sentences:
+                self._analyze_batch(batch)
+                batch = []
+                if progress is not None:
+                    progress()
+        if batch:
+            self._analyze_batch(batch)
+            if progress is not None:
+                progress()
+        return self
+
+    def analyze_file(self, fileobj: BinaryIO, chunk_size: int = 1 << 20, encoding: str = "utf-8",
+                     progress: Optional[Callable[[], None]] = None) -> "StreamingTextAnalyzer":
+        """
+        Analyze a text file chunk by chunk.
+
+        Args:
+            fileobj (BinaryIO): The file to read.
+            chunk_size (int, optional): The number of bytes read at a time. Default is 1 MiB.
+            encoding (str, optional): The text encoding. Default is 'utf-8'.
+            progress (Optional[Callable[[], None]], optional): Called after every batch. Default is None.
+
+        Returns:
+            StreamingTextAnalyzer: The analyzer itself.
+        """
+        return self.feed(iter_sentences(iter_text_chunks(fileobj, chunk_size, encoding)), progress)
+
+    @property
+    def sentiment_score(self) -> dict:
+        """
+        dict: The mean VADER scores ('neg', 'neu', 'pos', 'compound') of the sentences.
+        """
+        if not self.sentences:
+            return dict.fromkeys(SENTIMENT_KEYS, 0.0)
+        return {name: round(total / self.sentences, 3) for name, total in self._score_sums.items()}
@@ -1,66 +1,100 @@
-import nltk
-import string
-from heapq import nlargest
+import warnings
+from collections import Counter
+from typing import Optional, Union
+import numpy as np
+from features.summarization_engine import SummarizationEngine, tokenize
+from features.text_document import TextDocument
 
 class TextSummarizer:
-    def __init__(self, text: str):
+    METHODS = SummarizationEngine.METHODS
+
+    def __init__(self, text: Union[str, TextDocument], idf: Optional[dict] = None):
         """
         Initialize the TextSummarizer object.
 
         Parameters:
-            text (str): The input text to be summarized.
+            text (Union[str, TextDocument]): The input text to be summarized or its analyzed document.
+            idf (Optional[dict]): Term -> IDF weights for the 'tfidf' and 'textrank' methods, e.g. from a Corpus.
+                By default the sentences of the text are the documents.
         """
-        self.text = text
+        self.document = TextDocument.from_input(text)
+        self.text = self.document.text
+        self.idf = idf
+        self.engine = None
         self.word_freq = {}
         self.sent_score = {}
 
-    def preprocess_text(self) -> list[str]:
-        """
-        Preprocess the input text by removing punctuation and stopwords.
+    def _get_engine(self) -> SummarizationEngine:
+        if self.engine is None:
+            self.engine = SummarizationEngine(self.document.sentences, idf=self.idf)
+        return self.engine
 
-        Returns:
-            List[str]: The preprocessed text as a list of words.
+    def calculate_word_frequencies(self, processed_text: Optional[list[str]] = None) -> dict:
         """
-        nopunc = ''.join(char for char in self.text if char not in string.punctuation)
-        processed_text = [word for word in nopunc.split() if word.lower() not in nltk.corpus.stopwords.words('english')]
-        return processed_text
+        Count the words of the text.
 
-    def calculate_word_frequencies(self, processed_text: list[str]) -> None:
-        """
-        Calculate word frequencies for each word in the processed text.
+        Deprecated: kept for existing callers; use SummarizationEngine.
 
         Parameters:
-            processed_text (List[str]): The preprocessed text as a list of words.
+            processed_text (Optional[list[str]]): The words to count, as given. Default is the content words
+                of the text, lowercased and without stopwords.
+
+        Returns:
+            dict: Word -> number of occurrences, added to self.word_freq.
         """
-        for word in processed_text:
-            self.word_freq[word] = self.word_freq.get(word, 0) + 1
+        warnings.warn("calculate_word_frequencies is deprecated, use SummarizationEngine", DeprecationWarning,
+                      stacklevel=2)
+        if processed_text is None:
+            engine = self._get_engine()
+            counts = np.asarray(engine.matrix.sum(axis=1)).ravel()
+            processed_text = {term: int(counts[index]) for term, index in engine.vocabulary.items()}
+        else:
+            processed_text = Counter(processed_text)
+        for word, count in processed_text.items():
+            self.word_freq[word] = self.word_freq.get(word, 0) + count
+        return self.word_freq
 
-    def calculate_sentence_scores(self, sent_list: list[str]) -> None:
+    def calculate_sentence_scores(self, sent_list: Optional[list[str]] = None, method: str = 'frequency') -> dict:
         """
-        Calculate sentence scores based on the word frequencies.
+        Score sentences.
+
+        Deprecated: kept for existing callers; use SummarizationEngine.score.
+
+        With the 'frequency' method and word frequencies from calculate_word_frequencies, a sentence scores
+        the sum of the frequencies of its words. Otherwise the sentences are scored by a SummarizationEngine.
 
         Parameters:
-            sent_list (List[str]): List of sentences in the text.
+            sent_list (Optional[list[str]]): The sentences to score. Default is the sentences of the text.
+            method (str): The sentence scoring method, one of SummarizationEngine.METHODS (default is 'frequency').
+
+        Returns:
+            dict: Sentence -> score, for sentences scoring above zero, added to self.sent_score.
         """
-        for sent in sent_list:
-            for word in nltk.word_tokenize(sent.lower()):
-                if word in self.word_freq:
-                    self.sent_score[sent] = self.sent_score.get(sent, 0) + self.word_freq[word]
+        warnings.warn("calculate_sentence_scores is deprecated, use SummarizationEngine", DeprecationWarning,
+                      stacklevel=2)
+        if method == 'frequency' and self.word_freq:
+            sentences = self.document.sentences if sent_list is None else sent_list
+            scores = [sum(self.word_freq.get(word, 0) for word in tokenize(sentence)) for sentence in sentences]
+        else:
+            engine = self._get_engine() if sent_list is None else SummarizationEngine(sent_list, idf=self.idf)
+            sentences, scores = engine.sentences, engine.score(method)
+        for sentence, score in zip(sentences, scores):
+            if score > 0:
+                self.sent_score[sentence] = float(score)
+        return self.sent_score
 
-    def summarize_text(self, length: int = 1) -> str:
+    def summarize_text(self, length: int = 1, method: str = 'frequency') -> str:
         """
         Summarize the input text.
 
         Parameters:
             length (int): The number of sentences in the summary (default is 1).
+            method (str): The sentence scoring method, one of SummarizationEngine.METHODS (default is 'frequency').
 
         Returns:
             str: The summary of the input text.
         """
-        sent_list = nltk.sent_tokenize(self.text)
-        processed_text = self.preprocess_text()
-        self.calculate_word_frequencies(processed_text)
-        self.calculate_sentence_scores(sent_list)
-        summary_sents = nlargest(length, self.sent_score, key=self.sent_score.get)
+        sent_list = self.document.sentences
+        summary_sents = [sent_list[index] for index in self._get_engine().rank(length, method)]
         summary = ' '.join(summary_sents)
         return summary
@@ -0,0 +1,339 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from features.cache import DiskCache, LRUCache, content_hash
+from features.text_chunker import chunk_text
+
+
+class GoogleTranslatorBackend:
+    """
+    Translation backend calling Google Translate through deep_translator.
+
+    Attributes:
+        max_chars (int): The longest text accepted in a single request.
+    """
+
+    max_chars = 5000
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        """
+        Translate text with Google Translate.
+
+        Args:
+            text (str): The text to translate.
+            source (str): The source language code, or 'auto'.
+            target (str): The target language code.
+
+        Returns:
+            str: The translated text.
+        """
+        from deep_translator import GoogleTranslator
+
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+
+GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+
+
+class HttpTranslatorBackend:
+    """
+    Translation backend calling the Google Translate mobile page over a pooled keep-alive HTTP session.
+
+    It sends the same request as deep_translator's GoogleTranslator, but reuses connections across calls
+    and threads instead of opening a new one per request.
+
+    Attributes:
+        base_url (str): The translate page URL, e.g. a local stub server for offline measurements.
+        pool_size (int): The number of connections kept open.
+        timeout (float): Seconds to wait for the server.
+        max_chars (int): The longest text accepted in a single request.
+    """
+
+    max_chars = 5000
+
+    def __init__(self, base_url: str = GOOGLE_TRANSLATE_URL, pool_size: int = 16, timeout: float = 10.0):
+        """
+        Initialize the HttpTranslatorBackend instance.
+
+        Args:
+            base_url (str, optional): The translate page URL. Default is the Google Translate mobile page.
+            pool_size (int, optional): The number of connections kept open. Default is 16.
+            timeout (float, optional): Seconds to wait for the server. Default is 10.0.
+        """
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        requests.Session: The shared session, created on first use.
+        """
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        """
+        Translate text with Google Translate.
+
+        Args:
+            text (str): The text to translate.
+            source (str): The source language code, or 'auto'.
+            target (str): The target language code.
+
+        Returns:
+            str: The translated text.
+
+        Raises:
+            requests.HTTPError: If the server answers with an error status.
+            ValueError: If the text is too long or the page holds no translation.
+        """
+        from bs4 import BeautifulSoup
+
+        if len(text) > self.max_chars:
+            raise ValueError("Text longer than {} characters".format(self.max_chars))
+        text = text.strip()
+        if not text or source == target:
+            return text
+        response = self.session.get(self.base_url, params={"tl": target, "sl": source, "q": text},
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, "html.parser")
+        element = soup.find("div", {"class": "result-container"}) or soup.find("div", {"class": "t0"})
+        if element is None:
+            raise ValueError("No translation found in the response")
+        return element.get_text(strip=True)
+
+
+class EchoTranslatorBackend:
+    """
+    Local stand-in translation backend that returns the text unchanged, for tests and offline runs.
+
+    Attributes:
+        delay (float): Seconds to sleep per call, to simulate network latency.
+        calls (int): The number of translate calls made.
+        max_chars (int): The longest text accepted in a single request.
+    """
+
+    max_chars = 5000
+
+    def __init__(self, delay: float = 0.0):
+        """
+        Initialize the EchoTranslatorBackend instance.
+
+        Args:
+            delay (float, optional): Seconds to sleep per call. Default is 0.0.
+        """
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        """
+        Return the text unchanged.
+
+        Args:
+            text (str): The text to translate.
+            source (str): The source language code, or 'auto'.
+            target (str): The target language code.
+
+        Returns:
+            str: The same text.
+        """
+        with self._lock:
+            self.calls += 1
+        if len(text) > self.max_chars:
+            raise ValueError("Text longer than {} characters".format(self.max_chars))
+        if self.delay:
+            time.sleep(self.delay)
+        return text
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache keyed by a hash of the source text and the language pair.
+
+    Lookups go through a memory LRU tier first and then an optional on-disk tier; disk hits are
+    promoted to memory.
+
+    Attributes:
+        memory (LRUCache): The in-memory tier.
+        disk (Optional[DiskCache]): The on-disk tier, or None when disabled.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024,
+                 disk_dir: Optional[str] = None, disk_max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the TranslationCache instance.
+
+        Args:
+            max_entries (int, optional): The maximum number of translations kept in memory. Default is 1024.
+            max_bytes (int, optional): The memory tier size budget. Default is 32 MiB.
+            disk_dir (Optional[str], optional): Directory of the on-disk tier, or None to disable it.
+            disk_max_bytes (int, optional): The on-disk tier size budget. Default is 256 MiB.
+        """
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.disk = DiskCache(disk_dir, disk_max_bytes) if disk_dir else None
+
+    @staticmethod
+    def make_key(text: str, source: str, target: str) -> str:
+        """
+        Build the cache key of a translation.
+
+        Args:
+            text (str): The source text.
+            source (str): The source language code.
+            target (str): The target language code.
+
+        Returns:
+            str: The content-addressed key.
+        """
+        return content_hash("translation", source, target, text)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a translation in the memory tier, then the disk tier.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[str]: The cached translation, or None on a miss.
+        """
+        translated = self.memory.get(key)
+        if translated is not None or self.disk is None:
+            return translated
+        data = self.disk.get(key)
+        if data is None:
+            return None
+        translated = data.decode("utf-8")
+        self.memory.put(key, translated)
+        return translated
+
+    def put(self, key: str, translated: str) -> None:
+        """
+        Store a translation in every tier.
+
+        Args:
+            key (str): The cache key.
+            translated (str): The translated text.
+        """
+        self.memory.put(key, translated)
+        if self.disk is not None:
+            self.disk.put(key, translated.encode("utf-8"))
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Hit, miss and eviction counters per tier.
+        """
+        stats = {"memory": self.memory.stats.as_dict()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats.as_dict()
+        return stats
+
+
+class CachedTranslator:
+    """
+    Translator that serves repeated texts from a TranslationCache and calls the backend only on a miss.
+
+    Attributes:
+        backend: Object with a translate(text, source, target) method.
+        cache (TranslationCache): The translation cache.
+        source (str): The source language code.
+        target (str): The target language code.
+    """
+
+    def __init__(self, backend=None, cache: Optional[TranslationCache] = None,
+                 source: str = 'auto', target: str = 'en'):
+        """
+        Initialize the CachedTranslator instance.
+
+        Args:
+            backend (optional): The translation backend. Default is GoogleTranslatorBackend.
+            cache (Optional[TranslationCache], optional): The cache to use. Default is a memory-only cache.
+            source (str, optional): The source language code. Default is 'auto'.
+            target (str, optional): The target language code. Default is 'en'.
+        """
+        self.backend = backend if backend is not None else GoogleTranslatorBackend()
+        self.cache = cache if cache is not None else TranslationCache()
+        self.source = source
+        self.target = target
+
+    def translate(self, text: str) -> str:
+        """
+        Translate text, using the cached translation when there is one.
+
+        Args:
+            text (str): The text to translate.
+
+        Returns:
+            str: The translated text.
+        """
+        key = TranslationCache.make_key(text, self.source, self.target)
+        translated = self.cache.get(key)
+        if translated is None:
+            translated = self.backend.translate(text, self.source, self.target)
+            if translated is not None:
+                self.cache.put(key, translated)
+        return translated
+
+    def translate_many(self, texts: list[str], max_workers: int = 4) -> list[str]:
+        """
+        Translate several texts, each through the cache, with the misses sent to the backend concurrently.
+
+        Args:
+            texts (list[str]): The texts to translate.
+            max_workers (int, optional): The maximum number of concurrent backend requests. Default is 4.
+
+        Returns:
+            list[str]: The translated texts, in the order of texts.
+        """
+        if len(texts) <= 1:
+            return [self.translate(text) for text in texts]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+            return list(executor.map(self.translate, texts))
+
+    def translate_chunked(self, text: str, max_workers: int = 4) -> str:
+        """
+        Translate text of any length by splitting it on sentence boundaries into chunks under the backend limit.
+
+        Chunks are translated concurrently on a bounded thread pool, each through the cache, and reassembled
+        in their original order with the original whitespace between them.
+
+        Args:
+            text (str): The text to translate.
+            max_workers (int, optional): The maximum number of concurrent backend requests. Default is 4.
+
+        Returns:
+            str: The translated text.
+        """
+        max_chars = getattr(self.backend, "max_chars", 5000)
+        if len(text) <= max_chars:
+            return self.translate(text)
+
+        chunks = chunk_text(text, max_chars)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            translated = list(executor.map(self._translate_chunk, chunks))
+        return "".join(translated)
+
+    def _translate_chunk(self, chunk: str) -> str:
+        stripped = chunk.strip()
+        if not stripped:
+            return chunk
+        leading = chunk[:len(chunk) - len(chunk.lstrip())]
+        trailing = chunk[len(chunk.rstrip()):]
+        translated = self.translate(stripped)
+        return leading + (translated if translated is not None else stripped) + trailing
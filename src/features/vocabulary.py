@@ -0,0 +1,69 @@
+import sys
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Word counts stored as parallel arrays sorted by frequency.
+
+    Words are interned and kept in an object array next to an int64 count array, both in ascending
+    count order. Every threshold query is a binary search returning views of the arrays, so moving the
+    word count slider costs O(log n) no matter how many distinct words the text has.
+
+    Attributes:
+        words (np.ndarray): The words, least frequent first.
+        counts (np.ndarray): The number of occurrences of each word, ascending.
+    """
+
+    def __init__(self, words: np.ndarray, counts: np.ndarray):
+        """
+        Initialize the Vocabulary instance.
+
+        Args:
+            words (np.ndarray): The words, in the same order as counts.
+            counts (np.ndarray): The counts, in ascending order.
+        """
+        self.words = words
+        self.counts = counts
+
+    @staticmethod
+    def from_counts(word_counts: dict) -> "Vocabulary":
+        """
+        Build a vocabulary from a word -> count mapping.
+
+        Words with equal counts keep their order in the mapping.
+
+        Args:
+            word_counts (dict): Word -> number of occurrences.
+
+        Returns:
+            Vocabulary: The vocabulary.
+        """
+        words = np.fromiter((sys.intern(str(word)) for word in word_counts), dtype=object, count=len(word_counts))
+        counts = np.fromiter(word_counts.values(), dtype=np.int64, count=len(word_counts))
+        # Stable sort on the negated counts, reversed, so equal counts read in mapping order from the top.
+        order = np.argsort(-counts, kind="stable")[::-1]
+        return Vocabulary(words[order], counts[order])
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def max_count(self) -> int:
+        """
+        int: The highest count, or 0 for an empty vocabulary.
+        """
+        return int(self.counts[-1]) if len(self.counts) else 0
+
+    def above(self, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the words occurring at least threshold times, most frequent first.
+
+        Args:
+            threshold (int): The minimum number of occurrences.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Views of the words and their counts.
+        """
+        start = np.searchsorted(self.counts, threshold, side="left")
+        return self.words[start:][::-1], self.counts[start:][::-1]
@@ -1,46 +1,103 @@
-from wordcloud import WordCloud
+import json
+from io import BytesIO
+from typing import Union
+from wordcloud import STOPWORDS, WordCloud
+from features.cache import LRUCache, content_hash
+from features.text_document import TextDocument
 from features.word_processor import WordProcessor
 
+# Rendered PNG images keyed by (word counts hash, background, size).
+_PNG_CACHE = LRUCache(max_entries=64, max_bytes=32 * 1024 * 1024)
+
+
 class WordCloudGenerator:
     """
     A class to generate word clouds from input text.
 
+    Words are weighted by their number of occurrences in the text; common English stopwords are left out.
+
     Attributes:
-        input_text (str): The input text for word cloud generation.
+        input_text (Union[str, TextDocument]): The input text for word cloud generation or its analyzed document.
         background_theme (str): The background theme for the word cloud.
     """
 
-    def __init__(self, input_text: str, background_theme: str):
+    def __init__(self, input_text: Union[str, TextDocument], background_theme: str):
         """
         Initializes the WordCloudGenerator instance.
 
         Args:
-            input_text (str): The input text for word cloud generation.
+            input_text (Union[str, TextDocument]): The input text for word cloud generation or its analyzed document.
             background_theme (str): The background theme for the word cloud.
         """
         self.input_text = input_text
         self.background_theme = background_theme
         self.processor = WordProcessor(self.input_text)
 
-    def word_cloud_from_input(self) -> WordCloud:
+    def word_frequencies(self) -> dict:
+        """
+        Get the word counts used to weight the word cloud.
+
+        Returns:
+            dict: Word -> number of occurrences, without stopwords.
+        """
+        words_count = self.processor.process_input_text_blob()
+        return {word: count for word, count in words_count.items() if word not in STOPWORDS}
+
+    def word_cloud_from_input(self, width: int = 400, height: int = 200) -> WordCloud:
         """
         Generates a word cloud using the input text.
 
+        Args:
+            width (int, optional): The image width in pixels. Default is 400.
+            height (int, optional): The image height in pixels. Default is 200.
+
         Returns:
             WordCloud: The generated word cloud.
+
+        Raises:
+            ValueError: If the text has no words to draw.
         """
-        words_count = self.processor.process_input_text_blob()
-        words = list(words_count.keys())
+        frequencies = self.word_frequencies()
 
         # Set the background color for the word cloud
         background_color = self.background_theme if self.background_theme != "Default" else "#0E1117"
 
         wordcloud = WordCloud(
+            width=width,
+            height=height,
             background_color=background_color,
             contour_width=1,
             max_font_size=128,
-            max_words=len(words),
+            max_words=len(frequencies),
             collocations=False,
-        ).generate(" ".join(words))
+        ).generate_from_frequencies(frequencies)
 
         return wordcloud
+
+    def render_png(self, width: int = 800, height: int = 400) -> bytes:
+        """
+        Render the word cloud to PNG bytes without going through pyplot.
+
+        Images are cached by (word counts, background, size), so changing only the background re-renders
+        from the same counts and repeating a request costs nothing.
+
+        Args:
+            width (int, optional): The image width in pixels. Default is 800.
+            height (int, optional): The image height in pixels. Default is 400.
+
+        Returns:
+            bytes: The PNG image.
+
+        Raises:
+            ValueError: If the text has no words to draw.
+        """
+        frequencies = self.word_frequencies()
+        key = content_hash("wordcloud", json.dumps(frequencies, sort_keys=True), self.background_theme, width, height)
+        png = _PNG_CACHE.get(key)
+        if png is None:
+            image = self.word_cloud_from_input(width, height).to_image()
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            png = buffer.getvalue()
+            _PNG_CACHE.put(key, png)
+        return png
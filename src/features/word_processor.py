@@ -1,21 +1,24 @@
 import pandas as pd
 import streamlit as st
-from textblob import TextBlob
+from typing import Union
+from features.text_document import TextDocument
+from features.vocabulary import Vocabulary
 
 class WordProcessor:
     """
     Class to process text using TextBlob and display a bar chart of word appearances.
     """
 
-    def __init__(self, input_text: str):
+    def __init__(self, input_text: Union[str, TextDocument]):
         """
         Initialize the WordProcessor instance.
 
         Parameters:
-            input_text (str): The input text to process.
+            input_text (Union[str, TextDocument]): The input text to process or its analyzed document.
         """
-        self.input_text = input_text
-        self.blob = TextBlob(self.input_text)
+        self.document = TextDocument.from_input(input_text)
+        self.input_text = self.document.text
+        self.blob = self.document.blob
 
     def process_input_text_blob(self) -> dict:
         """
@@ -24,28 +27,35 @@ class WordProcessor:
         Returns:
             dict: A dictionary containing word counts.
         """
-        if not self.input_text.strip():
-            return {}
-        self.blob = TextBlob(self.input_text)
-        word_counts = self.blob.word_counts
-        return word_counts
+        return self.document.word_counts
 
-    def generate_bar_chart(self, word_counts: dict) -> None:
+    def vocabulary(self) -> Vocabulary:
+        """
+        Get the word counts as a vocabulary sorted by frequency, for fast threshold filtering.
+
+        Returns:
+            Vocabulary: The word counts of the input text.
+        """
+        return Vocabulary.from_counts(self.document.word_counts)
+
+    def generate_bar_chart(self, word_counts: Union[dict, Vocabulary]) -> None:
         """
         Generate and display a bar chart of word appearances.
 
+        The threshold slider is answered by a binary search on the vocabulary and the chart data is built
+        from its arrays, so passing a memoized Vocabulary keeps the slider fast for large texts.
+
         Parameters:
-            word_counts (dict): A dictionary containing word counts.
+            word_counts (Union[dict, Vocabulary]): A dictionary containing word counts, or their vocabulary.
         """
-        counts = list(word_counts.values())
+        vocabulary = word_counts if isinstance(word_counts, Vocabulary) else Vocabulary.from_counts(word_counts)
 
-        max_count = max(counts)
-        threshold = st.slider('Show values above:', 1, max_count)
+        if not len(vocabulary):
+            st.write("No data available")
+            return
 
-        if threshold:
-            filtered_data = [(word, count) for word, count in word_counts.items() if count >= threshold]
-        else:
-            filtered_data = list(word_counts.items())
+        threshold = st.slider('Show values above:', 1, max(vocabulary.max_count, 2))
 
-        data = pd.DataFrame(filtered_data, columns=['Words', 'Number of Appearances'])
+        words, counts = vocabulary.above(threshold)
+        data = pd.DataFrame({'Words': words, 'Number of Appearances': counts})
         st.bar_chart(data.set_index('Words'))
@@ -0,0 +1,63 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from features.audio_preprocessor import PreprocessedStream, parse_wav_header, preprocess_wav
+
+
+def make_wav(seconds=2.0, rate=44100, channels=2):
+    t = np.arange(int(seconds * rate)) / rate
+    signal = (np.sin(2 * np.pi * 220 * t) * 8000 * (t > seconds / 4)).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(signal, channels).tobytes())
+    return buffer.getvalue()
+
+
+def test_truncated_header_raises_wave_error():
+    data = make_wav()
+    for length in range(0, 44):
+        with pytest.raises(wave.Error):
+            parse_wav_header(data[:length])
+
+
+def test_zero_format_fields_raise_wave_error():
+    data = make_wav()
+    # channels, sample rate and bits per sample of the fmt chunk
+    for offset, size in ((22, 2), (24, 4), (34, 2)):
+        header = data[:offset] + bytes(size) + data[offset + size:]
+        with pytest.raises(wave.Error):
+            parse_wav_header(header)
+        with pytest.raises(wave.Error):
+            preprocess_wav(io.BytesIO(header))
+
+
+def test_preprocess_resamples_to_mono_16k():
+    audio = preprocess_wav(io.BytesIO(make_wav()), trim_silence=False)
+    assert audio.sample_rate == 16000
+    assert audio.original_channels == 2
+    assert len(audio.frame_data) == 2 * 32000
+
+
+def test_stream_segments_match_whole_file():
+    data = make_wav(seconds=5.0)
+    whole = preprocess_wav(io.BytesIO(data), trim_silence=False)
+    stream = PreprocessedStream(io.BytesIO(data), block_s=0.7)
+    streamed = b"".join(segment.frame_data for segment in stream.segments())
+    assert streamed and streamed in whole.frame_data
+    assert stream.report()["bytes"] == len(streamed)
+
+
+def test_stream_keeps_silence_unless_trimming():
+    data = make_wav(seconds=5.0)
+    whole = preprocess_wav(io.BytesIO(data), trim_silence=False)
+    trimmed = PreprocessedStream(io.BytesIO(data), block_s=0.7)
+    kept = PreprocessedStream(io.BytesIO(data), trim_silence=False, block_s=0.7)
+    trimmed_data = b"".join(segment.frame_data for segment in trimmed.segments(max_segment_s=0.5))
+    assert trimmed_data and len(trimmed_data) < len(whole.frame_data)
+    assert b"".join(segment.frame_data for segment in kept.segments(max_segment_s=0.5)) == whole.frame_data
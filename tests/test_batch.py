@@ -0,0 +1,26 @@
+import io
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import batch
+
+
+def test_analyze_audio_document_reports_preprocessing(tmp_path):
+    rate = 22050
+    t = np.arange(2 * rate) / rate
+    signal = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    path = tmp_path / "speech.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(signal.tobytes())
+
+    record = batch.analyze_document(str(path), translate=False, offline=True)
+    assert "AttributeError" not in record.get("error", "")
+    assert record["audio"]["bytes"] == 2 * 16000 * 2
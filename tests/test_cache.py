@@ -0,0 +1,54 @@
+from features.cache import DiskCache, LRUCache, content_hash
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("a", b"b") == content_hash("a", "b")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_lru_byte_budget():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.put("c", b"1")
+    assert "a" not in cache and cache.total_bytes == 6
+    cache.put("big", b"x" * 11)
+    assert "big" not in cache
+
+
+def test_lru_replacing_a_key_updates_its_size():
+    cache = LRUCache(max_bytes=100)
+    cache.put("a", b"x" * 50)
+    cache.put("a", b"x" * 10)
+    assert cache.total_bytes == 10 and len(cache) == 1
+
+
+def test_disk_cache_round_trip_and_persistence(tmp_path):
+    key = content_hash("value")
+    DiskCache(str(tmp_path)).put(key, b"data")
+    reopened = DiskCache(str(tmp_path))
+    assert reopened.get(key) == b"data"
+    assert reopened.total_bytes == 4
+    assert reopened.get(content_hash("missing")) is None
+    assert reopened.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_disk_cache_evicts_to_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=25)
+    keys = [content_hash(number) for number in range(5)]
+    for key in keys:
+        cache.put(key, b"x" * 10)
+    assert cache.total_bytes <= 25
+    assert cache.get(keys[-1]) == b"x" * 10
+    assert cache.stats.evictions == 3
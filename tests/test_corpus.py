@@ -0,0 +1,75 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from features.corpus import Corpus
+from features.text_analyzer import TextAnalyzer
+from features.text_document import TextDocument
+
+
+def document(text):
+    # Precomputed analyses, so the tests do not depend on the NLTK tokenizer data.
+    words = text.lower().split()
+    return TextDocument.from_precomputed(text, word_counts=dict(Counter(words)),
+                                         tags=[(word, "NN" if len(word) > 3 else "DT") for word in words])
+
+
+DOCUMENTS = {
+    "a.txt": "the cat sat on the mat the cat",
+    "b.txt": "a dog and a cat",
+    "c.txt": "the dog barked",
+}
+
+
+@pytest.fixture
+def corpus():
+    corpus = Corpus()
+    for name, text in DOCUMENTS.items():
+        corpus.add_document(name, document(text))
+    return corpus
+
+
+def test_inverted_index_matches_word_counts(corpus):
+    for term in ("the", "cat", "dog", "mat"):
+        expected = [(name, text.split().count(term)) for name, text in DOCUMENTS.items() if term in text.split()]
+        expected.sort(key=lambda pair: -pair[1])
+        assert corpus.documents_containing(term) == expected
+    assert corpus.documents_containing("CAT") == corpus.documents_containing("cat")
+    assert corpus.documents_containing("bird") == []
+
+
+def test_top_terms(corpus):
+    assert corpus.top_terms(2) == [("the", 4, 2), ("cat", 3, 2)]
+    assert corpus.top_terms(1, by_documents=True)[0][2] == 2
+    assert len(corpus.top_terms(100)) == len(corpus.terms)
+
+
+def test_index_is_rebuilt_after_adding(corpus):
+    assert corpus.documents_containing("mat") == [("a.txt", 1)]
+    corpus.add_document("d.txt", document("mat mat"))
+    assert corpus.documents_containing("mat") == [("d.txt", 2), ("a.txt", 1)]
+    assert corpus.matrix.shape == (4, len(corpus.terms))
+
+
+def test_duplicate_name_is_rejected(corpus):
+    with pytest.raises(ValueError):
+        corpus.add_document("a.txt", document("other text"))
+    assert len(corpus) == 3
+
+
+def test_idf_and_per_document_results(corpus):
+    idf = corpus.idf()
+    assert idf["mat"] > idf["cat"]
+    assert idf["cat"] == pytest.approx(np.log(4 / 3) + 1)
+    assert set(corpus.sentiment("a.txt")) == {"neg", "neu", "pos", "compound"}
+    assert corpus.sentiment_scores().shape == (3, 4)
+    assert corpus.pos_counts("c.txt") == TextAnalyzer.name_pos_counts(document(DOCUMENTS["c.txt"]).pos_count_array)
+    total = corpus.pos_counts()
+    assert sum(total.values()) == sum(len(text.split()) for text in DOCUMENTS.values())
+
+
+def test_empty_corpus():
+    corpus = Corpus()
+    assert corpus.top_terms() == []
+    assert corpus.sentiment_scores().shape == (0, 4)
@@ -0,0 +1,65 @@
+from collections import Counter
+
+import pytest
+
+import features.incremental_analyzer as incremental_analyzer
+from features.incremental_analyzer import IncrementalAnalyzer
+from features.translation_cache import CachedTranslator, EchoTranslatorBackend
+
+
+class FakeDocument:
+    # Whitespace tokens, so the tests do not depend on the NLTK tagger data.
+    def __init__(self, text):
+        words = text.lower().split()
+        self.tags = [(word, "NN") for word in words]
+        self.word_counts = Counter(words)
+
+
+class FlakyBackend(EchoTranslatorBackend):
+    def __init__(self):
+        super().__init__()
+        self.failures = 0
+
+    def translate(self, text, source, target):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("translation service unavailable")
+        return super().translate(text, source, target)
+
+
+@pytest.fixture(autouse=True)
+def fake_document(monkeypatch):
+    monkeypatch.setattr(incremental_analyzer, "TextDocument", FakeDocument)
+
+
+def assert_matches_fresh_analysis(analyzer, text):
+    fresh = IncrementalAnalyzer(CachedTranslator(EchoTranslatorBackend()))
+    fresh.update(text)
+    assert analyzer.word_counts == fresh.word_counts
+    assert analyzer.pos_counts == fresh.pos_counts
+    assert analyzer.translation == fresh.translation
+    # Running sums may differ from a fresh sum in the last rounded digit.
+    assert analyzer.sentiment_score == pytest.approx(fresh.sentiment_score, abs=2e-3)
+
+
+def test_updates_match_a_fresh_analysis():
+    analyzer = IncrementalAnalyzer(CachedTranslator(EchoTranslatorBackend()))
+    assert analyzer.update("One good day. Two bad days. One good day.")["added"] == 2
+    stats = analyzer.update("One good day. Three happy cats.")
+    assert stats == {"added": 1, "removed": 2, "reused": 1}
+    assert_matches_fresh_analysis(analyzer, "One good day. Three happy cats.")
+
+
+def test_failed_translation_leaves_the_state_intact():
+    backend = FlakyBackend()
+    analyzer = IncrementalAnalyzer(CachedTranslator(backend))
+    analyzer.update("One good day. Two bad days.")
+    before = (Counter(analyzer.word_counts), analyzer.sentiment_score, analyzer.translation)
+
+    backend.failures = 1
+    with pytest.raises(OSError):
+        analyzer.update("Two bad days. Four new words.")
+    assert (analyzer.word_counts, analyzer.sentiment_score, analyzer.translation) == before
+
+    analyzer.update("Two bad days. Four new words.")
+    assert_matches_fresh_analysis(analyzer, "Two bad days. Four new words.")
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from features.network_service import NetworkService, is_transient
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError("{} error".format(status), response=response)
+
+
+@pytest.fixture
+def service():
+    service = NetworkService(timeout=0.2, retries=2, backoff=0.0)
+    yield service
+    service.close()
+
+
+def failing(error, calls):
+    def fn():
+        calls.append(1)
+        raise error
+    return fn
+
+
+def test_is_transient():
+    assert is_transient(http_error(503))
+    assert not is_transient(http_error(400))
+    assert not is_transient(http_error(429))
+    assert is_transient(requests.ConnectionError("refused"))
+    assert is_transient(requests.Timeout("slow"))
+    assert not is_transient(requests.exceptions.InvalidURL("bad url"))
+
+
+@pytest.mark.parametrize("error, attempts", [(http_error(403), 1), (http_error(429), 1), (http_error(502), 3),
+                                             (requests.ConnectionError("refused"), 3)])
+def test_only_transient_errors_are_retried(service, error, attempts):
+    calls = []
+    with pytest.raises(type(error)):
+        service.call("translation", None, failing(error, calls))
+    assert len(calls) == attempts
+
+
+def test_composite_stage_has_no_timeout_or_retries(service):
+    assert service.call("translation.document", None, lambda: time.sleep(0.4) or "done") == "done"
+    calls = []
+    with pytest.raises(requests.ConnectionError):
+        service.call("translation.document", None, failing(requests.ConnectionError("refused"), calls))
+    assert len(calls) == 1
+    stats = service.stats()["translation.document"]
+    assert stats["timeouts"] == 0 and stats["retries"] == 0
+
+
+def test_other_stages_time_out(service):
+    with pytest.raises(asyncio.TimeoutError):
+        service.call("translation", None, lambda: time.sleep(0.4))
+    assert service.stats()["translation"]["timeouts"] == 3
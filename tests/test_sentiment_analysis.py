@@ -0,0 +1,36 @@
+import random
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE
+from features.sentiment_analysis import SentimentAnalysis, get_sentiment_analyzer
+
+
+def polarity_buckets(words):
+    # The per-word classification categorize_vocabulary replaced.
+    analyzer = get_sentiment_analyzer()
+    negatives, neutrals, positives = [], [], []
+    for word in words:
+        scores = analyzer.polarity_scores(word)
+        if scores['neg'] == 1.0:
+            negatives.append(word)
+        elif scores['neu'] == 1.0:
+            neutrals.append(word)
+        elif scores['pos'] == 1.0:
+            positives.append(word)
+    return negatives, neutrals, positives
+
+
+def test_lexicon_sample_matches_polarity_scores():
+    lexicon = sorted(get_sentiment_analyzer().lexicon)
+    words = random.Random(0).sample(lexicon, 2000)
+    words += [word.upper() for word in words[:200]] + [word.capitalize() for word in words[200:400]]
+    assert SentimentAnalysis.categorize_vocabulary(words) == polarity_buckets(words)
+
+
+def test_boosters_and_negations_match_polarity_scores():
+    words = sorted(BOOSTER_DICT) + sorted(NEGATE) + ["NOT", "Never", "very", "Extremely", "kind", "like"]
+    assert SentimentAnalysis.categorize_vocabulary(words) == polarity_buckets(words)
+
+
+def test_other_tokens_match_polarity_scores():
+    words = ["good!", "bad?", ":)", ":(", "😀", "💔", "ok", "no", "a", "--", "l0ve", "happy-go-lucky",
+             "don't", "can't", "the", "xyzzy", "123", ""]
+    assert SentimentAnalysis.categorize_vocabulary(words) == polarity_buckets(words)
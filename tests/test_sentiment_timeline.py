@@ -0,0 +1,43 @@
+import numpy as np
+
+from features.sentiment_timeline import SentimentTimeline, rolling_mean
+from features.text_document import TextDocument
+
+SENTENCES = ["I love this wonderful day.", "This is terrible and awful.", "The table is brown.",
+             "What a great success!", "I hate the rain."]
+
+
+def timeline(sentences):
+    return SentimentTimeline(TextDocument.from_precomputed(" ".join(sentences), sentences=sentences))
+
+
+def test_extremes_never_overlap():
+    for count in range(len(SENTENCES) + 1):
+        most_negative, most_positive = timeline(SENTENCES[:count]).extremes(3)
+        negative = [sentence for sentence, _ in most_negative]
+        positive = [sentence for sentence, _ in most_positive]
+        assert len(negative) == len(positive) == min(3, count // 2)
+        assert not set(negative) & set(positive)
+
+
+def test_extremes_never_overlap_on_ties():
+    sentences = ["The table is brown.", "The door is open.", "The car is red.", "The sky is blue."]
+    most_negative, most_positive = timeline(sentences).extremes(2)
+    negative = [sentence for sentence, _ in most_negative]
+    positive = [sentence for sentence, _ in most_positive]
+    assert len(negative) == len(positive) == 2
+    assert not set(negative) & set(positive)
+
+
+def test_extremes_are_ranked():
+    most_negative, most_positive = timeline(SENTENCES).extremes(2)
+    assert [score for _, score in most_negative] == sorted(score for _, score in most_negative)
+    assert [score for _, score in most_positive] == sorted((score for _, score in most_positive), reverse=True)
+    assert max(score for _, score in most_negative) < min(score for _, score in most_positive)
+
+
+def test_rolling_mean_matches_loop():
+    values = np.random.default_rng(0).normal(size=50)
+    for window in (1, 3, 7):
+        expected = [values[max(0, end - window + 1):end + 1].mean() for end in range(len(values))]
+        np.testing.assert_allclose(rolling_mean(values, window), expected)
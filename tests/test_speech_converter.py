@@ -0,0 +1,23 @@
+from features.cache import LRUCache
+from features.speech_converter import SpeechConverter, StubSpeechBackend
+
+
+def test_long_text_is_synthesized_by_chunk_and_cached():
+    backend = StubSpeechBackend()
+    cache = LRUCache(max_entries=8)
+    text = "First sentence here. " * 20
+    audio = SpeechConverter(text, backend=backend, cache=cache).convert_to_speech().getvalue()
+    assert audio.replace(b" ", b"") == text.encode("utf-8").replace(b" ", b"")
+    calls = backend.calls
+    assert calls > 1
+    assert SpeechConverter(text, backend=backend, cache=cache).convert_to_speech().getvalue() == audio
+    assert backend.calls == calls
+
+
+def test_empty_text_is_never_synthesized_or_cached():
+    backend = StubSpeechBackend()
+    cache = LRUCache(max_entries=8)
+    for text in ("", "   \n\t", None):
+        assert SpeechConverter(text, backend=backend, cache=cache).convert_to_speech().getvalue() == b""
+    assert backend.calls == 0
+    assert len(cache) == 0
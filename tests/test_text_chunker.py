@@ -0,0 +1,29 @@
+from features.text_chunker import chunk_text, iter_sentences, split_sentences
+
+TEXT = ("First sentence. Second one!  Third? \"Quoted.\" Then a line\nbreak and "
+        + "a very long sentence without any stop " * 20 + "end.")
+
+
+def test_split_sentences_is_lossless():
+    sentences = split_sentences(TEXT)
+    assert "".join(sentences) == TEXT
+    assert sentences[:3] == ["First sentence. ", "Second one!  ", "Third? "]
+
+
+def test_chunk_text_is_lossless_and_bounded():
+    for max_chars in (1, 7, 40, 100, 5000):
+        chunks = chunk_text(TEXT, max_chars)
+        assert "".join(chunks) == TEXT
+        assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+
+
+def test_chunk_text_keeps_short_sentences_together():
+    assert chunk_text("One. Two. Three.", 100) == ["One. Two. Three."]
+    assert chunk_text("", 100) == []
+
+
+def test_iter_sentences_ignores_chunk_boundaries():
+    expected = split_sentences(TEXT)
+    for size in (1, 3, 17, 64):
+        chunks = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+        assert list(iter_sentences(chunks)) == expected
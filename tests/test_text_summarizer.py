@@ -0,0 +1,43 @@
+import pytest
+
+import features.summarization_engine as summarization_engine
+from features.text_document import TextDocument
+from features.text_summarizer import TextSummarizer
+
+SENTENCES = ["Cats purr loudly.", "Dogs bark at the cats.", "Birds sing."]
+
+
+@pytest.fixture(autouse=True)
+def stopwords(monkeypatch):
+    # A fixed list, so the tests do not depend on the NLTK stopwords corpus.
+    monkeypatch.setattr(summarization_engine, "get_stopwords", lambda: frozenset({"at", "the"}))
+
+
+def summarizer():
+    return TextSummarizer(TextDocument.from_precomputed(" ".join(SENTENCES), sentences=SENTENCES))
+
+
+def test_word_frequencies_count_the_given_words():
+    with pytest.deprecated_call():
+        assert summarizer().calculate_word_frequencies(["cats", "cats", "Birds"]) == {"cats": 2, "Birds": 1}
+    with pytest.deprecated_call():
+        frequencies = summarizer().calculate_word_frequencies()
+    assert frequencies["cats"] == 2 and "the" not in frequencies
+
+
+def test_sentence_scores_use_the_given_sentences():
+    text_summarizer = summarizer()
+    with pytest.deprecated_call():
+        text_summarizer.calculate_word_frequencies(["cats", "cats", "dogs"])
+    with pytest.deprecated_call():
+        scores = text_summarizer.calculate_sentence_scores(["Many cats here.", "No match.", "Dogs and cats."])
+    assert scores == {"Many cats here.": 2.0, "Dogs and cats.": 3.0}
+
+
+def test_sentence_scores_without_frequencies_match_the_engine():
+    with pytest.deprecated_call():
+        scores = summarizer().calculate_sentence_scores(["Apples fall.", "Apples rot, apples."], method="tfidf")
+    assert list(scores) == ["Apples fall.", "Apples rot, apples."]
+    assert scores["Apples rot, apples."] > scores["Apples fall."]
+    with pytest.deprecated_call():
+        assert list(summarizer().calculate_sentence_scores()) == SENTENCES
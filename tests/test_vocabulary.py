@@ -0,0 +1,33 @@
+import random
+
+from features.vocabulary import Vocabulary
+
+
+def reference_above(word_counts, threshold):
+    ranked = sorted(word_counts.items(), key=lambda item: -item[1])
+    return [(word, count) for word, count in ranked if count >= threshold]
+
+
+def test_above_matches_sorted_filter():
+    rng = random.Random(0)
+    word_counts = {"word{}".format(index): rng.randint(1, 20) for index in range(500)}
+    vocabulary = Vocabulary.from_counts(word_counts)
+    for threshold in (0, 1, 2, 7, 20, 21):
+        words, counts = vocabulary.above(threshold)
+        assert list(zip(words, counts.tolist())) == reference_above(word_counts, threshold)
+
+
+def test_equal_counts_keep_mapping_order():
+    vocabulary = Vocabulary.from_counts({"b": 2, "a": 3, "d": 2, "c": 2, "e": 1})
+    words, counts = vocabulary.above(2)
+    assert list(words) == ["a", "b", "d", "c"]
+    assert counts.tolist() == [3, 2, 2, 2]
+
+
+def test_max_count_and_empty_vocabulary():
+    assert Vocabulary.from_counts({"a": 1, "b": 4}).max_count == 4
+    empty = Vocabulary.from_counts({})
+    assert len(empty) == 0
+    assert empty.max_count == 0
+    words, counts = empty.above(1)
+    assert len(words) == len(counts) == 0